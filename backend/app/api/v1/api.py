@@ -9,6 +9,9 @@ from .endpoints import (
     two_factor,
     notifications,
     analytics,
+    geojson,
+    admin,
+    leaderboards,
 )
 
 api_router = APIRouter()
@@ -26,3 +29,8 @@ api_router.include_router(
     notifications.router, prefix="/notifications", tags=["notifications"]
 )
 api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(geojson.router, tags=["geojson"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(
+    leaderboards.router, prefix="/leaderboards", tags=["leaderboards"]
+)
@@ -2,11 +2,11 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from jose import JWTError
-from typing import Optional
+from typing import Iterable, Optional
 
 from app.db import get_db, User
 from app.core.security import decode_token
-from app.services import user_service
+from app.services import organization_service, user_service
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 oauth2_scheme_optional = OAuth2PasswordBearer(
@@ -68,3 +68,23 @@ def get_optional_user(
         return user
     except (JWTError, ValueError):
         return None
+
+
+def require_organization_admin(
+    db: Session, user: User, organization_ids: Iterable[int]
+) -> None:
+    """
+    Check once per organization that the user is an admin of every one
+    touched by a batch.
+    """
+    organization_ids = set(organization_ids)
+    allowed = organization_service.get_admin_organization_ids(
+        db, user.id, organization_ids
+    )
+    forbidden = sorted(organization_ids - allowed)
+    if forbidden:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions for organizations "
+            + ", ".join(str(org_id) for org_id in forbidden),
+        )
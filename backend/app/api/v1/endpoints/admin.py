@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, List
+from app.api.v1.dependencies import get_current_user
+from app.services import job_service
+from app.schemas import UserRoleEnum
+from app.db.models import User
+
+router = APIRouter()
+
+
+@router.get("/jobs")
+def get_jobs(
+    current_user: User = Depends(get_current_user),
+) -> Dict[str, Any]:
+    """
+    Get the status of the background maintenance jobs in this worker.
+    Only accessible to administrators and super admins.
+    """
+    # Check if user is admin or super admin
+    if not (
+        current_user.has_role(UserRoleEnum.ADMIN)
+        or current_user.has_role(UserRoleEnum.SUPER_ADMIN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to view jobs",
+        )
+
+    return {
+        "worker": job_service.WORKER_ID,
+        "running": job_service.scheduler.running,
+        "jobs": job_service.scheduler.status(),
+    }
@@ -1,10 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import Dict, List, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.db import get_db
 from app.api.v1.dependencies import get_current_user
-from app.services import analytics_service
+from app.services import (
+    analytics_service,
+    rollup_service,
+    sketch_service,
+    auth_service,
+)
+from app.services.dashboard_service import dashboard_snapshot
 from app.schemas import UserRoleEnum
 from app.db.models import User
 
@@ -30,26 +36,8 @@ def get_dashboard_analytics(
             detail="Not enough permissions to access analytics",
         )
 
-    # Get entity counts
-    entity_counts = analytics_service.count_entities(db)
-
-    # Get user registration trends
-    registration_trend = analytics_service.user_registration_over_time(
-        db, interval="week"
-    )
-
-    # Get role distribution
-    role_distribution = analytics_service.user_roles_distribution(db)
-
-    # Get geographical distribution
-    geo_distribution = analytics_service.geographical_distribution(db)
-
-    return {
-        "entity_counts": entity_counts,
-        "registration_trend": registration_trend,
-        "role_distribution": role_distribution,
-        "geo_distribution": geo_distribution,
-    }
+    # Served from a snapshot that is refreshed in the background
+    return dashboard_snapshot.get(db)
 
 
 @router.get("/users/registrations")
@@ -81,6 +69,129 @@ def get_user_registrations(
     return registrations
 
 
+@router.get("/trends/{metric}")
+def get_activity_trend(
+    metric: str,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    interval: str = Query("day", enum=["day", "week", "month"]),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get registrations, events, contributions or beneficiaries over time.
+    Only accessible to administrators and super admins.
+    """
+    # Check if user is admin or super admin
+    if not (
+        current_user.has_role(UserRoleEnum.ADMIN)
+        or current_user.has_role(UserRoleEnum.SUPER_ADMIN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access analytics",
+        )
+
+    if metric not in rollup_service.METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown metric",
+        )
+
+    return analytics_service.activity_over_time(
+        db, metric, start_date, end_date, interval
+    )
+
+
+@router.get("/unique/{metric}")
+def get_unique_people(
+    metric: str,
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    scope: str = Query("all", enum=["all", "event", "organization", "wilaya"]),
+    scope_key: Optional[str] = Query(
+        None, description="Event id, organization id or wilaya name"
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Estimate distinct beneficiaries or contributors over a date window.
+    Only accessible to administrators and super admins.
+    """
+    # Check if user is admin or super admin
+    if not (
+        current_user.has_role(UserRoleEnum.ADMIN)
+        or current_user.has_role(UserRoleEnum.SUPER_ADMIN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access analytics",
+        )
+
+    if metric not in sketch_service.METRICS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown metric",
+        )
+
+    if not start_date:
+        start_date = datetime.now() - timedelta(days=30)
+    if not end_date:
+        end_date = datetime.now()
+
+    try:
+        result = sketch_service.count_unique(
+            db, metric, start_date, end_date, scope, scope_key
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return {
+        "metric": metric,
+        "scope": scope,
+        "scope_key": scope_key,
+        "start_date": start_date,
+        "end_date": end_date,
+        **result,
+    }
+
+
+@router.get("/fulfillment")
+def get_fulfillment_report(
+    group_by: str = Query("event", enum=["event", "organization", "resource_type"]),
+    organization_id: Optional[int] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get fulfillment ratio, contribution velocity and time-to-fulfil per event,
+    organization or resource type, least supplied first.
+    Accessible to administrators, and to organization admins for their own
+    organization.
+    """
+    is_admin = current_user.has_role(UserRoleEnum.ADMIN) or current_user.has_role(
+        UserRoleEnum.SUPER_ADMIN
+    )
+    if not is_admin and not (
+        organization_id is not None
+        and auth_service.can_manage_organization(current_user, organization_id, db)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access analytics",
+        )
+
+    return analytics_service.fulfillment_report(
+        db, group_by, organization_id=organization_id, skip=skip, limit=limit
+    )
+
+
 @router.get("/resources/contributions")
 def get_resource_contributions(
     db: Session = Depends(get_db),
@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.api.v1.dependencies import get_current_user
+from app.api.v1.dependencies import get_current_user, require_organization_admin
 from app.db import get_db, User
 from app.schemas import (
     EventCreate,
     EventUpdate,
     EventResponse,
+    EventDetailResponse,
+    EventBulkCreate,
+    EventBulkUpdate,
+    EventBulkResponse,
+    NearbyEventResponse,
+    EventClusterResponse,
     EventCollaboratorCreate,
     EventBeneficiaryCreate,
     UserResponse,
     UserRoleEnum,
 )
 from app.services import event_service, organization_service
+from app.core.geo import parse_bbox
 
 router = APIRouter()
 
@@ -55,6 +62,53 @@ def create_event(
         )
 
 
+@router.post("/bulk", response_model=EventBulkResponse)
+def create_events_bulk(
+    *,
+    bulk_data: EventBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Create a batch of events with their resource requests, such as a
+    campaign of iftars. The caller must be an admin of every organization
+    in the batch. Nothing is created if any item is invalid; the errors
+    are returned per item.
+    """
+    require_organization_admin(
+        db, current_user, (event.organization_id for event in bulk_data.events)
+    )
+
+    results, errors = event_service.create_events(db, bulk_data.events)
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+
+    return {"count": len(results), "results": results}
+
+
+@router.put("/bulk", response_model=EventBulkResponse)
+def update_events_bulk(
+    *,
+    bulk_data: EventBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Update a batch of events in one transaction. Nothing is changed if any
+    item is invalid; the errors are returned per item.
+    """
+    organizations = event_service.get_event_organization_ids(
+        db, (event.id for event in bulk_data.events)
+    )
+    require_organization_admin(db, current_user, organizations.values())
+
+    results, errors = event_service.update_events(db, bulk_data.events)
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+
+    return {"count": len(results), "results": results}
+
+
 @router.get("/", response_model=List[EventResponse])
 def list_events(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
     """
@@ -102,6 +156,52 @@ def nearby_events(
         )
 
 
+@router.get("/nearest", response_model=List[NearbyEventResponse])
+def nearest_events(
+    latitude: float,
+    longitude: float,
+    k: int = Query(10, ge=1, le=100),
+    event_type: Optional[str] = None,
+    max_distance: Optional[float] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Get the k upcoming events closest to a location, closest first.
+    Optionally filter by event type or cap the distance (in kilometers).
+    """
+    return event_service.get_nearest_events(
+        db,
+        latitude=latitude,
+        longitude=longitude,
+        k=k,
+        event_type=event_type,
+        max_distance=max_distance,
+    )
+
+
+@router.get("/clusters", response_model=List[EventClusterResponse])
+def event_clusters(
+    bbox: Optional[str] = Query(
+        None, description="Viewport as min_lon,min_lat,max_lon,max_lat"
+    ),
+    zoom: int = Query(..., ge=0, le=22),
+    db: Session = Depends(get_db),
+):
+    """
+    Get map clusters of upcoming events for a viewport and zoom level.
+    Each cluster has a count, a centroid and per-event-type counts.
+    """
+    try:
+        viewport = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    return event_service.get_event_clusters(db, viewport, zoom)
+
+
 @router.get("/search", response_model=List[EventResponse])
 def search_events(
     address: Optional[str] = None,
@@ -169,6 +269,18 @@ def get_event(event_id: int, db: Session = Depends(get_db)):
     return event
 
 
+@router.get("/{event_id}/full", response_model=EventDetailResponse)
+def get_event_detail(event_id: int, db: Session = Depends(get_db)):
+    """
+    Get an event with its organization, resource request progress,
+    collaborating organizations and beneficiary count, for event pages.
+    """
+    event = event_service.get_event_detail(db, event_id)
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return event
+
+
 @router.put("/{event_id}", response_model=EventResponse)
 def update_event(
     *,
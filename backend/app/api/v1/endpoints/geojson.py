@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+
+from app.core.geo import parse_bbox
+from app.db import get_db
+from app.services import geojson_service
+
+router = APIRouter()
+
+GEOJSON_MEDIA_TYPE = "application/geo+json"
+
+
+def _parse_bbox_param(bbox: Optional[str]):
+    if bbox is None:
+        return None
+    try:
+        return parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+
+@router.get("/events.geojson")
+def events_geojson(
+    bbox: Optional[str] = Query(
+        None, description="Bounding box as min_lon,min_lat,max_lon,max_lat"
+    ),
+    start: Optional[datetime] = Query(
+        None, description="Only events still running at or after this time"
+    ),
+    end: Optional[datetime] = Query(
+        None, description="Only events starting at or before this time"
+    ),
+    event_type: Optional[str] = Query(None, description="Filter by event type"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream events as a GeoJSON FeatureCollection for offline map packs.
+    """
+    viewport = _parse_bbox_param(bbox)
+    return StreamingResponse(
+        geojson_service.stream_events_geojson(
+            db, bbox=viewport, start=start, end=end, event_type=event_type
+        ),
+        media_type=GEOJSON_MEDIA_TYPE,
+    )
+
+
+@router.get("/organizations.geojson")
+def organizations_geojson(
+    bbox: Optional[str] = Query(
+        None, description="Bounding box as min_lon,min_lat,max_lon,max_lat"
+    ),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream organizations as a GeoJSON FeatureCollection for offline map packs.
+    """
+    viewport = _parse_bbox_param(bbox)
+    return StreamingResponse(
+        geojson_service.stream_organizations_geojson(db, bbox=viewport),
+        media_type=GEOJSON_MEDIA_TYPE,
+    )
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+
+from app.db import get_db
+from app.services import leaderboard_service
+
+router = APIRouter()
+
+
+@router.get("/{board}")
+def get_leaderboard(
+    board: str = Path(..., enum=list(leaderboard_service.BOARDS)),
+    metric: str = Query(
+        "quantity", enum=list(leaderboard_service.LEADERBOARD_METRICS)
+    ),
+    period: str = Query(
+        "all", pattern=r"^(all|\d{4}-\d{2})$", description="all, or a YYYY-MM month"
+    ),
+    resource_type: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=leaderboard_service.TOP_SIZE),
+    db: Session = Depends(get_db),
+) -> List[Dict[str, Any]]:
+    """
+    Get the top contributors or organizations by quantity or number of
+    contributions, overall or for one month and resource type.
+    """
+    try:
+        return leaderboard_service.get_leaderboard(
+            db,
+            board,
+            metric=metric,
+            period=period,
+            resource_type=resource_type,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
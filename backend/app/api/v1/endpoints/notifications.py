@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.db import get_db
 from app.db.models import User
-from app.api.v1.dependencies import get_current_user
-from app.services import notification_service
+from app.api.v1.dependencies import get_current_user, require_organization_admin
+from app.services import auth_service, event_service, notification_service
+from app.services.notification_hub import event_stream, notification_hub
 from app.schemas.notification import (
+    AudienceType,
+    NotificationFanout,
+    NotificationFanoutResponse,
     NotificationResponse,
 )  # Use Pydantic schema instead of DB model
 
+EVENT_AUDIENCES = (AudienceType.EVENT_BENEFICIARIES, AudienceType.EVENT_CONTRIBUTORS)
+
 router = APIRouter()
 
 
@@ -33,6 +40,91 @@ async def read_notifications(
     return notifications
 
 
+@router.get("/stream")
+async def stream_notifications(
+    last_event_id: Optional[int] = Header(None),
+    # Closed once the first events are read, not held for the whole stream
+    db: Session = Depends(get_db, scope="function"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Server-Sent Events stream of the current user's new notifications
+    (`notification` events, with the unread count) and unread count changes
+    (`unread_count`). Starts with the unread count; a client reconnecting
+    with Last-Event-ID first gets the notifications it missed. A `resync`
+    event means events were dropped and the client should refetch.
+    """
+    # Subscribe before catching up so nothing created meanwhile is missed
+    subscription = notification_hub.subscribe(current_user.id)
+    try:
+        missed = []
+        if last_event_id is not None:
+            missed = notification_service.get_notifications_after(
+                db, current_user.id, last_event_id
+            )
+        first_events = [
+            notification_service.notification_event(notification)
+            for notification in missed
+        ]
+        first_events.append(
+            notification_service.unread_count_event(
+                notification_service.get_unread_notification_count(db, current_user.id)
+            )
+        )
+        # Keeps the counter seeded if this was its first read
+        db.commit()
+    except Exception:
+        notification_hub.unsubscribe(subscription)
+        raise
+
+    return StreamingResponse(
+        event_stream(subscription, first_events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/fanout", response_model=NotificationFanoutResponse)
+def fan_out_notification(
+    fanout: NotificationFanout,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Notify everyone in a set of audiences, such as the beneficiaries and
+    contributors of an event whose time changed. Organization admins can
+    reach their own events and members; audiences by role or area are for
+    super admins. Emails are queued and sent in the background.
+    """
+    event_ids = {a.event_id for a in fanout.audiences if a.type in EVENT_AUDIENCES}
+    event_organizations = event_service.get_event_organization_ids(db, event_ids)
+    if len(event_organizations) != len(event_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found",
+        )
+
+    if not auth_service.is_super_admin(current_user):
+        if any(
+            a.type in (AudienceType.ROLE, AudienceType.NEARBY)
+            for a in fanout.audiences
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only super admins can notify by role or area",
+            )
+        organization_ids = {
+            a.organization_id
+            for a in fanout.audiences
+            if a.type == AudienceType.ORGANIZATION_MEMBERS
+        }
+        require_organization_admin(
+            db, current_user, organization_ids | set(event_organizations.values())
+        )
+
+    return notification_service.fan_out_notification(db, fanout)
+
+
 @router.put("/{notification_id}/read")
 def mark_notification_as_read(
     notification_id: int,
@@ -64,6 +156,8 @@ def get_unread_notification_count(
     Get count of unread notifications.
     """
     count = notification_service.get_unread_notification_count(db, current_user.id)
+    # Keeps the counter seeded if this was its first read
+    db.commit()
     return {"count": count}
 
 
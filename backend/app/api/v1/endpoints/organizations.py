@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime
 
 from app.api.v1.dependencies import get_current_user
 from app.db import get_db, User
@@ -12,7 +14,7 @@ from app.schemas import (
     OrganizationMemberResponse,
     UserRoleEnum,
 )
-from app.services import organization_service, auth_service
+from app.services import organization_service, auth_service, export_service
 
 router = APIRouter()
 
@@ -202,3 +204,58 @@ def list_members(organization_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Organization not found")
 
     return members
+
+
+@router.get("/{organization_id}/exports/{dataset}")
+def export_organization_data(
+    *,
+    organization_id: int,
+    dataset: str = Path(..., enum=list(export_service.EXPORT_DATASETS)),
+    format: str = Query("csv", enum=list(export_service.EXPORT_FORMATS)),
+    start: Optional[datetime] = Query(None, description="Only rows at or after"),
+    end: Optional[datetime] = Query(None, description="Only rows at or before"),
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream an organization's contributions, beneficiaries or events as CSV or
+    NDJSON. The body is gzipped on the fly when the client accepts gzip.
+    """
+    if not auth_service.can_manage_organization(current_user, organization_id, db):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to export this organization's data",
+        )
+
+    if not organization_service.get_organization(db, organization_id):
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    try:
+        body = export_service.stream_export(
+            db,
+            dataset,
+            organization_id,
+            export_format=format,
+            start=start,
+            end=end,
+            compress=compress,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    filename = f"organization-{organization_id}-{dataset}.{format}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        body, media_type=export_service.EXPORT_FORMATS[format], headers=headers
+    )
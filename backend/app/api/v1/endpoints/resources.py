@@ -2,17 +2,30 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from typing import List
 
-from app.api.v1.dependencies import get_current_user
+from app.api.v1.dependencies import get_current_user, require_organization_admin
 from app.db import get_db, User
 from app.schemas import (
     ResourceRequestCreate,
     ResourceRequestUpdate,
     ResourceRequestResponse,
+    ResourceRequestBulkCreate,
+    ResourceRequestBulkUpdate,
+    ResourceRequestBulkResponse,
     ResourceContributionCreate,
     ResourceContributionResponse,
+    ResourceContributionBulkCreate,
+    ResourceContributionBulkResponse,
+    AllocationPlanRequest,
+    AllocationPlanResponse,
     UserRoleEnum,
 )
-from app.services import resource_service, organization_service, event_service
+from app.services import (
+    resource_service,
+    organization_service,
+    event_service,
+    allocation_service,
+    auth_service,
+)
 
 router = APIRouter()
 
@@ -57,6 +70,57 @@ def create_resource_request(
     return request
 
 
+@router.post("/requests/bulk", response_model=ResourceRequestBulkResponse)
+def create_resource_requests_bulk(
+    *,
+    bulk_data: ResourceRequestBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create resource requests for several events in one transaction. Nothing
+    is created if any item is invalid; the errors are returned per item.
+    """
+    organizations = event_service.get_event_organization_ids(
+        db, (request.event_id for request in bulk_data.requests)
+    )
+    require_organization_admin(db, current_user, organizations.values())
+
+    results, errors = resource_service.create_resource_requests(
+        db, bulk_data.requests
+    )
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+
+    return {"count": len(results), "results": results}
+
+
+@router.put("/requests/bulk", response_model=ResourceRequestBulkResponse)
+def update_resource_requests_bulk(
+    *,
+    bulk_data: ResourceRequestBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update a batch of resource requests in one transaction. Changed
+    quantity_received values become ledger corrections. Nothing is changed
+    if any item is invalid; the errors are returned per item.
+    """
+    organizations = resource_service.get_request_organization_ids(
+        db, (request.id for request in bulk_data.requests)
+    )
+    require_organization_admin(db, current_user, organizations.values())
+
+    results, errors = resource_service.update_resource_requests(
+        db, bulk_data.requests, corrected_by=current_user.id
+    )
+    if errors:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors)
+
+    return {"count": len(results), "results": results}
+
+
 @router.get("/requests/event/{event_id}", response_model=List[ResourceRequestResponse])
 def list_event_resource_requests(event_id: int, db: Session = Depends(get_db)):
     """
@@ -78,7 +142,8 @@ def update_resource_request(
     db: Session = Depends(get_db)
 ):
     """
-    Update a resource request.
+    Update a resource request. Changing quantity_received appends a
+    correction to the contribution ledger.
     """
     req = resource_service.get_resource_request(db, request_id)
     if not req:
@@ -105,7 +170,7 @@ def update_resource_request(
         )
 
     updated_request = resource_service.update_resource_request(
-        db, request_id, request_data
+        db, request_id, request_data, corrected_by=current_user.id
     )
     return updated_request
 
@@ -170,6 +235,26 @@ def create_contribution(
     return contribution
 
 
+@router.post("/contributions/bulk", response_model=ResourceContributionBulkResponse)
+def create_contributions_bulk(
+    *,
+    bulk_data: ResourceContributionBulkCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Record a batch of contributions, such as a drop-off at a collection point.
+    Nothing is recorded if any of the requests does not exist.
+    """
+    result = resource_service.create_resource_contributions(
+        db, current_user.id, bulk_data.contributions
+    )
+    if result is None:
+        raise HTTPException(status_code=404, detail="Resource request not found")
+
+    return result
+
+
 @router.get("/contributions/user", response_model=List[ResourceContributionResponse])
 def get_user_contributions(
     current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
@@ -193,3 +278,34 @@ def get_request_contributions(request_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Resource request not found")
 
     return resource_service.get_contributions_by_request(db, request_id)
+
+
+@router.post("/allocations/plan", response_model=AllocationPlanResponse)
+def plan_allocation(
+    *,
+    plan_data: AllocationPlanRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Propose how to distribute pledged resources over open resource requests,
+    covering as much need as possible with short trips to urgent events.
+    Accessible to administrators, and to organization admins for their own
+    organization's requests.
+    """
+    is_admin = current_user.has_role(UserRoleEnum.ADMIN) or current_user.has_role(
+        UserRoleEnum.SUPER_ADMIN
+    )
+    organization_id = plan_data.organization_id
+    if not is_admin and not (
+        organization_id is not None
+        and auth_service.can_manage_organization(current_user, organization_id, db)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    return allocation_service.plan_allocation(
+        db, plan_data.pledges, organization_id=organization_id
+    )
@@ -0,0 +1,202 @@
+from dataclasses import dataclass
+from typing import Sequence
+
+import numpy as np
+
+from app.core.geo import EARTH_RADIUS_KM
+
+# An event starting a day later is worth travelling this much further for
+URGENCY_KM_PER_DAY = 50.0
+# Nearest requests considered per pledge in each pass
+CANDIDATES = 8
+# Pledges whose cost rows are computed at once (BLOCK x requests floats)
+BLOCK_SIZE = 1024
+# Repair passes over leftover supply before giving up
+MAX_REPAIR_PASSES = 32
+
+
+@dataclass
+class Allocation:
+    """
+    Result of `allocate`: one row per (pledge, request) assignment, plus what
+    is left over on both sides. Indexes refer to the input sequences.
+    """
+
+    pledge_index: np.ndarray
+    request_index: np.ndarray
+    quantity: np.ndarray
+    distance_km: np.ndarray
+    unmet: np.ndarray
+    leftover: np.ndarray
+
+    @property
+    def total_distance_km(self) -> float:
+        return float(self.distance_km.sum())
+
+
+def _unit_vectors(latitudes, longitudes) -> np.ndarray:
+    lat = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def _distance_km(dot: np.ndarray) -> np.ndarray:
+    """Great-circle distance from the dot product of unit vectors, in place."""
+    np.clip(dot, -1.0, 1.0, out=dot)
+    np.arccos(dot, out=dot)
+    dot *= EARTH_RADIUS_KM
+    return dot
+
+
+def _nearest(cost: np.ndarray, k: int, axis: int) -> np.ndarray:
+    """Indexes of the k cheapest entries along an axis, in no particular order."""
+    if k >= cost.shape[axis]:
+        shape = [1, 1]
+        shape[axis] = cost.shape[axis]
+        return np.broadcast_to(np.arange(cost.shape[axis]).reshape(shape), cost.shape)
+    return np.take(np.argpartition(cost, k - 1, axis=axis), np.arange(k), axis=axis)
+
+
+def _candidate_edges(pledge_points, request_points, urgency_km, candidates):
+    """
+    Cheap (pledge, request) pairs to choose from: the `candidates` cheapest
+    requests of every pledge, and the cheapest pledges of every request
+    within each block of pledges.
+
+    Costs are computed block by block as a dense matrix product, so memory
+    stays at BLOCK_SIZE x requests whatever the number of pledges.
+    Returns (pledge, request, cost, distance) arrays.
+    """
+    pledges, requests, costs, distances = [], [], [], []
+    for start in range(0, len(pledge_points), BLOCK_SIZE):
+        block = pledge_points[start : start + BLOCK_SIZE]
+        cost = _distance_km(block @ request_points.T)
+        cost += urgency_km
+        columns = np.arange(cost.shape[1])[None, :]
+        rows = np.arange(cost.shape[0])[:, None]
+
+        for axis in (1, 0):
+            nearest = _nearest(cost, candidates, axis)
+            if axis == 1:
+                row, column = np.broadcast_to(rows, nearest.shape), nearest
+            else:
+                row, column = nearest, np.broadcast_to(columns, nearest.shape)
+            pledges.append(row.ravel() + start)
+            requests.append(column.ravel())
+            edge_cost = cost[row, column].ravel()
+            costs.append(edge_cost)
+            distances.append(edge_cost - urgency_km[column.ravel()])
+
+    return (
+        np.concatenate(pledges),
+        np.concatenate(requests),
+        np.concatenate(costs),
+        np.concatenate(distances),
+    )
+
+
+def _assign_greedily(edges, supply, demand, out):
+    """Fill the cheapest edges first. Mutates supply and demand; returns moved."""
+    pledge, request, cost, distance = edges
+    order = np.argsort(cost, kind="stable")
+    # Plain lists: element access on NumPy arrays dominates this loop otherwise
+    moved = 0
+    for p, r, km in zip(
+        pledge[order].tolist(), request[order].tolist(), distance[order].tolist()
+    ):
+        available = supply[p]
+        if not available:
+            continue
+        needed = demand[r]
+        if not needed:
+            continue
+        quantity = available if available < needed else needed
+        supply[p] = available - quantity
+        demand[r] = needed - quantity
+        moved += quantity
+        out.append((p, r, quantity, km))
+    return moved
+
+
+def allocate(
+    request_latitudes: Sequence[float],
+    request_longitudes: Sequence[float],
+    shortfall: Sequence[int],
+    days_until_start: Sequence[float],
+    request_types: Sequence[str],
+    pledge_latitudes: Sequence[float],
+    pledge_longitudes: Sequence[float],
+    quantity: Sequence[int],
+    pledge_types: Sequence[str],
+    candidates: int = CANDIDATES,
+    urgency_km_per_day: float = URGENCY_KM_PER_DAY,
+) -> Allocation:
+    """
+    Assign pledged quantities to open requests of the same resource type.
+
+    Unmet need is minimized first: within a resource type, either every
+    pledge is used up or every request is covered. Among such assignments
+    the solver prefers short trips to events that start soon, scoring each
+    pledge-request pair as distance plus `urgency_km_per_day` per day until
+    the event starts.
+
+    Greedy with repair: every pledge is offered its few cheapest requests
+    and the cheapest pairs are filled first. Pledges with supply left are
+    then offered the cheapest requests that still need something, until
+    nothing more can move.
+    """
+    request_types = np.asarray(request_types, dtype=object)
+    pledge_types = np.asarray(pledge_types, dtype=object)
+    demand = np.asarray(shortfall, dtype=np.int64).clip(min=0)
+    supply = np.asarray(quantity, dtype=np.int64).clip(min=0)
+    urgency_km = urgency_km_per_day * np.asarray(
+        days_until_start, dtype=np.float64
+    ).clip(min=0)
+
+    request_points = _unit_vectors(request_latitudes, request_longitudes)
+    pledge_points = _unit_vectors(pledge_latitudes, pledge_longitudes)
+
+    assignments = []
+    for resource_type in set(pledge_types) & set(request_types):
+        request_ids = np.flatnonzero(request_types == resource_type)
+        pledge_ids = np.flatnonzero(pledge_types == resource_type)
+        local_demand = demand[request_ids].tolist()
+        local_supply = supply[pledge_ids].tolist()
+        local = []
+
+        for _ in range(MAX_REPAIR_PASSES):
+            open_requests = np.flatnonzero(np.asarray(local_demand) > 0)
+            open_pledges = np.flatnonzero(np.asarray(local_supply) > 0)
+            if not len(open_requests) or not len(open_pledges):
+                break
+            pledge, request, cost, distance = _candidate_edges(
+                pledge_points[pledge_ids[open_pledges]],
+                request_points[request_ids[open_requests]],
+                urgency_km[request_ids[open_requests]],
+                candidates,
+            )
+            edges = (open_pledges[pledge], open_requests[request], cost, distance)
+            if not _assign_greedily(edges, local_supply, local_demand, local):
+                break
+
+        demand[request_ids] = local_demand
+        supply[pledge_ids] = local_supply
+        assignments.extend(
+            (pledge_ids[p], request_ids[r], moved, km) for p, r, moved, km in local
+        )
+
+    if assignments:
+        pledge_index, request_index, moved, km = map(np.asarray, zip(*assignments))
+    else:
+        pledge_index = request_index = moved = np.zeros(0, dtype=np.int64)
+        km = np.zeros(0, dtype=np.float64)
+
+    return Allocation(
+        pledge_index=pledge_index.astype(np.int64),
+        request_index=request_index.astype(np.int64),
+        quantity=moved.astype(np.int64),
+        distance_km=km.astype(np.float64),
+        unmet=demand,
+        leftover=supply,
+    )
@@ -40,6 +40,50 @@ class Settings(BaseSettings):
     # Database initialization
     INITIALIZE_DB: bool = True
 
+    # Geospatial event index
+    EVENT_INDEX_ENABLED: bool = True
+    EVENT_INDEX_MAX_AGE_SECONDS: int = 300
+
+    # Analytics dashboard snapshot
+    DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS: int = 60
+
+    # Analytics query results, dropped on writes to their tables or after the TTL
+    ANALYTICS_CACHE_ENABLED: bool = True
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+
+    # Contribution ledger snapshots; entries newer than the lag are left in
+    # the tail in case an earlier id is still uncommitted
+    LEDGER_SNAPSHOT_INTERVAL_SECONDS: int = 60
+    LEDGER_SNAPSHOT_LAG_SECONDS: int = 30
+
+    # Distinct-people sketches and leaderboards are folded from new rows
+    # each interval, with the same lag as the ledger snapshots
+    SUMMARY_FOLD_INTERVAL_SECONDS: int = 60
+    SUMMARY_FOLD_LAG_SECONDS: int = 30
+
+    # Responses kept for retried writes sent with an Idempotency-Key
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_TTL_SECONDS: int = 60 * 60 * 24
+    IDEMPOTENCY_LEASE_SECONDS: int = 300
+    IDEMPOTENCY_WAIT_SECONDS: int = 30
+
+    # Background maintenance jobs
+    SCHEDULER_ENABLED: bool = True
+    NOTIFICATION_RETENTION_DAYS: int = 90
+    NOTIFICATION_EMAIL_INTERVAL_SECONDS: int = 30
+    NOTIFICATION_EMAIL_BATCH_SIZE: int = 500
+    NOTIFICATION_EMAIL_MAX_ATTEMPTS: int = 5
+
+    # Notification push over Server-Sent Events; every worker relays
+    # notifications created elsewhere to its streams each interval
+    NOTIFICATION_RELAY_INTERVAL_SECONDS: float = 1.0
+    # The relay cursor stays this far behind, for writes committing late
+    NOTIFICATION_RELAY_LAG_SECONDS: int = 30
+    NOTIFICATION_STREAM_KEEPALIVE_SECONDS: int = 15
+    # Streams close after this long; clients reconnect with Last-Event-ID
+    NOTIFICATION_STREAM_MAX_SECONDS: int = 300
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+
     # OAuth settings
     GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID", "")
     GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET", "")
@@ -61,6 +105,14 @@ class Settings(BaseSettings):
         "1",
         "t",
     )
+    # Delivery pool: workers each keep one SMTP connection open
+    EMAIL_WORKERS: int = 4
+    EMAIL_MESSAGES_PER_CONNECTION: int = 100
+    EMAIL_IDLE_SECONDS: int = 30
+    EMAIL_TIMEOUT_SECONDS: int = 30
+    EMAIL_MAX_RETRIES: int = 3
+    EMAIL_RETRY_BACKOFF_SECONDS: float = 1.0
+    EMAIL_SEND_TIMEOUT_SECONDS: int = 120
 
     class Config:
         case_sensitive = True
@@ -0,0 +1,154 @@
+import math
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy installed
+    np = None
+
+HAS_NUMPY = np is not None
+
+EARTH_RADIUS_KM = 6371.0  # Radius of earth in kilometers
+KM_PER_DEGREE = 111.0  # 1 degree of latitude is approximately 111 kilometers
+
+BBox = Tuple[float, float, float, float]  # (min_lon, min_lat, max_lon, max_lat)
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Calculate the great circle distance between two points
+    on the earth using the Haversine formula.
+    Returns distance in kilometers.
+    """
+    # Convert decimal degrees to radians
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+
+    # Haversine formula
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def haversine_many(
+    latitude: float,
+    longitude: float,
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+):
+    """
+    Distances in kilometers from one origin to many points.
+    Returns a NumPy array when NumPy is available, otherwise a list.
+    """
+    if not HAS_NUMPY:
+        return [
+            haversine(latitude, longitude, lat, lon)
+            for lat, lon in zip(latitudes, longitudes)
+        ]
+
+    lat1 = math.radians(latitude)
+    lon1 = math.radians(longitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    lon2 = np.radians(np.asarray(longitudes, dtype=np.float64))
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def filter_within_radius(
+    latitude: float,
+    longitude: float,
+    ids: Sequence[int],
+    latitudes: Sequence[float],
+    longitudes: Sequence[float],
+    radius: float,
+) -> List[Tuple[int, float]]:
+    """
+    Keep the points within `radius` kilometers of the origin.
+    Returns (id, distance_km) pairs sorted by distance, then id.
+    """
+    if not ids:
+        return []
+
+    distances = haversine_many(latitude, longitude, latitudes, longitudes)
+
+    if not HAS_NUMPY:
+        matches = [
+            (point_id, distance)
+            for point_id, distance in zip(ids, distances)
+            if distance <= radius
+        ]
+        matches.sort(key=lambda item: (item[1], item[0]))
+        return matches
+
+    ids_array = np.asarray(ids)
+    mask = distances <= radius
+    ids_array = ids_array[mask]
+    distances = distances[mask]
+    # lexsort sorts by the last key first: distance, then id for stable paging
+    order = np.lexsort((ids_array, distances))
+    return list(zip(ids_array[order].tolist(), distances[order].tolist()))
+
+
+def bounding_box(
+    latitude: float, longitude: float, radius: float
+) -> Tuple[float, float, float, float]:
+    """
+    Degree box (min_lat, max_lat, min_lon, max_lon) enclosing a radius in km.
+    Longitude degrees shrink towards the poles, so the box widens with latitude.
+    """
+    lat_delta = radius / KM_PER_DEGREE
+    # Use the box edge closest to the pole so the box never under-covers
+    cos_lat = math.cos(math.radians(min(90.0, abs(latitude) + lat_delta)))
+    if cos_lat < 1e-6:
+        lon_delta = 180.0
+    else:
+        lon_delta = min(180.0, lat_delta / cos_lat)
+
+    return (
+        latitude - lat_delta,
+        latitude + lat_delta,
+        longitude - lon_delta,
+        longitude + lon_delta,
+    )
+
+
+def to_unit_vector(latitude: float, longitude: float) -> Tuple[float, float, float]:
+    """Project a coordinate onto the unit sphere as (x, y, z)."""
+    lat = math.radians(latitude)
+    lon = math.radians(longitude)
+    cos_lat = math.cos(lat)
+    return (cos_lat * math.cos(lon), cos_lat * math.sin(lon), math.sin(lat))
+
+
+def chord_from_km(distance: float) -> float:
+    """Straight-line distance on the unit sphere for a surface distance in km."""
+    angle = min(math.pi, distance / EARTH_RADIUS_KM)
+    return 2 * math.sin(angle / 2)
+
+
+def km_from_chord(chord: float) -> float:
+    """Surface distance in km for a straight-line distance on the unit sphere."""
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def parse_bbox(value: Optional[str]) -> BBox:
+    """Parse a `min_lon,min_lat,max_lon,max_lat` query string."""
+    if not value:
+        return (-180.0, -90.0, 180.0, 90.0)
+
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(part) for part in value.split(","))
+    except ValueError:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox minimums must not exceed maximums")
+
+    return (min_lon, min_lat, max_lon, max_lat)
@@ -0,0 +1,334 @@
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple, Union
+
+import anyio
+from sqlalchemy import and_, delete, select, update
+from sqlalchemy.orm import Session
+from starlette.datastructures import Headers
+
+from app.core.config import settings
+from app.db.functions import upsert
+from app.db.models import IdempotencyKey
+from app.db.session import DatabaseConnection
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 255
+# Larger responses are not kept; duplicates of such requests run again
+MAX_RESPONSE_BYTES = 64 * 1024
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+REUSED_KEY = "Idempotency-Key was used for a different request"
+# How often a duplicate checks whether the first request has finished
+WAIT_POLL_SECONDS = 0.1
+
+# (idempotency key, method, path, hash of the Authorization header)
+StoreKey = Tuple[str, str, str, str]
+# Returned by `begin` while another request with the key is running
+IN_FLIGHT = "in_flight"
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+def _session() -> Session:
+    return DatabaseConnection().get_session()
+
+
+def _match(key: StoreKey):
+    idempotency_key, method, path, credential_hash = key
+    return and_(
+        IdempotencyKey.key == idempotency_key,
+        IdempotencyKey.method == method,
+        IdempotencyKey.path == path,
+        IdempotencyKey.credential_hash == credential_hash,
+    )
+
+
+class IdempotencyStore:
+    """
+    Responses to requests sent with an Idempotency-Key, kept in the
+    idempotency_keys table for IDEMPOTENCY_TTL_SECONDS so that duplicates
+    are caught whichever worker they reach.
+
+    The first request inserts its key without a response; the unique
+    constraint makes every other worker see it as in flight until it
+    finishes. A claim left by a worker that died expires after
+    IDEMPOTENCY_LEASE_SECONDS.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = _session):
+        self.session_factory = session_factory
+
+    def begin(
+        self, key: StoreKey, fingerprint: str
+    ) -> Union[StoredResponse, str, None]:
+        """
+        Claim a key for a request. Returns the response to replay, IN_FLIGHT
+        while another request with the key runs, or None when the caller
+        should run the request and `finish` the key.
+
+        Raises ValueError if the key was used for a different request body.
+        """
+        now = datetime.now()
+        idempotency_key, method, path, credential_hash = key
+        db = self.session_factory()
+        try:
+            db.execute(
+                delete(IdempotencyKey).where(
+                    _match(key), IdempotencyKey.expires_at <= now
+                )
+            )
+            connection = db.connection()
+            claimed = connection.execute(
+                upsert(connection, IdempotencyKey)
+                .values(
+                    key=idempotency_key,
+                    method=method,
+                    path=path,
+                    credential_hash=credential_hash,
+                    fingerprint=fingerprint,
+                    created_at=now,
+                    expires_at=now
+                    + timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS),
+                )
+                .on_conflict_do_nothing(
+                    index_elements=[
+                        IdempotencyKey.key,
+                        IdempotencyKey.method,
+                        IdempotencyKey.path,
+                        IdempotencyKey.credential_hash,
+                    ]
+                )
+            ).rowcount
+            stored = None
+            if not claimed:
+                stored = db.execute(
+                    select(
+                        IdempotencyKey.fingerprint,
+                        IdempotencyKey.status,
+                        IdempotencyKey.headers,
+                        IdempotencyKey.body,
+                    ).where(_match(key))
+                ).first()
+            db.commit()
+        finally:
+            db.close()
+
+        if claimed:
+            return None
+        if stored is None:
+            # Released without a response in between; the next try claims it
+            return IN_FLIGHT
+        if stored.fingerprint != fingerprint:
+            raise ValueError(REUSED_KEY)
+        if stored.status is None:
+            return IN_FLIGHT
+        return StoredResponse(
+            fingerprint=stored.fingerprint,
+            status=stored.status,
+            headers=[
+                (name.encode("latin-1"), value.encode("latin-1"))
+                for name, value in stored.headers or []
+            ],
+            body=stored.body or b"",
+        )
+
+    def finish(self, key: StoreKey, response: Optional[StoredResponse]) -> None:
+        """
+        Release a claimed key, keeping its response if there is one. Waiting
+        duplicates then replay it, or run themselves if nothing was kept.
+        """
+        running = (_match(key), IdempotencyKey.status.is_(None))
+        db = self.session_factory()
+        try:
+            if response is None:
+                db.execute(delete(IdempotencyKey).where(*running))
+            else:
+                db.execute(
+                    update(IdempotencyKey)
+                    .where(*running)
+                    .values(
+                        status=response.status,
+                        headers=[
+                            [name.decode("latin-1"), value.decode("latin-1")]
+                            for name, value in response.headers
+                        ],
+                        body=response.body,
+                        expires_at=datetime.now()
+                        + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+                    )
+                )
+            db.commit()
+        finally:
+            db.close()
+
+    def delete_expired(self) -> int:
+        """Drop expired responses and abandoned claims; returns how many."""
+        db = self.session_factory()
+        try:
+            deleted = db.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.expires_at <= datetime.now()
+                )
+            ).rowcount
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+
+idempotency_store = IdempotencyStore()
+
+
+async def _send_json(send, status: int, detail: str, extra_headers=()) -> None:
+    body = json.dumps({"detail": detail}).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *extra_headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _replay(send, stored: StoredResponse) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": stored.status,
+            "headers": stored.headers + [REPLAYED_HEADER],
+        }
+    )
+    await send({"type": "http.response.body", "body": stored.body})
+
+
+class IdempotencyMiddleware:
+    """
+    Run a write request sent with an `Idempotency-Key` header at most once.
+
+    Retries with the same key, method, path and credentials get the first
+    response back with an `Idempotent-Replayed` header instead of writing
+    again; a retry arriving while the first request still runs waits for
+    it. Reusing a key for a different body is rejected with 422. Server
+    errors are not kept, so those requests can be retried for real.
+    """
+
+    def __init__(self, app, store: Optional[IdempotencyStore] = None):
+        self.app = app
+        self.store = store or idempotency_store
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in WRITE_METHODS
+            or not settings.IDEMPOTENCY_ENABLED
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, "Invalid Idempotency-Key header")
+            return
+
+        chunks = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+        body = b"".join(chunks)
+
+        credentials = headers.get("authorization", "").encode()
+        key = (
+            idempotency_key,
+            scope["method"],
+            scope["path"],
+            hashlib.sha256(credentials).hexdigest(),
+        )
+        fingerprint = hashlib.sha256(
+            scope.get("query_string", b"") + b"\n" + body
+        ).hexdigest()
+
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            try:
+                claimed = await anyio.to_thread.run_sync(
+                    self.store.begin, key, fingerprint
+                )
+            except ValueError as e:
+                await _send_json(send, 422, str(e))
+                return
+            if isinstance(claimed, StoredResponse):
+                await _replay(send, claimed)
+                return
+            if claimed is None:
+                break
+            # The first request may be served by another worker
+            if time.monotonic() >= deadline:
+                await _send_json(
+                    send,
+                    409,
+                    "A request with this Idempotency-Key is still in progress",
+                    [(b"retry-after", b"1")],
+                )
+                return
+            await anyio.sleep(WAIT_POLL_SECONDS)
+
+        body_sent = False
+
+        async def receive_body():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start = None
+        response_chunks = []
+        size = 0
+
+        async def capture(message):
+            nonlocal start, size
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= MAX_RESPONSE_BYTES:
+                    response_chunks.append(chunk)
+            await send(message)
+
+        stored = None
+        try:
+            await self.app(scope, receive_body, capture)
+            complete = start is not None and size <= MAX_RESPONSE_BYTES
+            if complete and start["status"] < 500:
+                stored = StoredResponse(
+                    fingerprint=fingerprint,
+                    status=start["status"],
+                    headers=list(start.get("headers", [])),
+                    body=b"".join(response_chunks),
+                )
+        finally:
+            with anyio.CancelScope(shield=True):
+                await anyio.to_thread.run_sync(self.store.finish, key, stored)
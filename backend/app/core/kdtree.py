@@ -0,0 +1,127 @@
+import heapq
+from typing import Callable, Hashable, List, Optional, Sequence, Tuple
+
+Point = Tuple[float, ...]
+
+
+class KDTree:
+    """
+    Static k-d tree over fixed-dimension points.
+
+    The tree is built once from a snapshot; callers handle inserts and deletes
+    by rebuilding, or by filtering results and scanning a small side list.
+    """
+
+    def __init__(self, keys: Sequence[Hashable], points: Sequence[Point]):
+        if len(keys) != len(points):
+            raise ValueError("keys and points must have the same length")
+
+        self._keys = list(keys)
+        self._points = list(points)
+        self._dimensions = len(self._points[0]) if self._points else 0
+
+        size = len(self._points)
+        self._left = [-1] * size
+        self._right = [-1] * size
+        self._axis = [0] * size
+        self._root = self._build(list(range(size)), 0)
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _build(self, indexes: List[int], depth: int) -> int:
+        """Build the subtree for `indexes` and return its root node."""
+        if not indexes:
+            return -1
+
+        axis = depth % self._dimensions
+        indexes.sort(key=lambda i: self._points[i][axis])
+        middle = len(indexes) // 2
+        node = indexes[middle]
+
+        self._axis[node] = axis
+        self._left[node] = self._build(indexes[:middle], depth + 1)
+        self._right[node] = self._build(indexes[middle + 1 :], depth + 1)
+        return node
+
+    def _distance_sq(self, node: int, target: Point) -> float:
+        point = self._points[node]
+        return sum((point[d] - target[d]) ** 2 for d in range(self._dimensions))
+
+    def nearest(
+        self,
+        target: Point,
+        k: int,
+        accept: Optional[Callable[[Hashable], bool]] = None,
+    ) -> List[Tuple[float, Hashable]]:
+        """
+        Return up to k (squared distance, key) pairs closest to target.
+        Keys rejected by `accept` are skipped without counting towards k.
+        """
+        if k <= 0 or self._root < 0:
+            return []
+
+        # Max-heap of the best k so far, stored as negated distances
+        best: List[Tuple[float, int]] = []
+        stack = [(self._root, 0.0)]
+
+        while stack:
+            node, bound = stack.pop()
+            if node < 0 or (len(best) == k and bound >= -best[0][0]):
+                continue
+
+            key = self._keys[node]
+            if accept is None or accept(key):
+                distance = self._distance_sq(node, target)
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, node))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, node))
+
+            axis = self._axis[node]
+            diff = target[axis] - self._points[node][axis]
+            near, far = (
+                (self._left[node], self._right[node])
+                if diff < 0
+                else (self._right[node], self._left[node])
+            )
+            # Far side is pushed first so the near side is explored first
+            stack.append((far, max(bound, diff * diff)))
+            stack.append((near, bound))
+
+        return sorted((-distance, self._keys[node]) for distance, node in best)
+
+    def within(
+        self,
+        target: Point,
+        radius: float,
+        accept: Optional[Callable[[Hashable], bool]] = None,
+    ) -> List[Tuple[float, Hashable]]:
+        """Return (squared distance, key) pairs within radius, sorted."""
+        radius_sq = radius * radius
+        found = []
+        stack = [self._root]
+
+        while stack:
+            node = stack.pop()
+            if node < 0:
+                continue
+
+            key = self._keys[node]
+            distance = self._distance_sq(node, target)
+            if distance <= radius_sq and (accept is None or accept(key)):
+                found.append((distance, key))
+
+            axis = self._axis[node]
+            diff = target[axis] - self._points[node][axis]
+            near, far = (
+                (self._left[node], self._right[node])
+                if diff < 0
+                else (self._right[node], self._left[node])
+            )
+            stack.append(near)
+            if diff * diff <= radius_sq:
+                stack.append(far)
+
+        found.sort()
+        return found
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import random
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Protocol, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Interval:
+    """Run every `seconds` seconds, counted from the previous run."""
+
+    def __init__(self, seconds: float):
+        if seconds <= 0:
+            raise ValueError("Interval must be positive")
+        self.seconds = seconds
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment + timedelta(seconds=self.seconds)
+
+    def __str__(self) -> str:
+        return f"every {self.seconds:g}s"
+
+
+def _parse_cron_field(value: str, low: int, high: int) -> Set[int]:
+    """Parse one crontab field: `*`, `n`, `a-b`, `*/s`, `a-b/s` and lists."""
+    values = set()
+    for part in value.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"Invalid cron step: {value}")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(bound) for bound in part.split("-", 1))
+        else:
+            start = end = int(part)
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field out of range: {value}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class Cron:
+    """
+    Five-field crontab schedule: minute hour day-of-month month day-of-week.
+
+    Day of week runs 0-6 from Sunday (7 is also Sunday). As in cron, when both
+    day fields are restricted a day matching either one is accepted.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError("Cron expression must have five fields")
+
+        self.expression = expression
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        self.weekdays = {day % 7 for day in _parse_cron_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        # datetime counts Monday as 0, cron counts Sunday as 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First matching minute strictly after a moment."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Skip whole months/days/hours that cannot match; bounded by leap cycles
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                month = candidate.month % 12 + 1
+                year = candidate.year + (candidate.month == 12)
+                candidate = candidate.replace(
+                    year=year, month=month, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+    def __str__(self) -> str:
+        return f"cron {self.expression}"
+
+
+class JobLock(Protocol):
+    """Cross-process lock making sure only one worker runs a job at a time."""
+
+    def acquire(self, name: str, ttl: float) -> bool: ...
+
+    def release(self, name: str, hold_until: Optional[datetime] = None) -> None:
+        """Give the lock up, or keep it from other workers until hold_until."""
+        ...
+
+
+@dataclass
+class Job:
+    name: str
+    func: Callable[[], Any]
+    schedule: Any
+    jitter: float = 0.0
+    leader_only: bool = False
+    timeout: float = 600.0
+    running: bool = False
+    next_run: Optional[datetime] = None
+    last_started: Optional[datetime] = None
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "schedule": str(self.schedule),
+            "leader_only": self.leader_only,
+            "running": self.running,
+            "next_run": self.next_run,
+            "last_started": self.last_started,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+        }
+
+
+class Scheduler:
+    """
+    Minimal asyncio scheduler for periodic maintenance inside the API process.
+
+    Jobs are plain functions run in a worker thread. A job never overlaps
+    with itself; a run that comes due while the previous one is still going
+    is skipped. Jobs marked leader_only also take the shared lock, so with
+    several API workers only one of them runs the job each time: after a
+    scheduled run the lock is held until the job's next slot, so workers
+    whose jitter wakes them later in the same slot find it taken.
+    """
+
+    def __init__(self, lock: Optional[JobLock] = None):
+        self.lock = lock
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._runs: Set[asyncio.Task] = set()
+
+    def add_job(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        schedule,
+        jitter: float = 0.0,
+        leader_only: bool = False,
+        timeout: float = 600.0,
+    ) -> Job:
+        if name in self.jobs:
+            raise ValueError(f"Job already registered: {name}")
+        job = Job(
+            name=name,
+            func=func,
+            schedule=schedule,
+            jitter=jitter,
+            leader_only=leader_only,
+            timeout=timeout,
+        )
+        self.jobs[name] = job
+        return job
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self) -> None:
+        """Start one loop per job on the running event loop."""
+        if self._tasks:
+            return
+        for job in self.jobs.values():
+            self._tasks.append(
+                asyncio.create_task(self._loop(job), name=f"job-{job.name}")
+            )
+
+    async def stop(self) -> None:
+        """Cancel the job loops. Runs already in a thread finish on their own."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [job.status() for job in self.jobs.values()]
+
+    async def run_job(self, job: Job, slot: Optional[datetime] = None) -> bool:
+        """
+        Run a job once unless it is already running. Returns True if it ran.
+        `slot` is the scheduled time being run, if any.
+        """
+        if job.running:
+            job.skipped += 1
+            return False
+
+        job.running = True
+        try:
+            return await asyncio.to_thread(self._run_locked, job, slot)
+        finally:
+            job.running = False
+
+    def _run_locked(self, job: Job, slot: Optional[datetime] = None) -> bool:
+        if job.leader_only and self.lock is not None:
+            try:
+                acquired = self.lock.acquire(job.name, job.timeout)
+            except Exception:
+                logger.exception("Could not take the lock for job %s", job.name)
+                acquired = False
+            if not acquired:
+                job.skipped += 1
+                return False
+
+        job.last_started = datetime.now()
+        started = time.monotonic()
+        try:
+            job.func()
+            job.last_error = None
+        except Exception:
+            job.failures += 1
+            job.last_error = traceback.format_exc(limit=3)
+            logger.exception("Job %s failed", job.name)
+        finally:
+            job.runs += 1
+            job.last_duration = time.monotonic() - started
+            if job.leader_only and self.lock is not None:
+                hold_until = job.schedule.next_after(slot) if slot else None
+                try:
+                    self.lock.release(job.name, hold_until)
+                except Exception:
+                    logger.exception("Could not release the lock for job %s", job.name)
+        return True
+
+    async def _loop(self, job: Job) -> None:
+        while True:
+            now = datetime.now()
+            slot = job.next_run = job.schedule.next_after(now)
+            delay = (slot - now).total_seconds()
+            if job.jitter:
+                delay += random.uniform(0, job.jitter)
+            await asyncio.sleep(max(0.0, delay))
+            # Runs in the background so a slow run is seen as an overlap
+            run = asyncio.create_task(self.run_job(job, slot))
+            self._runs.add(run)
+            run.add_done_callback(self._runs.discard)
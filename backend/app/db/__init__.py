@@ -1,5 +1,6 @@
 from .session import DatabaseConnection, get_db
 from .base import Base
+from . import functions
 from .models import (
     User,
     UserRole,
@@ -9,9 +10,20 @@ from .models import (
     EventCollaborator,
     ResourceContribution,
     ResourceRequest,
+    ResourceRequestSnapshot,
     EventBeneficiary,
     OAuthConnection,
     Notification,
+    NotificationCounter,
+    NotificationCursor,
+    StatsCounter,
+    DailyRollup,
+    UniqueSketch,
+    LeaderboardTotal,
+    LeaderboardEntry,
+    FoldCursor,
+    SchedulerLock,
+    IdempotencyKey,
 )
 
 
@@ -26,8 +38,19 @@ __all__ = [
     "EventCollaborator",
     "ResourceContribution",
     "ResourceRequest",
+    "ResourceRequestSnapshot",
     "EventBeneficiary",
     "OAuthConnection",
     "Notification",
+    "NotificationCounter",
+    "NotificationCursor",
+    "StatsCounter",
+    "DailyRollup",
+    "UniqueSketch",
+    "LeaderboardTotal",
+    "LeaderboardEntry",
+    "FoldCursor",
+    "SchedulerLock",
+    "IdempotencyKey",
     Base,
 ]
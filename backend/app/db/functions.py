@@ -0,0 +1,119 @@
+# backend/app/db/functions.py
+import sqlite3
+from sqlalchemy import DateTime, Float, event, func, literal
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.core import geo
+
+
+class haversine(FunctionElement):
+    """
+    Great circle distance in kilometers: haversine(lat1, lon1, lat2, lon2).
+
+    SQLite calls a Python function registered on every connection; PostgreSQL
+    gets the equivalent inline expression, so both can filter, ORDER BY and
+    paginate on distance inside the database.
+    """
+
+    type = Float()
+    name = "haversine"
+    inherit_cache = True
+
+
+@compiles(haversine)
+def _compile_haversine(element, compiler, **kw):
+    return "haversine(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(haversine, "postgresql")
+def _compile_haversine_postgresql(element, compiler, **kw):
+    lat1, lon1, lat2, lon2 = [
+        func.radians(clause) for clause in element.clauses.clauses
+    ]
+    a = func.power(func.sin((lat2 - lat1) / 2.0), 2.0) + func.cos(lat1) * func.cos(
+        lat2
+    ) * func.power(func.sin((lon2 - lon1) / 2.0), 2.0)
+    distance = literal(2 * geo.EARTH_RADIUS_KM) * func.asin(
+        func.sqrt(func.least(literal(1.0), a))
+    )
+    return compiler.process(distance, **kw)
+
+
+def _sqlite_haversine(lat1, lon1, lat2, lon2):
+    if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
+        return None
+    return geo.haversine(lat1, lon1, lat2, lon2)
+
+
+@event.listens_for(Engine, "connect")
+def register_sqlite_functions(dbapi_connection, connection_record):
+    """Register the SQL functions above on new SQLite connections."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.create_function(
+            "haversine", 4, _sqlite_haversine, deterministic=True
+        )
+
+
+class epoch_seconds(FunctionElement):
+    """
+    Seconds since the Unix epoch of a timestamp: epoch_seconds(ts).
+
+    Differences of two values give portable durations in SQL, which neither
+    SQLite nor PostgreSQL offer through a shared function.
+    """
+
+    type = Float()
+    name = "epoch_seconds"
+    inherit_cache = True
+
+
+@compiles(epoch_seconds)
+def _compile_epoch_seconds(element, compiler, **kw):
+    return "CAST(strftime('%%s', %s) AS REAL)" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+@compiles(epoch_seconds, "postgresql")
+def _compile_epoch_seconds_postgresql(element, compiler, **kw):
+    return "EXTRACT(EPOCH FROM %s)" % compiler.process(element.clauses, **kw)
+
+
+def upsert(bind, model):
+    """
+    INSERT for the bind's dialect, which offers `on_conflict_do_update` and
+    `on_conflict_do_nothing` on both SQLite and PostgreSQL.
+    """
+    if bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+class seconds_ago(FunctionElement):
+    """
+    The database's current timestamp minus a number of seconds.
+
+    Compares against columns defaulting to `func.now()` on the clock that
+    filled them in, so the host's clock does not come into it.
+    """
+
+    type = DateTime()
+    name = "seconds_ago"
+    inherit_cache = True
+
+
+@compiles(seconds_ago)
+def _compile_seconds_ago(element, compiler, **kw):
+    return "datetime('now', '-' || %s || ' seconds')" % compiler.process(
+        element.clauses, **kw
+    )
+
+
+@compiles(seconds_ago, "postgresql")
+def _compile_seconds_ago_postgresql(element, compiler, **kw):
+    return "LOCALTIMESTAMP - make_interval(secs => %s)" % compiler.process(
+        element.clauses, **kw
+    )
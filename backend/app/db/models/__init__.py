@@ -1,10 +1,24 @@
 from .user import User, UserRole
 from .organization import Organization, OrganizationMember
 from .event import Event, EventCollaborator
-from .resource import ResourceContribution, ResourceRequest
+from .resource import (
+    ResourceContribution,
+    ResourceRequest,
+    ResourceRequestSnapshot,
+)
 from .beneficiary import EventBeneficiary
 from .oauth import OAuthConnection
-from .notification import Notification
+from .notification import Notification, NotificationCounter, NotificationCursor
+from .stats import (
+    StatsCounter,
+    DailyRollup,
+    UniqueSketch,
+    LeaderboardTotal,
+    LeaderboardEntry,
+    FoldCursor,
+)
+from .scheduler import SchedulerLock
+from .idempotency import IdempotencyKey
 
 
 __all__ = [
@@ -16,7 +30,18 @@ __all__ = [
     "EventCollaborator",
     "ResourceContribution",
     "ResourceRequest",
+    "ResourceRequestSnapshot",
     "EventBeneficiary",
     "OAuthConnection",
     "Notification",
+    "NotificationCounter",
+    "NotificationCursor",
+    "StatsCounter",
+    "DailyRollup",
+    "UniqueSketch",
+    "LeaderboardTotal",
+    "LeaderboardEntry",
+    "FoldCursor",
+    "SchedulerLock",
+    "IdempotencyKey",
 ]
@@ -10,7 +10,7 @@ class EventBeneficiary(Base):
 
     event_id = Column(Integer, ForeignKey("events.id"), primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
-    benefit_time = Column(DateTime, server_default=func.now())
+    benefit_time = Column(DateTime, server_default=func.now(), index=True)
 
     event = relationship("Event", back_populates="beneficiaries")
     user = relationship("User", back_populates="benefited_events")
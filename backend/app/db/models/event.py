@@ -2,6 +2,7 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
 from sqlalchemy.orm import relationship
 from ..base import Base
+from datetime import datetime
 
 
 class Event(Base):
@@ -18,6 +19,8 @@ class Event(Base):
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
     address = Column(String(255), nullable=True)
+    wilaya = Column(String(64), nullable=True, index=True)  # Province
+    created_at = Column(DateTime, default=datetime.now)
 
     organization = relationship("Organization", back_populates="events")
     collaborators = relationship("EventCollaborator", back_populates="event")
@@ -0,0 +1,39 @@
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+)
+from ..base import Base
+from datetime import datetime
+
+
+class IdempotencyKey(Base):
+    """
+    A write request sent with an Idempotency-Key: claimed while it runs,
+    then holding the response to replay until it expires.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint(
+            "key", "method", "path", "credential_hash", name="uq_idempotency_keys"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String(255), nullable=False)
+    method = Column(String(10), nullable=False)
+    path = Column(String(512), nullable=False)
+    credential_hash = Column(String(64), nullable=False)
+    # Hash of the query string and body, to reject a key reused elsewhere
+    fingerprint = Column(String(64), nullable=False)
+    # Null while the first request is still running
+    status = Column(Integer, nullable=True)
+    headers = Column(JSON, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, default=datetime.now)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from ..base import Base
 from datetime import datetime
@@ -8,6 +8,9 @@ class Notification(Base):
     """Model for user notifications."""
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_email_queue", "emailed_at", "email_queued_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(
@@ -23,6 +26,37 @@ class Notification(Base):
     read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.now)
     read_at = Column(DateTime, nullable=True)
+    # Email copy waiting for the delivery job while queued and not yet sent
+    email_queued_at = Column(DateTime, nullable=True)
+    emailed_at = Column(DateTime, nullable=True)
+    email_attempts = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationship
     user = relationship("User", back_populates="notifications")
+
+
+class NotificationCursor(Base):
+    """
+    Newest notification a worker has pushed to its connected clients.
+
+    Each worker reads notifications past its own cursor, so streams it
+    serves also get notifications created by other workers or bulk inserts.
+    """
+
+    __tablename__ = "notification_cursors"
+
+    worker_id = Column(String(128), primary_key=True)
+    last_notification_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class NotificationCounter(Base):
+    """Number of unread notifications of a user, kept in step with writes."""
+
+    __tablename__ = "notification_counters"
+
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    unread = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
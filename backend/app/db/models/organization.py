@@ -1,7 +1,8 @@
 # backend/app/db/models/organization.py
-from sqlalchemy import Column, Integer, Enum, String, ForeignKey, Text, Float
+from sqlalchemy import Column, Integer, Enum, String, ForeignKey, Text, Float, DateTime
 from sqlalchemy.orm import relationship
 from ..base import Base
+from datetime import datetime
 
 
 class Organization(Base):
@@ -13,6 +14,7 @@ class Organization(Base):
     location = Column(String(255))
     latitude = Column(Float)
     longitude = Column(Float)
+    created_at = Column(DateTime, default=datetime.now)
 
     members = relationship("OrganizationMember", back_populates="organization")
     events = relationship("Event", back_populates="organization")
@@ -1,31 +1,107 @@
 # backend/app/db/models/resource.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Index, select
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import column_property, relationship
 from ..base import Base
+from datetime import datetime
 
+# Kinds of ledger entries in resource_contributions
+CONTRIBUTION = "contribution"
+CORRECTION = "correction"
 
-class ResourceRequest(Base):
-    __tablename__ = "resource_requests"
 
-    id = Column(Integer, primary_key=True)
-    event_id = Column(Integer, ForeignKey("events.id"))
-    resource_type = Column(String(50), nullable=False)
-    quantity_needed = Column(Integer)
-    quantity_received = Column(Integer, default=0)
+class ResourceRequestSnapshot(Base):
+    """
+    Received balance of a request as of a ledger entry.
 
-    event = relationship("Event", back_populates="resource_requests")
-    contributions = relationship("ResourceContribution", back_populates="request")
+    The balance is the sum of the request's contributions with an id up to
+    and including ledger_id; later entries are the ledger tail.
+    """
+
+    __tablename__ = "resource_request_snapshots"
+
+    request_id = Column(
+        Integer,
+        ForeignKey("resource_requests.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    ledger_id = Column(Integer, nullable=False, default=0)
+    balance = Column(BigInteger, nullable=False, default=0)
+    taken_at = Column(DateTime, default=datetime.now)
 
 
 class ResourceContribution(Base):
+    """
+    Append-only ledger of quantities received by resource requests.
+
+    Donations are "contribution" entries. Fixing a request's total appends a
+    "correction" entry for the difference instead of editing past rows.
+    """
+
     __tablename__ = "resource_contributions"
+    __table_args__ = (
+        Index("ix_resource_contributions_request_ledger", "request_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     request_id = Column(Integer, ForeignKey("resource_requests.id"))
     user_id = Column(Integer, ForeignKey("users.id"))
     quantity = Column(Integer)
-    contribution_time = Column(DateTime, server_default=func.now())
+    contribution_time = Column(DateTime, server_default=func.now(), index=True)
+    kind = Column(
+        String(20), nullable=False, default=CONTRIBUTION, server_default=CONTRIBUTION
+    )
+    note = Column(String(255), nullable=True)
+    recorded_by = Column(
+        Integer,
+        ForeignKey("users.id", name="fk_resource_contributions_recorded_by_users"),
+        nullable=True,
+    )
 
     request = relationship("ResourceRequest", back_populates="contributions")
-    user = relationship("User", back_populates="contributions")
+    user = relationship("User", back_populates="contributions", foreign_keys=[user_id])
+
+    @hybrid_property
+    def is_correction(self):
+        return self.kind == CORRECTION
+
+
+class ResourceRequest(Base):
+    __tablename__ = "resource_requests"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(Integer, ForeignKey("events.id"))
+    resource_type = Column(String(50), nullable=False)
+    quantity_needed = Column(Integer)
+    # Balance of the latest ledger snapshot; reads should use received_balance
+    quantity_received = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.now)
+
+    event = relationship("Event", back_populates="resource_requests")
+    contributions = relationship("ResourceContribution", back_populates="request")
+
+
+_snapshot = ResourceRequestSnapshot
+_ledger_id = (
+    select(_snapshot.ledger_id)
+    .where(_snapshot.request_id == ResourceRequest.id)
+    .scalar_subquery()
+)
+# Latest snapshot plus the sum of the ledger entries after it
+ResourceRequest.received_balance = column_property(
+    func.coalesce(
+        select(_snapshot.balance)
+        .where(_snapshot.request_id == ResourceRequest.id)
+        .scalar_subquery(),
+        0,
+    )
+    + select(func.coalesce(func.sum(ResourceContribution.quantity), 0))
+    .where(
+        ResourceContribution.request_id == ResourceRequest.id,
+        ResourceContribution.id > func.coalesce(_ledger_id, 0),
+    )
+    .correlate_except(ResourceContribution)
+    .scalar_subquery()
+)
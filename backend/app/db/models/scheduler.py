@@ -0,0 +1,12 @@
+from sqlalchemy import Column, DateTime, String
+from ..base import Base
+
+
+class SchedulerLock(Base):
+    """Lease held by the worker currently running a scheduled job."""
+
+    __tablename__ = "scheduler_locks"
+
+    name = Column(String(64), primary_key=True)
+    owner = Column(String(128), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
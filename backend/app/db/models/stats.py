@@ -0,0 +1,101 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+)
+from ..base import Base
+from datetime import datetime
+
+
+class StatsCounter(Base):
+    """Running row count of an entity, kept in step with its table."""
+
+    __tablename__ = "stats_counters"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class DailyRollup(Base):
+    """Number of rows of a metric created on one calendar day."""
+
+    __tablename__ = "daily_rollups"
+
+    metric = Column(String(32), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class UniqueSketch(Base):
+    """HyperLogLog sketch of the distinct people seen in one scope on one day."""
+
+    __tablename__ = "unique_sketches"
+
+    metric = Column(String(32), primary_key=True)
+    scope = Column(String(16), primary_key=True)  # all, event, organization, wilaya
+    scope_key = Column(String(64), primary_key=True)
+    day = Column(Date, primary_key=True)
+    registers = Column(LargeBinary, nullable=False)
+
+
+class LeaderboardTotal(Base):
+    """Running contribution totals of one contributor or organization."""
+
+    __tablename__ = "leaderboard_totals"
+
+    board = Column(String(16), primary_key=True)  # contributors, organizations
+    period = Column(String(8), primary_key=True)  # all, or a YYYY-MM month
+    resource_type = Column(String(50), primary_key=True)  # "" for every type
+    subject_id = Column(Integer, primary_key=True)
+    quantity = Column(BigInteger, nullable=False, default=0)
+    contributions = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index(
+            "ix_leaderboard_totals_quantity",
+            "board",
+            "period",
+            "resource_type",
+            "quantity",
+        ),
+        Index(
+            "ix_leaderboard_totals_contributions",
+            "board",
+            "period",
+            "resource_type",
+            "contributions",
+        ),
+    )
+
+
+class LeaderboardEntry(Base):
+    """Member of a bounded top-N leaderboard, ranked by value when read."""
+
+    __tablename__ = "leaderboard_entries"
+
+    board = Column(String(16), primary_key=True)
+    period = Column(String(8), primary_key=True)
+    resource_type = Column(String(50), primary_key=True)
+    metric = Column(String(16), primary_key=True)  # quantity, contributions
+    subject_id = Column(Integer, primary_key=True)
+    value = Column(BigInteger, nullable=False)
+
+
+class FoldCursor(Base):
+    """
+    How far a job has folded a table into a running summary: up to an id,
+    or up to a timestamp for tables without a sequential id.
+    """
+
+    __tablename__ = "fold_cursors"
+
+    name = Column(String(32), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    last_time = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
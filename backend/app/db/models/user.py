@@ -1,7 +1,8 @@
 # backend/app/db/models/user.py
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Boolean, DateTime
 from sqlalchemy.orm import relationship
 from ..base import Base
+from datetime import datetime
 
 
 class User(Base):
@@ -17,13 +18,18 @@ class User(Base):
     longitude = Column(Float)
     two_factor_secret = Column(String, nullable=True)
     two_factor_enabled = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.now)
 
     # Relationships
     roles = relationship(
         "UserRole", back_populates="user", cascade="all, delete-orphan"
     )
     organizations = relationship("OrganizationMember", back_populates="user")
-    contributions = relationship("ResourceContribution", back_populates="user")
+    contributions = relationship(
+        "ResourceContribution",
+        back_populates="user",
+        foreign_keys="ResourceContribution.user_id",
+    )
     benefited_events = relationship("EventBeneficiary", back_populates="user")
     oauth_connections = relationship(
         "OAuthConnection", back_populates="user", cascade="all, delete-orphan"
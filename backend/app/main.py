@@ -5,7 +5,10 @@ from contextlib import asynccontextmanager
 
 from app.api import api_router
 from app.core.config import settings
+from app.core.idempotency import IdempotencyMiddleware
 from app.db.session import DatabaseConnection
+from app.services import job_service
+from app.services.email_delivery import email_pool
 
 
 # Define the initialize_db function
@@ -26,10 +29,14 @@ async def lifespan(app: FastAPI):
     if hasattr(settings, "INITIALIZE_DB") and settings.INITIALIZE_DB:
         initialize_db()
 
+    if settings.SCHEDULER_ENABLED:
+        job_service.start()
+
     yield
 
     # Shutdown actions
-    # Any cleanup code would go here
+    await job_service.stop()
+    email_pool.stop()
 
 
 app = FastAPI(
@@ -42,6 +49,9 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Replay responses to retried writes; added first so CORS wraps the replays
+app.add_middleware(IdempotencyMiddleware)
+
 # Set all CORS enabled origins
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
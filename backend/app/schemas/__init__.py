@@ -24,6 +24,15 @@ from .event import (
     EventCreate,
     EventUpdate,
     EventResponse,
+    EventDetailResponse,
+    EventBulkItem,
+    EventBulkCreate,
+    EventBulkUpdateItem,
+    EventBulkUpdate,
+    EventBulkResult,
+    EventBulkResponse,
+    NearbyEventResponse,
+    EventClusterResponse,
     EventCollaboratorBase,
     EventCollaboratorCreate,
     EventCollaboratorResponse,
@@ -37,8 +46,21 @@ from .resource import (
     ResourceRequestCreate,
     ResourceRequestUpdate,
     ResourceRequestResponse,
+    ResourceRequestProgress,
+    ResourceRequestBulkItem,
+    ResourceRequestBulkCreate,
+    ResourceRequestBulkUpdateItem,
+    ResourceRequestBulkUpdate,
+    ResourceRequestBulkResponse,
     ResourceContributionBase,
     ResourceContributionCreate,
+    ResourceContributionBulkCreate,
+    ResourceContributionBulkResponse,
+    ResourceRequestTotal,
+    ResourcePledge,
+    AllocationPlanRequest,
+    AllocationAssignment,
+    AllocationPlanResponse,
     ResourceContributionUpdate,
     ResourceContributionResponse,
 )
@@ -50,6 +72,10 @@ from .notification import (
     NotificationBase,
     NotificationCreate,
     NotificationResponse,
+    AudienceType,
+    NotificationAudience,
+    NotificationFanout,
+    NotificationFanoutResponse,
 )
 
 __all__ = [
@@ -74,6 +100,15 @@ __all__ = [
     "EventCreate",
     "EventUpdate",
     "EventResponse",
+    "EventDetailResponse",
+    "EventBulkItem",
+    "EventBulkCreate",
+    "EventBulkUpdateItem",
+    "EventBulkUpdate",
+    "EventBulkResult",
+    "EventBulkResponse",
+    "NearbyEventResponse",
+    "EventClusterResponse",
     "EventCollaboratorBase",
     "EventCollaboratorCreate",
     "EventCollaboratorResponse",
@@ -85,8 +120,21 @@ __all__ = [
     "ResourceRequestCreate",
     "ResourceRequestUpdate",
     "ResourceRequestResponse",
+    "ResourceRequestProgress",
+    "ResourceRequestBulkItem",
+    "ResourceRequestBulkCreate",
+    "ResourceRequestBulkUpdateItem",
+    "ResourceRequestBulkUpdate",
+    "ResourceRequestBulkResponse",
     "ResourceContributionBase",
     "ResourceContributionCreate",
+    "ResourceContributionBulkCreate",
+    "ResourceContributionBulkResponse",
+    "ResourceRequestTotal",
+    "ResourcePledge",
+    "AllocationPlanRequest",
+    "AllocationAssignment",
+    "AllocationPlanResponse",
     "ResourceContributionUpdate",
     "ResourceContributionResponse",
     "Token",
@@ -100,4 +148,8 @@ __all__ = [
     "NotificationBase",
     "NotificationCreate",
     "NotificationResponse",
+    "AudienceType",
+    "NotificationAudience",
+    "NotificationFanout",
+    "NotificationFanoutResponse",
 ]
@@ -1,8 +1,15 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
 from datetime import datetime
 from enum import Enum
 
+from .organization import OrganizationResponse
+from .resource import (
+    ResourceRequestCreate,
+    ResourceRequestResponse,
+    ResourceRequestProgress,
+)
+
 
 class EventTypeEnum(str, Enum):
     IFTAR = "IFTAR"
@@ -19,6 +26,7 @@ class EventBase(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     address: Optional[str] = None
+    wilaya: Optional[str] = None
 
 
 class EventCreate(EventBase):
@@ -33,6 +41,7 @@ class EventUpdate(BaseModel):
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     address: Optional[str] = None
+    wilaya: Optional[str] = None
 
 
 class EventResponse(EventBase):
@@ -42,6 +51,54 @@ class EventResponse(EventBase):
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
+class EventDetailResponse(EventResponse):
+    organization: Optional[OrganizationResponse] = None
+    resource_requests: List[ResourceRequestProgress]
+    collaborators: List[OrganizationResponse]
+    beneficiary_count: int
+
+
+class EventBulkItem(EventCreate):
+    resource_requests: List[ResourceRequestCreate] = Field(
+        default_factory=list, max_length=50
+    )
+
+
+class EventBulkCreate(BaseModel):
+    events: List[EventBulkItem] = Field(..., min_length=1, max_length=500)
+
+
+class EventBulkUpdateItem(EventUpdate):
+    id: int
+
+
+class EventBulkUpdate(BaseModel):
+    events: List[EventBulkUpdateItem] = Field(..., min_length=1, max_length=500)
+
+
+class EventBulkResult(EventResponse):
+    resource_requests: List[ResourceRequestResponse] = []
+
+
+class EventBulkResponse(BaseModel):
+    count: int
+    results: List[EventBulkResult]  # In the order of the batch
+
+
+class NearbyEventResponse(EventResponse):
+    distance: float  # Kilometers from the queried location
+
+
+class EventClusterResponse(BaseModel):
+    zoom: int
+    x: int
+    y: int
+    count: int
+    latitude: float  # Centroid of the events in the cell
+    longitude: float
+    event_types: Dict[str, int]
+
+
 class EventCollaboratorBase(BaseModel):
     event_id: int
     organization_id: int
@@ -1,8 +1,10 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from enum import Enum
 
+from .user import UserRoleEnum
+
 
 class NotificationType(str, Enum):
     EVENT_INVITE = "event_invite"
@@ -30,3 +32,50 @@ class NotificationResponse(NotificationBase):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
+
+
+class AudienceType(str, Enum):
+    EVENT_BENEFICIARIES = "event_beneficiaries"
+    EVENT_CONTRIBUTORS = "event_contributors"  # Donors and volunteers
+    ORGANIZATION_MEMBERS = "organization_members"
+    ROLE = "role"
+    NEARBY = "nearby"  # Users whose location is within radius_km of a point
+
+
+# Fields each audience type needs
+AUDIENCE_FIELDS = {
+    AudienceType.EVENT_BENEFICIARIES: ("event_id",),
+    AudienceType.EVENT_CONTRIBUTORS: ("event_id",),
+    AudienceType.ORGANIZATION_MEMBERS: ("organization_id",),
+    AudienceType.ROLE: ("role",),
+    AudienceType.NEARBY: ("latitude", "longitude", "radius_km"),
+}
+
+
+class NotificationAudience(BaseModel):
+    type: AudienceType
+    event_id: Optional[int] = None
+    organization_id: Optional[int] = None
+    role: Optional[UserRoleEnum] = None
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+    radius_km: Optional[float] = Field(None, gt=0, le=500)
+
+    @model_validator(mode="after")
+    def check_selector(self):
+        fields = AUDIENCE_FIELDS[self.type]
+        missing = [field for field in fields if getattr(self, field) is None]
+        if missing:
+            raise ValueError(f"{self.type.value} audience needs {', '.join(missing)}")
+        return self
+
+
+class NotificationFanout(NotificationBase):
+    # Recipients are the union of the audiences, each notified once
+    audiences: List[NotificationAudience] = Field(..., min_length=1, max_length=20)
+    email: bool = False
+
+
+class NotificationFanoutResponse(BaseModel):
+    created: int
+    emails_queued: int
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, computed_field
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -31,15 +31,54 @@ class ResourceRequestUpdate(BaseModel):
 
 class ResourceRequestResponse(ResourceRequestBase):
     id: int
+    # Read from the contribution ledger, not the last snapshot
+    quantity_received: int = Field(
+        0, validation_alias=AliasChoices("received_balance", "quantity_received")
+    )
 
     model_config = ConfigDict(from_attributes=True, use_enum_values=True)
 
 
+class ResourceRequestProgress(ResourceRequestResponse):
+    @computed_field
+    @property
+    def progress(self) -> float:
+        """Share of the need received so far, from 0 to 1."""
+        if self.quantity_needed <= 0:
+            return 1.0
+        return round(min(self.quantity_received / self.quantity_needed, 1.0), 4)
+
+
+class ResourceRequestBulkItem(ResourceRequestCreate):
+    event_id: int
+
+
+class ResourceRequestBulkCreate(BaseModel):
+    requests: List[ResourceRequestBulkItem] = Field(..., min_length=1, max_length=1000)
+
+
+class ResourceRequestBulkUpdateItem(ResourceRequestUpdate):
+    id: int
+
+
+class ResourceRequestBulkUpdate(BaseModel):
+    requests: List[ResourceRequestBulkUpdateItem] = Field(
+        ..., min_length=1, max_length=1000
+    )
+
+
+class ResourceRequestBulkResponse(BaseModel):
+    count: int
+    results: List[ResourceRequestResponse]  # In the order of the batch
+
+
 class ResourceContributionBase(BaseModel):
     request_id: int
-    user_id: int
+    user_id: Optional[int] = None
     quantity: int
     contribution_time: datetime
+    kind: str = "contribution"
+    note: Optional[str] = None
 
 
 class ResourceContributionCreate(BaseModel):
@@ -47,6 +86,53 @@ class ResourceContributionCreate(BaseModel):
     quantity: int
 
 
+class ResourceContributionBulkCreate(BaseModel):
+    contributions: List[ResourceContributionCreate] = Field(
+        ..., min_length=1, max_length=1000
+    )
+
+
+class ResourceRequestTotal(BaseModel):
+    request_id: int
+    quantity_received: int
+
+
+class ResourceContributionBulkResponse(BaseModel):
+    created: int
+    requests: List[ResourceRequestTotal]
+
+
+class ResourcePledge(BaseModel):
+    resource_type: ResourceTypeEnum
+    quantity: int = Field(..., gt=0)
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+    model_config = ConfigDict(use_enum_values=True)
+
+
+class AllocationPlanRequest(BaseModel):
+    pledges: List[ResourcePledge] = Field(..., min_length=1, max_length=50000)
+    organization_id: Optional[int] = None
+
+
+class AllocationAssignment(BaseModel):
+    pledge: int
+    request_id: int
+    event_id: int
+    resource_type: str
+    quantity: int
+    distance_km: float
+
+
+class AllocationPlanResponse(BaseModel):
+    assignments: List[AllocationAssignment]
+    allocated: int
+    unmet_need: int
+    unallocated_supply: int
+    total_distance_km: float
+
+
 class ResourceContributionUpdate(BaseModel):
     quantity: Optional[int] = None
 
@@ -6,8 +6,17 @@ from . import resource_service
 from . import oauth_service
 from . import two_factor_service
 from . import notification_service
+from . import stats_service
+from . import rollup_service
+from . import sketch_service
+from . import leaderboard_service
+from . import allocation_service
 from . import analytics_service
+from . import dashboard_service
 from . import search_service
+from . import geojson_service
+from . import export_service
+from . import job_service
 
 __all__ = [
     "user_service",
@@ -18,6 +27,15 @@ __all__ = [
     "oauth_service",
     "two_factor_service",
     "notification_service",
+    "stats_service",
+    "rollup_service",
+    "sketch_service",
+    "leaderboard_service",
+    "allocation_service",
     "analytics_service",
+    "dashboard_service",
     "search_service",
+    "geojson_service",
+    "export_service",
+    "job_service",
 ]
@@ -0,0 +1,101 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.allocation import allocate
+from app.db.models import Event, ResourceRequest
+from app.schemas import ResourcePledge
+
+
+def get_open_requests(
+    db: Session, organization_id: Optional[int] = None, now: Optional[datetime] = None
+) -> List[Any]:
+    """
+    Located requests of events that have not ended and still need something,
+    with their shortfall (quantity_needed - received balance).
+    """
+    now = now or datetime.now()
+    shortfall = ResourceRequest.quantity_needed - ResourceRequest.received_balance
+    query = (
+        select(
+            ResourceRequest.id,
+            ResourceRequest.event_id,
+            ResourceRequest.resource_type,
+            shortfall.label("shortfall"),
+            Event.latitude,
+            Event.longitude,
+            Event.start_time,
+        )
+        .join(Event, ResourceRequest.event_id == Event.id)
+        .where(
+            shortfall > 0,
+            Event.latitude.isnot(None),
+            Event.longitude.isnot(None),
+            or_(Event.end_time.is_(None), Event.end_time >= now),
+        )
+        .order_by(ResourceRequest.id)
+    )
+    if organization_id is not None:
+        query = query.where(Event.organization_id == organization_id)
+    return db.execute(query).all()
+
+
+def plan_allocation(
+    db: Session,
+    pledges: List[ResourcePledge],
+    organization_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Propose how to split pledged resources over open requests, covering as
+    much need as possible with short trips to the most urgent events.
+
+    Nothing is written; pledges are referred to by their position in the
+    input list.
+    """
+    now = datetime.now()
+    requests = get_open_requests(db, organization_id, now)
+
+    plan = allocate(
+        request_latitudes=[request.latitude for request in requests],
+        request_longitudes=[request.longitude for request in requests],
+        shortfall=[request.shortfall for request in requests],
+        days_until_start=[
+            (request.start_time - now).total_seconds() / 86400
+            if request.start_time
+            else 0.0
+            for request in requests
+        ],
+        request_types=[request.resource_type for request in requests],
+        pledge_latitudes=[pledge.latitude for pledge in pledges],
+        pledge_longitudes=[pledge.longitude for pledge in pledges],
+        quantity=[pledge.quantity for pledge in pledges],
+        pledge_types=[pledge.resource_type for pledge in pledges],
+    )
+
+    assignments = [
+        {
+            "pledge": pledge,
+            "request_id": requests[request].id,
+            "event_id": requests[request].event_id,
+            "resource_type": requests[request].resource_type,
+            "quantity": quantity,
+            "distance_km": round(distance, 3),
+        }
+        for pledge, request, quantity, distance in zip(
+            plan.pledge_index.tolist(),
+            plan.request_index.tolist(),
+            plan.quantity.tolist(),
+            plan.distance_km.tolist(),
+        )
+    ]
+    assignments.sort(key=lambda item: (item["pledge"], item["request_id"]))
+
+    return {
+        "assignments": assignments,
+        "allocated": int(plan.quantity.sum()),
+        "unmet_need": int(plan.unmet.sum()),
+        "unallocated_supply": int(plan.leftover.sum()),
+        "total_distance_km": round(plan.total_distance_km, 3),
+    }
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import case, func, desc, select
 from datetime import datetime, timedelta
 from app.db.models import (
     User,
@@ -12,22 +12,28 @@ from app.db.models import (
     UserRole,  # Make sure this is imported/defined
 )
 from typing import Dict, List, Any, Optional
+from app.db.functions import epoch_seconds
+from app.services import stats_service, rollup_service
+from app.services.query_cache import cached_query
 
 
+@cached_query("users", "organizations", "events", "resource_requests")
 def count_entities(db: Session) -> Dict[str, int]:
     """
     Count the number of users, organizations, events, and resources.
     """
+    counts = stats_service.get_counts(
+        db, ["users", "organizations", "events", "resource_requests"]
+    )
     return {
-        "users": db.query(User).count(),
-        "organizations": db.query(Organization).count(),
-        "events": db.query(Event).count(),
-        "resources": db.query(
-            ResourceRequest
-        ).count(),  # Changed from Resource to ResourceRequest
+        "users": counts["users"],
+        "organizations": counts["organizations"],
+        "events": counts["events"],
+        "resources": counts["resource_requests"],
     }
 
 
+@cached_query("users")
 def user_registration_over_time(
     db: Session,
     start_date: Optional[datetime] = None,
@@ -43,35 +49,36 @@ def user_registration_over_time(
         end_date: End date for the analysis (defaults to today)
         interval: Time interval for grouping ("day", "week", "month")
     """
+    return activity_over_time(db, "registrations", start_date, end_date, interval)
+
+
+@cached_query("users", "events", "resource_contributions", "event_beneficiaries")
+def activity_over_time(
+    db: Session,
+    metric: str,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    interval: str = "day",
+) -> List[Dict[str, Any]]:
+    """
+    Get counts of a rollup metric over time.
+
+    Args:
+        db: Database session
+        metric: "registrations", "events", "contributions" or "beneficiaries"
+        start_date: Start date for the analysis (defaults to 30 days ago)
+        end_date: End date for the analysis (defaults to today)
+        interval: Time interval for grouping ("day", "week", "month")
+    """
     if not start_date:
         start_date = datetime.now() - timedelta(days=30)
     if not end_date:
         end_date = datetime.now()
 
-    # Define date trunc function based on interval
-    if interval == "week":
-        date_trunc = func.date_trunc("week", User.created_at)
-    elif interval == "month":
-        date_trunc = func.date_trunc("month", User.created_at)
-    else:
-        date_trunc = func.date_trunc("day", User.created_at)
-
-    # Query user registrations by date
-    registrations = (
-        db.query(date_trunc.label("date"), func.count(User.id).label("count"))
-        .filter(User.created_at.between(start_date, end_date))
-        .group_by("date")
-        .order_by("date")
-        .all()
-    )
-
-    # Format results
-    return [
-        {"date": date.strftime("%Y-%m-%d"), "count": count}
-        for date, count in registrations
-    ]
+    return rollup_service.get_series(db, metric, start_date, end_date, interval)
 
 
+@cached_query("resource_requests", "resource_contributions")
 def resource_contributions_by_type(db: Session) -> List[Dict[str, Any]]:
     """
     Analyze resource contributions by resource type.
@@ -86,6 +93,7 @@ def resource_contributions_by_type(db: Session) -> List[Dict[str, Any]]:
         .join(
             ResourceContribution, ResourceRequest.id == ResourceContribution.request_id
         )  # Changed Resource.id to ResourceRequest.id and resource_id to request_id
+        .filter(~ResourceContribution.is_correction)
         .group_by(ResourceRequest.resource_type)  # Changed Resource to ResourceRequest
         .all()
     )
@@ -96,35 +104,30 @@ def resource_contributions_by_type(db: Session) -> List[Dict[str, Any]]:
     ]
 
 
+@cached_query("events", "event_beneficiaries")
 def event_attendance_stats(db: Session) -> Dict[str, Any]:
     """
     Get statistics about event attendance.
     """
-    # Count total events
-    total_events = db.query(Event).count()
-
-    # Count total beneficiaries
-    total_beneficiaries = (
-        db.query(func.count(func.distinct(EventBeneficiary.user_id))).scalar() or 0
+    counts = stats_service.get_counts(
+        db, ["events", "event_beneficiaries", "beneficiaries"]
     )
+    total_events = counts["events"]
 
-    # Count average beneficiaries per event
+    # Average beneficiary registrations per event
     if total_events > 0:
-        avg_beneficiaries_per_event = (
-            db.query(func.avg(func.count(EventBeneficiary.user_id)))
-            .group_by(EventBeneficiary.event_id)
-            .scalar()
-        ) or 0
+        avg_beneficiaries_per_event = counts["event_beneficiaries"] / total_events
     else:
         avg_beneficiaries_per_event = 0
 
     return {
         "total_events": total_events,
-        "total_beneficiaries": total_beneficiaries,
+        "total_beneficiaries": counts["beneficiaries"],
         "avg_beneficiaries_per_event": float(avg_beneficiaries_per_event),
     }
 
 
+@cached_query("users")
 def geographical_distribution(db: Session) -> List[Dict[str, Any]]:
     """
     Get geographical distribution of users.
@@ -142,6 +145,7 @@ def geographical_distribution(db: Session) -> List[Dict[str, Any]]:
     ]
 
 
+@cached_query("user_roles")
 def user_roles_distribution(db: Session) -> List[Dict[str, Any]]:
     """
     Get distribution of user roles.
@@ -156,12 +160,13 @@ def user_roles_distribution(db: Session) -> List[Dict[str, Any]]:
     return [{"role": role, "count": count} for role, count in role_counts]
 
 
+@cached_query("events", "organizations")
 def get_event_statistics(db: Session) -> Dict[str, Any]:
     """
     Get comprehensive event statistics.
     """
     # Total events
-    total_events = db.query(Event).count()
+    total_events = stats_service.get_count(db, "events")
 
     # Events by organization
     events_by_org = (
@@ -180,15 +185,16 @@ def get_event_statistics(db: Session) -> Dict[str, Any]:
     }
 
 
+@cached_query("resource_requests", "resource_contributions")
 def get_resource_statistics(db: Session) -> Dict[str, Any]:
     """
     Get comprehensive resource statistics.
     """
-    # Total resource requests
-    total_requests = db.query(ResourceRequest).count()
-
-    # Total contributions
-    total_contributions = db.query(ResourceContribution).count()
+    counts = stats_service.get_counts(
+        db, ["resource_requests", "resource_contributions"]
+    )
+    total_requests = counts["resource_requests"]
+    total_contributions = counts["resource_contributions"]
 
     # Resources by type
     resources_by_type = (
@@ -201,7 +207,7 @@ def get_resource_statistics(db: Session) -> Dict[str, Any]:
 
     # Fulfillment rate (received vs needed)
     fulfillment_data = db.query(
-        func.sum(ResourceRequest.quantity_received).label("received"),
+        func.sum(ResourceRequest.received_balance).label("received"),
         func.sum(ResourceRequest.quantity_needed).label("needed"),
     ).first()
 
@@ -217,3 +223,153 @@ def get_resource_statistics(db: Session) -> Dict[str, Any]:
         ],
         "fulfillment_rate": fulfillment_rate,
     }
+
+
+FULFILLMENT_GROUPS = ("event", "organization", "resource_type")
+
+
+@cached_query(
+    "events", "organizations", "resource_requests", "resource_contributions"
+)
+def fulfillment_report(
+    db: Session,
+    group_by: str = "event",
+    organization_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    Fulfillment ratio, contribution velocity and time-to-fulfil per event,
+    organization or resource type, least supplied first.
+
+    Everything is computed by one grouped query: a window function keeps a
+    running total of contributions per request, which gives the moment each
+    request was fully covered.
+
+    Args:
+        db: Database session
+        group_by: "event", "organization" or "resource_type"
+        organization_id: Only include this organization's events
+        skip: Number of groups to skip
+        limit: Maximum number of groups to return
+    """
+    if group_by not in FULFILLMENT_GROUPS:
+        raise ValueError(f"Unknown grouping: {group_by}")
+
+    running = select(
+        ResourceContribution.request_id,
+        ResourceContribution.contribution_time,
+        func.sum(ResourceContribution.quantity)
+        .over(
+            partition_by=ResourceContribution.request_id,
+            order_by=(ResourceContribution.contribution_time, ResourceContribution.id),
+        )
+        .label("running_total"),
+    ).cte("running")
+
+    per_request = (
+        select(
+            running.c.request_id,
+            func.count().label("contribution_count"),
+            func.max(running.c.running_total).label("contributed"),
+            func.min(running.c.contribution_time).label("first_at"),
+            func.max(running.c.contribution_time).label("last_at"),
+            func.min(
+                case(
+                    (
+                        running.c.running_total >= ResourceRequest.quantity_needed,
+                        running.c.contribution_time,
+                    )
+                )
+            ).label("fulfilled_at"),
+        )
+        .join(ResourceRequest, ResourceRequest.id == running.c.request_id)
+        .group_by(running.c.request_id)
+        .cte("per_request")
+    )
+
+    if group_by == "event":
+        keys = [
+            Event.id.label("event_id"),
+            Event.title.label("event_title"),
+            Event.organization_id.label("organization_id"),
+        ]
+    elif group_by == "organization":
+        keys = [
+            Organization.id.label("organization_id"),
+            Organization.name.label("organization_name"),
+        ]
+    else:
+        keys = [ResourceRequest.resource_type.label("resource_type")]
+
+    needed = func.sum(ResourceRequest.quantity_needed)
+    received = func.sum(ResourceRequest.received_balance)
+    # Groups that need nothing count as fully supplied
+    ratio = func.coalesce(received * 1.0 / func.nullif(needed, 0), 1.0)
+
+    query = (
+        select(
+            *keys,
+            func.count(ResourceRequest.id).label("request_count"),
+            func.count(per_request.c.fulfilled_at).label("fulfilled_requests"),
+            needed.label("quantity_needed"),
+            received.label("quantity_received"),
+            ratio.label("fulfillment_ratio"),
+            func.coalesce(func.sum(per_request.c.contribution_count), 0).label(
+                "contribution_count"
+            ),
+            func.coalesce(func.sum(per_request.c.contributed), 0).label(
+                "quantity_contributed"
+            ),
+            func.min(epoch_seconds(per_request.c.first_at)).label("first_at"),
+            func.max(epoch_seconds(per_request.c.last_at)).label("last_at"),
+            func.avg(
+                epoch_seconds(per_request.c.fulfilled_at)
+                - epoch_seconds(
+                    func.coalesce(ResourceRequest.created_at, per_request.c.first_at)
+                )
+            ).label("seconds_to_fulfil"),
+        )
+        .select_from(ResourceRequest)
+        .join(Event, ResourceRequest.event_id == Event.id)
+        .outerjoin(per_request, per_request.c.request_id == ResourceRequest.id)
+    )
+    if group_by == "organization":
+        query = query.join(Organization, Event.organization_id == Organization.id)
+    if organization_id is not None:
+        query = query.filter(Event.organization_id == organization_id)
+
+    query = (
+        query.group_by(*keys)
+        .order_by(ratio, *keys)
+        .offset(skip)
+        .limit(limit)
+    )
+
+    report = []
+    for row in db.execute(query).mappings():
+        item = {key.name: row[key.name] for key in keys}
+        # Contributions per day over the span they arrived in (at least a day)
+        if row["first_at"] is not None:
+            days = max((row["last_at"] - row["first_at"]) / 86400, 1.0)
+            velocity = row["quantity_contributed"] / days
+        else:
+            velocity = 0.0
+        seconds = row["seconds_to_fulfil"]
+        item.update(
+            {
+                "request_count": row["request_count"],
+                "fulfilled_requests": row["fulfilled_requests"],
+                "quantity_needed": row["quantity_needed"] or 0,
+                "quantity_received": row["quantity_received"] or 0,
+                "fulfillment_ratio": float(row["fulfillment_ratio"]),
+                "contribution_count": row["contribution_count"],
+                "quantity_contributed": row["quantity_contributed"],
+                "contribution_velocity_per_day": velocity,
+                "avg_hours_to_fulfil": (
+                    max(seconds, 0.0) / 3600 if seconds is not None else None
+                ),
+            }
+        )
+        report.append(item)
+    return report
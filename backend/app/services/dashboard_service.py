@@ -0,0 +1,98 @@
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.services import analytics_service
+
+
+def compute_dashboard(db: Session) -> Dict[str, Any]:
+    """Run every analytics query shown on the admin dashboard."""
+    return {
+        "entity_counts": analytics_service.count_entities(db),
+        "registration_trend": analytics_service.user_registration_over_time(
+            db, interval="week"
+        ),
+        "role_distribution": analytics_service.user_roles_distribution(db),
+        "geo_distribution": analytics_service.geographical_distribution(db),
+    }
+
+
+class DashboardSnapshot:
+    """
+    Process-local stale-while-revalidate cache of the dashboard payload.
+
+    The first request computes the payload; later requests are answered from
+    the snapshot straight away. Once it is older than the freshness target a
+    single background refresh replaces it, however many admins ask meanwhile.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the snapshot so the next request recomputes it."""
+        with self._lock:
+            self._payload: Optional[Dict[str, Any]] = None
+            self._generated_at: Optional[datetime] = None
+            self._built_at: Optional[float] = None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the snapshot was computed, or None if never built."""
+        if self._built_at is None:
+            return None
+        return time.monotonic() - self._built_at
+
+    def refresh(self, db: Session) -> None:
+        """Recompute the payload and swap it in."""
+        started_at = time.monotonic()
+        generated_at = datetime.now()
+        payload = compute_dashboard(db)
+        with self._lock:
+            self._payload = payload
+            self._generated_at = generated_at
+            self._built_at = started_at
+
+    def refresh_in_background(self, session_factory: sessionmaker) -> bool:
+        """Start a refresh on a worker thread unless one is already running."""
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            db = session_factory()
+            try:
+                self.refresh(db)
+            finally:
+                db.close()
+                self._refresh_lock.release()
+
+        threading.Thread(
+            target=run, name="dashboard-snapshot-refresh", daemon=True
+        ).start()
+        return True
+
+    def get(self, db: Session) -> Dict[str, Any]:
+        """Return the dashboard payload with its generation time and age."""
+        if self._built_at is None:
+            # Concurrent first requests wait for one computation and share it
+            with self._refresh_lock:
+                if self._built_at is None:
+                    self.refresh(db)
+        elif self.age > settings.DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS:
+            self.refresh_in_background(sessionmaker(bind=db.get_bind()))
+
+        with self._lock:
+            return {
+                **self._payload,
+                "generated_at": self._generated_at,
+                "snapshot_age_seconds": round(time.monotonic() - self._built_at, 3),
+            }
+
+
+dashboard_snapshot = DashboardSnapshot()
@@ -0,0 +1,255 @@
+import logging
+import queue
+import random
+import smtplib
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutgoingEmail:
+    recipient: str
+    subject: str
+    html_content: str
+    text_content: Optional[str] = None
+
+
+def is_configured() -> bool:
+    return bool(settings.EMAIL_HOST and settings.EMAIL_PORT and settings.EMAIL_USER)
+
+
+def build_message(email: OutgoingEmail) -> str:
+    """Render an email as a text/html multipart message."""
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = email.subject
+    msg["From"] = settings.EMAIL_FROM
+    msg["To"] = email.recipient
+
+    text_content = email.text_content
+    if text_content is None:
+        # Very simplistic HTML to text conversion
+        text_content = (
+            email.html_content.replace("<br>", "\n")
+            .replace("<p>", "")
+            .replace("</p>", "\n\n")
+        )
+
+    msg.attach(MIMEText(text_content, "plain"))
+    msg.attach(MIMEText(email.html_content, "html"))
+    return msg.as_string()
+
+
+def connect_smtp() -> smtplib.SMTP:
+    """Open an SMTP connection to EMAIL_HOST, upgraded to TLS and logged in."""
+    server = smtplib.SMTP(
+        settings.EMAIL_HOST, settings.EMAIL_PORT, timeout=settings.EMAIL_TIMEOUT_SECONDS
+    )
+    try:
+        if settings.EMAIL_USE_TLS:
+            server.starttls()
+        if settings.EMAIL_USER and settings.EMAIL_PASSWORD:
+            server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+class _Permanent(Exception):
+    """The server refused the message for good; retrying will not help."""
+
+
+@dataclass
+class _Link:
+    """A worker's SMTP connection and how many messages it has carried."""
+
+    connection: Optional[smtplib.SMTP] = None
+    sent: int = 0
+
+
+class EmailDeliveryPool:
+    """
+    Worker threads that send queued emails over persistent SMTP connections.
+
+    Each worker keeps one connection open, already through STARTTLS and
+    login, and sends up to EMAIL_MESSAGES_PER_CONNECTION messages on it
+    before reconnecting; connections idle for EMAIL_IDLE_SECONDS are closed.
+    Dropped connections and 4xx replies are retried up to EMAIL_MAX_RETRIES
+    times with exponential backoff; 5xx replies fail the message at once.
+
+    Workers start with the first `submit` and stop with `stop`; a worker
+    that died is replaced on the next `submit`. Every queued email's future
+    is resolved, whatever goes wrong while sending it.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        connect: Callable[[], smtplib.SMTP] = connect_smtp,
+    ):
+        self.workers = workers
+        self.connect = connect
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = dict.fromkeys(("sent", "failed", "retries", "connections"), 0)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _start(self) -> None:
+        """Start workers up to the pool size, replacing any that died."""
+        with self._lock:
+            alive = {thread.name for thread in self._threads if thread.is_alive()}
+            self._threads = [t for t in self._threads if t.name in alive]
+            for number in range(self.workers or settings.EMAIL_WORKERS):
+                name = f"email-delivery-{number}"
+                if name in alive:
+                    continue
+                thread = threading.Thread(target=self._work, name=name, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Let the workers finish what is queued, then close their connections."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        for thread in threads:
+            thread.join(timeout)
+
+    def submit(self, email: OutgoingEmail) -> "Future[bool]":
+        """Queue an email; the future resolves to whether it was sent."""
+        future: "Future[bool]" = Future()
+        self._start()
+        self._queue.put((email, future))
+        return future
+
+    def send_many(
+        self, emails: Iterable[OutgoingEmail], timeout: Optional[float] = None
+    ) -> List[bool]:
+        """
+        Queue every email and wait until each is sent or given up on, for at
+        most `timeout` seconds (EMAIL_SEND_TIMEOUT_SECONDS by default) in all.
+        Emails not sent by then are cancelled if still queued and count as
+        not sent.
+        """
+        futures = [self.submit(email) for email in emails]
+        if timeout is None:
+            timeout = settings.EMAIL_SEND_TIMEOUT_SECONDS
+        deadline = time.monotonic() + timeout
+        results = []
+        for future in futures:
+            try:
+                sent = future.result(max(0.0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                future.cancel()
+                sent = False
+            results.append(sent)
+        return results
+
+    def _work(self) -> None:
+        link = _Link()
+        while True:
+            try:
+                item = self._queue.get(timeout=settings.EMAIL_IDLE_SECONDS)
+            except queue.Empty:
+                self._hang_up(link)
+                continue
+            if item is None:
+                self._hang_up(link)
+                return
+
+            email, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                sent = self._deliver(link, email)
+            except Exception:
+                # Anything unexpected fails this email, never the worker
+                logger.exception("Email to %s failed", email.recipient)
+                self._hang_up(link)
+                sent = False
+            self._count("sent" if sent else "failed")
+            future.set_result(sent)
+
+    def _deliver(self, link: "_Link", email: OutgoingEmail) -> bool:
+        """Send one email over the worker's connection, retrying as needed."""
+        message = build_message(email)
+        for attempt in range(settings.EMAIL_MAX_RETRIES + 1):
+            if attempt:
+                self._count("retries")
+                delay = settings.EMAIL_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+                time.sleep(delay * random.uniform(1.0, 1.25))
+            try:
+                if (
+                    link.connection is None
+                    or link.sent >= settings.EMAIL_MESSAGES_PER_CONNECTION
+                ):
+                    self._hang_up(link)
+                    link.connection = self.connect()
+                    self._count("connections")
+                self._send(link.connection, email, message)
+                link.sent += 1
+                return True
+            except _Permanent as e:
+                logger.warning("Email to %s refused: %s", email.recipient, e)
+                return False
+            except (smtplib.SMTPException, OSError) as e:
+                logger.info("Email to %s not sent yet: %s", email.recipient, e)
+                self._hang_up(link)
+
+        logger.warning("Giving up on email to %s", email.recipient)
+        return False
+
+    def _hang_up(self, link: "_Link") -> None:
+        link.connection = self._close(link.connection)
+        link.sent = 0
+
+    @staticmethod
+    def _send(connection: smtplib.SMTP, email: OutgoingEmail, message: str) -> None:
+        try:
+            connection.sendmail(settings.EMAIL_FROM, [email.recipient], message)
+        except smtplib.SMTPRecipientsRefused as e:
+            codes = [code for code, _ in e.recipients.values()]
+            if all(code >= 500 for code in codes):
+                raise _Permanent(e) from e
+            raise
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code >= 500:
+                raise _Permanent(e) from e
+            raise
+
+    @staticmethod
+    def _close(connection: Optional[smtplib.SMTP]) -> None:
+        if connection is None:
+            return None
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+        return None
+
+
+email_pool = EmailDeliveryPool()
@@ -0,0 +1,127 @@
+import math
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.geo import BBox
+
+# Deepest zoom with its own aggregate level; deeper map zooms reuse it
+MAX_CLUSTER_ZOOM = 16
+# Each map tile is split into 2**GRID_SHIFT x 2**GRID_SHIFT cells (64px at 256px tiles)
+GRID_SHIFT = 2
+# Web Mercator cannot represent the poles
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+
+def _finest_cell(latitude: float, longitude: float) -> Tuple[int, int]:
+    """Web Mercator grid cell of a coordinate at the deepest pyramid level."""
+    size = 1 << (MAX_CLUSTER_ZOOM + GRID_SHIFT)
+    lat = math.radians(
+        max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, latitude))
+    )
+    x = (longitude + 180.0) / 360.0 * size
+    y = (1.0 - math.log(math.tan(lat) + 1.0 / math.cos(lat)) / math.pi) / 2.0 * size
+    return (
+        min(size - 1, max(0, int(x))),
+        min(size - 1, max(0, int(y))),
+    )
+
+
+class _Cell:
+    __slots__ = ("count", "latitude_sum", "longitude_sum", "event_types")
+
+    def __init__(self):
+        self.count = 0
+        self.latitude_sum = 0.0
+        self.longitude_sum = 0.0
+        self.event_types = Counter()
+
+    def add(self, latitude: float, longitude: float, event_type: str, sign: int):
+        self.count += sign
+        self.latitude_sum += sign * latitude
+        self.longitude_sum += sign * longitude
+        self.event_types[event_type] += sign
+        if self.event_types[event_type] <= 0:
+            del self.event_types[event_type]
+
+
+class ClusterPyramid:
+    """
+    Per-zoom grid aggregates of event locations.
+
+    Every event contributes to one cell per zoom level; a cell keeps the count,
+    coordinate sums (for the centroid) and per-event-type counts, so a map
+    viewport is answered from pre-aggregated cells and inserts, moves and
+    deletes only touch one cell per level.
+    """
+
+    def __init__(self, points: Iterable = ()):
+        self._lock = threading.Lock()
+        self._levels: List[Dict[Tuple[int, int], _Cell]] = [
+            {} for _ in range(MAX_CLUSTER_ZOOM + 1)
+        ]
+        for point in points:
+            self._apply(point, 1)
+
+    def replace(self, old, new) -> None:
+        """Move an event from its old entry to its new one (either may be None)."""
+        with self._lock:
+            if old is not None:
+                self._apply(old, -1)
+            if new is not None:
+                self._apply(new, 1)
+
+    def _apply(self, point, sign: int) -> None:
+        cell_x, cell_y = _finest_cell(point.latitude, point.longitude)
+        for zoom, level in enumerate(self._levels):
+            shift = MAX_CLUSTER_ZOOM - zoom
+            key = (cell_x >> shift, cell_y >> shift)
+            cell = level.get(key)
+            if cell is None:
+                cell = level[key] = _Cell()
+            cell.add(point.latitude, point.longitude, point.event_type, sign)
+            if cell.count <= 0:
+                del level[key]
+
+    def clusters(self, bbox: BBox, zoom: int) -> List[dict]:
+        """Return the non-empty cells intersecting a bounding box at a zoom."""
+        min_lon, min_lat, max_lon, max_lat = bbox
+        zoom = max(0, min(zoom, MAX_CLUSTER_ZOOM))
+        shift = MAX_CLUSTER_ZOOM - zoom
+
+        # Mercator y grows southwards, so the north edge gives the smaller y
+        min_x, min_y = _finest_cell(max_lat, min_lon)
+        max_x, max_y = _finest_cell(min_lat, max_lon)
+        min_x, max_x = min_x >> shift, max_x >> shift
+        min_y, max_y = min_y >> shift, max_y >> shift
+
+        with self._lock:
+            level = self._levels[zoom]
+            span = (max_x - min_x + 1) * (max_y - min_y + 1)
+            if span < len(level):
+                keys = (
+                    (x, y)
+                    for x in range(min_x, max_x + 1)
+                    for y in range(min_y, max_y + 1)
+                    if (x, y) in level
+                )
+            else:
+                keys = (
+                    (x, y)
+                    for x, y in level
+                    if min_x <= x <= max_x and min_y <= y <= max_y
+                )
+
+            return [
+                {
+                    "zoom": zoom,
+                    "x": x,
+                    "y": y,
+                    "count": level[x, y].count,
+                    "latitude": level[x, y].latitude_sum / level[x, y].count,
+                    "longitude": level[x, y].longitude_sum / level[x, y].count,
+                    "event_types": dict(level[x, y].event_types),
+                }
+                for x, y in keys
+            ]
+
@@ -0,0 +1,265 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event as sa_event
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core import geo
+from app.core.config import settings
+from app.core.kdtree import KDTree
+from app.services.event_clusters import ClusterPyramid
+from app.db.models import Event
+
+# Rebuild early once this many writes have been patched in since the last build
+MAX_OVERLAY_SIZE = 1000
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    """Convert a datetime (naive means local time) to a POSIX timestamp."""
+    return value.timestamp() if value is not None else None
+
+
+@dataclass(frozen=True)
+class IndexedEvent:
+    """The slice of an event the spatial index needs to answer queries."""
+
+    id: int
+    latitude: float
+    longitude: float
+    point: Tuple[float, float, float]
+    event_type: str
+    ends_at: Optional[float]
+
+    @classmethod
+    def from_event(cls, event: Event) -> Optional["IndexedEvent"]:
+        """Build an entry, or None if the event is not an upcoming located event."""
+        if event.latitude is None or event.longitude is None:
+            return None
+
+        ends_at = _timestamp(event.end_time or event.start_time)
+        if ends_at is not None and ends_at < time.time():
+            return None
+
+        return cls(
+            id=event.id,
+            latitude=event.latitude,
+            longitude=event.longitude,
+            point=geo.to_unit_vector(event.latitude, event.longitude),
+            event_type=event.event_type,
+            ends_at=ends_at,
+        )
+
+    def is_active(self, now: float, event_type: Optional[str]) -> bool:
+        if self.ends_at is not None and self.ends_at < now:
+            return False
+        return event_type is None or self.event_type == event_type
+
+
+class EventLocationIndex:
+    """
+    Process-local k-d tree snapshot of upcoming event locations.
+
+    The tree is rebuilt from the database periodically. Committed event writes
+    in between are patched in: changed events go to a small overlay that is
+    scanned linearly, and their stale tree entries are masked out. The map
+    cluster pyramid is kept alongside and patched from the same writes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rebuild_lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the snapshot so the next query rebuilds it."""
+        with self._lock:
+            self._tree = KDTree([], [])
+            self._entries: Dict[int, IndexedEvent] = {}
+            self.clusters = ClusterPyramid()
+            # id -> (entry or None when removed, monotonic time of the patch)
+            self._overlay: Dict[int, Tuple[Optional[IndexedEvent], float]] = {}
+            self._built_at: Optional[float] = None
+
+    @property
+    def is_built(self) -> bool:
+        return self._built_at is not None
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the last rebuild, or None if never built."""
+        if self._built_at is None:
+            return None
+        return time.monotonic() - self._built_at
+
+    def rebuild(self, db: Session) -> int:
+        """Rebuild the tree from the database. Returns the number of events."""
+        started_at = time.monotonic()
+        entries = {}
+        for event in db.query(Event).filter(
+            Event.latitude.isnot(None), Event.longitude.isnot(None)
+        ):
+            entry = IndexedEvent.from_event(event)
+            if entry is not None:
+                entries[entry.id] = entry
+
+        tree = KDTree(list(entries), [entry.point for entry in entries.values()])
+        clusters = ClusterPyramid(entries.values())
+
+        with self._lock:
+            # Keep patches committed while the snapshot was being loaded
+            overlay = {
+                event_id: patch
+                for event_id, patch in self._overlay.items()
+                if patch[1] >= started_at
+            }
+            for event_id, (entry, _) in overlay.items():
+                clusters.replace(entries.get(event_id), entry)
+
+            self._tree = tree
+            self._entries = entries
+            self._overlay = overlay
+            self.clusters = clusters
+            self._built_at = started_at
+
+        return len(entries)
+
+    def rebuild_in_background(self, session_factory: sessionmaker) -> bool:
+        """Start a rebuild on a worker thread unless one is already running."""
+        if not self._rebuild_lock.acquire(blocking=False):
+            return False
+
+        def run():
+            db = session_factory()
+            try:
+                self.rebuild(db)
+            finally:
+                db.close()
+                self._rebuild_lock.release()
+
+        threading.Thread(target=run, name="event-index-rebuild", daemon=True).start()
+        return True
+
+    def ensure_fresh(self, db: Session) -> None:
+        """Build the index on first use and refresh it in the background."""
+        if not self.is_built:
+            with self._rebuild_lock:
+                if not self.is_built:
+                    self.rebuild(db)
+            return
+
+        if (
+            self.age > settings.EVENT_INDEX_MAX_AGE_SECONDS
+            or len(self._overlay) > MAX_OVERLAY_SIZE
+        ):
+            self.rebuild_in_background(sessionmaker(bind=db.get_bind()))
+
+    def apply(self, event_id: int, entry: Optional[IndexedEvent]) -> None:
+        """Patch a committed insert/update (entry) or delete (None) into the index."""
+        with self._lock:
+            if event_id in self._overlay:
+                previous = self._overlay[event_id][0]
+            else:
+                previous = self._entries.get(event_id)
+            self.clusters.replace(previous, entry)
+            self._overlay[event_id] = (entry, time.monotonic())
+
+    def _snapshot(self):
+        with self._lock:
+            return self._tree, self._entries, dict(self._overlay)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 10,
+        event_type: Optional[str] = None,
+        max_distance: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return up to k (event_id, distance_km) pairs, closest first."""
+        tree, entries, overlay = self._snapshot()
+        target = geo.to_unit_vector(latitude, longitude)
+        now = time.time()
+
+        def accept(event_id):
+            return event_id not in overlay and entries[event_id].is_active(
+                now, event_type
+            )
+
+        if max_distance is None:
+            found = tree.nearest(target, k, accept)
+        else:
+            found = tree.within(target, geo.chord_from_km(max_distance), accept)
+
+        found.extend(self._scan_overlay(overlay, target, now, event_type))
+        found.sort()
+
+        results = [
+            (event_id, geo.km_from_chord(distance_sq**0.5))
+            for distance_sq, event_id in found
+        ]
+        if max_distance is not None:
+            results = [item for item in results if item[1] <= max_distance]
+        return results[:k]
+
+    def within(
+        self,
+        latitude: float,
+        longitude: float,
+        radius: float,
+        event_type: Optional[str] = None,
+    ) -> List[Tuple[int, float]]:
+        """Return all (event_id, distance_km) pairs within radius, closest first."""
+        tree, entries, overlay = self._snapshot()
+        target = geo.to_unit_vector(latitude, longitude)
+        now = time.time()
+
+        def accept(event_id):
+            return event_id not in overlay and entries[event_id].is_active(
+                now, event_type
+            )
+
+        found = tree.within(target, geo.chord_from_km(radius), accept)
+        found.extend(self._scan_overlay(overlay, target, now, event_type))
+        found.sort()
+
+        results = [
+            (event_id, geo.km_from_chord(distance_sq**0.5))
+            for distance_sq, event_id in found
+        ]
+        return [item for item in results if item[1] <= radius]
+
+    @staticmethod
+    def _scan_overlay(overlay, target, now, event_type):
+        for entry, _ in overlay.values():
+            if entry is not None and entry.is_active(now, event_type):
+                distance_sq = sum((a - b) ** 2 for a, b in zip(entry.point, target))
+                yield distance_sq, entry.id
+
+
+event_index = EventLocationIndex()
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _collect_event_changes(session, flush_context):
+    """Remember flushed event writes until the transaction commits."""
+    changes = session.info.setdefault("event_index_changes", {})
+    for obj in session.new.union(session.dirty):
+        if isinstance(obj, Event):
+            changes[obj.id] = IndexedEvent.from_event(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Event):
+            changes[obj.id] = None
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _apply_event_changes(session):
+    for event_id, entry in session.info.pop("event_index_changes", {}).items():
+        event_index.apply(event_id, entry)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_event_changes(session):
+    session.info.pop("event_index_changes", None)
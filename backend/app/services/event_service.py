@@ -1,15 +1,27 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.db.models import Event, EventCollaborator, Organization, EventBeneficiary, User
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core import geo
+from app.core.config import settings
+from app.db.models import (
+    Event,
+    EventCollaborator,
+    Organization,
+    EventBeneficiary,
+    ResourceRequest,
+    User,
+)
 from app.schemas import (
     EventCreate,
     EventUpdate,
+    EventBulkItem,
+    EventBulkUpdateItem,
+    EventResponse,
     EventCollaboratorCreate,
     EventBeneficiaryCreate,
 )
 from datetime import datetime, timezone
-import math
-from sqlalchemy import func
+from sqlalchemy import func, select
+from app.services.event_index import event_index
 
 
 def get_event(db: Session, event_id: int) -> Optional[Event]:
@@ -17,6 +29,44 @@ def get_event(db: Session, event_id: int) -> Optional[Event]:
     return db.query(Event).filter(Event.id == event_id).first()
 
 
+def get_event_detail(db: Session, event_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Get an event with its organization, resource requests, collaborating
+    organizations and beneficiary count in three queries: the event row
+    with its organization and count, then the requests and collaborators.
+    """
+    beneficiary_count = (
+        select(func.count())
+        .where(EventBeneficiary.event_id == Event.id)
+        .correlate(Event)
+        .scalar_subquery()
+    )
+    row = db.execute(
+        select(Event, beneficiary_count)
+        .options(
+            joinedload(Event.organization),
+            selectinload(Event.resource_requests),
+            selectinload(Event.collaborators).joinedload(
+                EventCollaborator.organization
+            ),
+        )
+        .where(Event.id == event_id)
+    ).first()
+    if row is None:
+        return None
+
+    event, count = row
+    return {
+        **EventResponse.model_validate(event).model_dump(),
+        "organization": event.organization,
+        "resource_requests": event.resource_requests,
+        "collaborators": [
+            collaborator.organization for collaborator in event.collaborators
+        ],
+        "beneficiary_count": count,
+    }
+
+
 def get_events(db: Session, skip: int = 0, limit: int = 100) -> List[Event]:
     """Get all events with pagination."""
     return db.query(Event).offset(skip).limit(limit).all()
@@ -62,6 +112,7 @@ def create_event(db: Session, event_data: EventCreate) -> Event:
         latitude=event_data.latitude,
         longitude=event_data.longitude,
         address=event_data.address,
+        wilaya=event_data.wilaya,
     )
 
     db.add(db_event)
@@ -71,6 +122,138 @@ def create_event(db: Session, event_data: EventCreate) -> Event:
     return db_event
 
 
+def get_event_organization_ids(
+    db: Session, event_ids: Iterable[int]
+) -> Dict[int, int]:
+    """Map each of the events that exist to its organization."""
+    return dict(
+        db.query(Event.id, Event.organization_id)
+        .filter(Event.id.in_(set(event_ids)))
+        .all()
+    )
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Naive UTC datetime, so stored and submitted times compare."""
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _ends_before_start(start_time, end_time) -> bool:
+    if start_time is None or end_time is None:
+        return False
+    return _as_utc(end_time) < _as_utc(start_time)
+
+
+def _event_result(event: Event, requests=()) -> Dict[str, Any]:
+    result = EventResponse.model_validate(event).model_dump()
+    result["resource_requests"] = [
+        {
+            "id": request.id,
+            "event_id": event.id,
+            "resource_type": request.resource_type,
+            "quantity_needed": request.quantity_needed,
+            "quantity_received": 0,
+        }
+        for request in requests
+    ]
+    return result
+
+
+def create_events(
+    db: Session, events: List[EventBulkItem]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Create a batch of events, each with its resource requests, in one
+    transaction.
+
+    Returns (results, errors): the created events in batch order, or the
+    {"index", "error"} of every invalid item, in which case nothing is
+    written. Each table is inserted with batched multi-row INSERTs in a
+    single flush.
+    """
+    org_ids = {event.organization_id for event in events}
+    found = {
+        org_id
+        for (org_id,) in db.query(Organization.id)
+        .filter(Organization.id.in_(org_ids))
+        .all()
+    }
+
+    errors = []
+    for index, event in enumerate(events):
+        if event.organization_id not in found:
+            errors.append({"index": index, "error": "Organization does not exist"})
+        elif _ends_before_start(event.start_time, event.end_time):
+            errors.append({"index": index, "error": "Event ends before it starts"})
+    if errors:
+        return [], errors
+
+    db_events = [
+        Event(
+            **event.model_dump(exclude={"resource_requests"}),
+            resource_requests=[
+                ResourceRequest(
+                    resource_type=request.resource_type,
+                    quantity_needed=request.quantity_needed,
+                    quantity_received=0,
+                )
+                for request in event.resource_requests
+            ],
+        )
+        for event in events
+    ]
+    db.add_all(db_events)
+    db.flush()
+
+    results = [_event_result(event, event.resource_requests) for event in db_events]
+    db.commit()
+    return results, []
+
+
+def update_events(
+    db: Session, events: List[EventBulkUpdateItem]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Update a batch of events in one transaction; only the fields set on an
+    item change. Returns (results, errors) as for `create_events`.
+    """
+    db_events = {
+        event.id: event
+        for event in db.query(Event).filter(Event.id.in_({e.id for e in events}))
+    }
+
+    errors = []
+    seen = set()
+    changes = []
+    for index, item in enumerate(events):
+        event = db_events.get(item.id)
+        update_data = item.model_dump(exclude_unset=True, exclude={"id"})
+        if event is None:
+            errors.append({"index": index, "error": "Event not found"})
+        elif item.id in seen:
+            errors.append({"index": index, "error": "Event is updated twice"})
+        elif _ends_before_start(
+            update_data.get("start_time", event.start_time),
+            update_data.get("end_time", event.end_time),
+        ):
+            errors.append({"index": index, "error": "Event ends before it starts"})
+        seen.add(item.id)
+        changes.append((event, update_data))
+    if errors:
+        return [], errors
+
+    for event, update_data in changes:
+        for field, value in update_data.items():
+            setattr(event, field, value)
+    db.flush()
+
+    results = [_event_result(event) for event, _ in changes]
+    db.commit()
+    return results, []
+
+
 def update_event(
     db: Session, event_id: int, event_data: EventUpdate
 ) -> Optional[Event]:
@@ -225,25 +408,37 @@ def get_event_beneficiaries(db: Session, event_id: int) -> List[User]:
     return db.query(User).filter(User.id.in_(user_ids)).all()
 
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+def find_nearby_event_distances(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    radius: float = 5.0,  # Default 5km radius
+    event_type: Optional[str] = None,
+) -> List[Tuple[int, float]]:
     """
-    Calculate the great circle distance between two points
-    on the earth using the Haversine formula.
-    Returns distance in kilometers.
+    Find events within a certain radius (in kilometers) from a given location.
+    Returns (event_id, distance_km) pairs sorted by distance.
     """
-    # Convert decimal degrees to radians
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-
-    # Haversine formula
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+    min_lat, max_lat, min_lon, max_lon = geo.bounding_box(latitude, longitude, radius)
+
+    # Only fetch the columns needed for the distance filter
+    query = db.query(Event.id, Event.latitude, Event.longitude).filter(
+        Event.latitude.between(min_lat, max_lat),
+        Event.longitude.between(min_lon, max_lon),
+    )
+
+    # Filter by event type if provided
+    if event_type:
+        query = query.filter(Event.event_type == event_type)
+
+    candidates = query.all()
+    if not candidates:
+        return []
+
+    ids, latitudes, longitudes = zip(*candidates)
+    return geo.filter_within_radius(
+        latitude, longitude, ids, latitudes, longitudes, radius
     )
-    c = 2 * math.asin(math.sqrt(a))
-    r = 6371  # Radius of earth in kilometers
-    return c * r
 
 
 def get_nearby_events(
@@ -258,50 +453,73 @@ def get_nearby_events(
     """
     Find events within a certain radius (in kilometers) from a given location.
     Optionally filter by event type.
+    Served from the in-memory index of upcoming events when it is enabled.
     """
-    # Approximate conversion from distance in kilometers to degrees
-    # 1 degree of latitude is approximately 111 kilometers
-    degree_radius = radius / 111.0
+    if settings.EVENT_INDEX_ENABLED:
+        event_index.ensure_fresh(db)
+        matches = event_index.within(
+            latitude, longitude, radius, event_type=event_type
+        )
+    else:
+        matches = find_nearby_event_distances(
+            db, latitude, longitude, radius=radius, event_type=event_type
+        )
+
+    return _hydrate_events_with_distance(db, matches[skip : skip + limit])
 
-    # Base query for events
-    query = db.query(Event)
 
-    # Filter by coordinates - this is a simple approximation using a square boundary
-    query = query.filter(
-        Event.latitude.between(latitude - degree_radius, latitude + degree_radius),
-        Event.longitude.between(longitude - degree_radius, longitude + degree_radius),
+def get_nearest_events(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    k: int = 10,
+    event_type: Optional[str] = None,
+    max_distance: Optional[float] = None,
+) -> List[Event]:
+    """
+    Find the k upcoming events closest to a given location, without a radius.
+    Optionally filter by event type or cap the distance (in kilometers).
+    """
+    event_index.ensure_fresh(db)
+    matches = event_index.nearest(
+        latitude, longitude, k=k, event_type=event_type, max_distance=max_distance
     )
+    return _hydrate_events_with_distance(db, matches)
 
-    # Filter by event type if provided
-    if event_type:
-        query = query.filter(Event.event_type == event_type)
 
-    # Get candidate events that are roughly within the square boundary
-    candidates = query.all()
+def _hydrate_events_with_distance(
+    db: Session, page: List[Tuple[int, float]]
+) -> List[Event]:
+    """Load the events for (id, distance) pairs, keeping their order."""
+    if not page:
+        return []
+
+    events = db.query(Event).filter(Event.id.in_([event_id for event_id, _ in page]))
+    events_by_id = {event.id: event for event in events}
 
-    # Further filter using actual haversine distance calculation
     nearby_events = []
-    for event in candidates:
-        # Skip events without coordinates
-        if event.latitude is None or event.longitude is None:
+    for event_id, distance in page:
+        event = events_by_id.get(event_id)
+        if event is None:
             continue
+        # Add distance as attribute to event
+        event.distance = distance
+        nearby_events.append(event)
 
-        # Calculate distance using Haversine formula
-        distance = calculate_distance(
-            latitude, longitude, event.latitude, event.longitude
-        )
-
-        # Include event if within the specified radius
-        if distance <= radius:
-            # Add distance as attribute to event
-            event.distance = distance
-            nearby_events.append(event)
+    return nearby_events
 
-    # Sort by distance
-    nearby_events.sort(key=lambda x: x.distance)
 
-    # Apply skip and limit
-    return nearby_events[skip : skip + limit]
+def get_event_clusters(
+    db: Session,
+    bbox: Tuple[float, float, float, float],
+    zoom: int,
+) -> List[dict]:
+    """
+    Get pre-aggregated map clusters of upcoming events for a viewport.
+    bbox is (min_lon, min_lat, max_lon, max_lat).
+    """
+    event_index.ensure_fresh(db)
+    return event_index.clusters.clusters(bbox, zoom)
 
 
 def search_events(
@@ -0,0 +1,178 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    User,
+    Event,
+    ResourceRequest,
+    ResourceContribution,
+    EventBeneficiary,
+)
+
+# Rows fetched per round-trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+# Encoded bytes buffered before a chunk is sent
+CHUNK_SIZE = 64 * 1024
+
+EXPORT_DATASETS = ("contributions", "beneficiaries", "events")
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _contributions_query(db: Session, organization_id: int, start, end):
+    query = (
+        db.query(
+            ResourceContribution.id,
+            ResourceContribution.contribution_time,
+            ResourceContribution.request_id,
+            ResourceRequest.event_id,
+            Event.title.label("event_title"),
+            ResourceRequest.resource_type,
+            ResourceContribution.quantity,
+            ResourceContribution.user_id,
+            User.full_name.label("contributor_name"),
+            ResourceContribution.kind,
+            ResourceContribution.note,
+        )
+        .join(ResourceRequest, ResourceContribution.request_id == ResourceRequest.id)
+        .join(Event, ResourceRequest.event_id == Event.id)
+        .outerjoin(User, ResourceContribution.user_id == User.id)
+        .filter(Event.organization_id == organization_id)
+    )
+    if start:
+        query = query.filter(ResourceContribution.contribution_time >= start)
+    if end:
+        query = query.filter(ResourceContribution.contribution_time <= end)
+    return query.order_by(ResourceContribution.id)
+
+
+def _beneficiaries_query(db: Session, organization_id: int, start, end):
+    query = (
+        db.query(
+            EventBeneficiary.event_id,
+            Event.title.label("event_title"),
+            EventBeneficiary.user_id,
+            User.full_name.label("beneficiary_name"),
+            EventBeneficiary.benefit_time,
+        )
+        .join(Event, EventBeneficiary.event_id == Event.id)
+        .outerjoin(User, EventBeneficiary.user_id == User.id)
+        .filter(Event.organization_id == organization_id)
+    )
+    if start:
+        query = query.filter(EventBeneficiary.benefit_time >= start)
+    if end:
+        query = query.filter(EventBeneficiary.benefit_time <= end)
+    return query.order_by(EventBeneficiary.event_id, EventBeneficiary.user_id)
+
+
+def _events_query(db: Session, organization_id: int, start, end):
+    query = db.query(
+        Event.id,
+        Event.title,
+        Event.event_type,
+        Event.start_time,
+        Event.end_time,
+        Event.address,
+        Event.latitude,
+        Event.longitude,
+        Event.created_at,
+    ).filter(Event.organization_id == organization_id)
+    if start:
+        query = query.filter(Event.start_time >= start)
+    if end:
+        query = query.filter(Event.start_time <= end)
+    return query.order_by(Event.id)
+
+
+_QUERIES = {
+    "contributions": _contributions_query,
+    "beneficiaries": _beneficiaries_query,
+    "events": _events_query,
+}
+
+
+def _export_rows(
+    db: Session,
+    dataset: str,
+    organization_id: int,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Tuple[List[str], Iterable]:
+    query = _QUERIES[dataset](db, organization_id, start, end)
+    columns = [column["name"] for column in query.column_descriptions]
+    return columns, query.yield_per(EXPORT_BATCH_SIZE)
+
+
+def _csv_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _encode_csv(columns: List[str], rows: Iterable) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _encode_ndjson(columns: List[str], rows: Iterable) -> Iterator[str]:
+    lines = []
+    size = 0
+    for row in rows:
+        line = json.dumps(
+            {name: _csv_value(value) for name, value in zip(columns, row)},
+            separators=(",", ":"),
+        )
+        lines.append(line + "\n")
+        size += len(line) + 1
+        if size >= CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+            size = 0
+    yield "".join(lines)
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly, holding only the compressor's window."""
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream_export(
+    db: Session,
+    dataset: str,
+    organization_id: int,
+    export_format: str = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    compress: bool = False,
+) -> Iterator[bytes]:
+    """
+    Stream an organization's contributions, beneficiaries or events as CSV
+    or NDJSON, optionally gzipped. Rows are read through a server-side cursor
+    and encoded in fixed-size chunks, so memory does not grow with the export.
+    """
+    if dataset not in _QUERIES:
+        raise ValueError(f"Unknown export: {dataset}")
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    columns, rows = _export_rows(db, dataset, organization_id, start, end)
+    encode = _encode_csv if export_format == "csv" else _encode_ndjson
+    chunks = (text.encode("utf-8") for text in encode(columns, rows) if text)
+    return gzip_stream(chunks) if compress else chunks
@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.geo import BBox
+from app.db.models import Event, Organization
+
+# Rows fetched per round-trip from the server-side cursor
+STREAM_BATCH_SIZE = 500
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _feature(longitude: float, latitude: float, properties: Dict[str, Any]) -> str:
+    return json.dumps(
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+            "properties": properties,
+        },
+        default=_json_default,
+        separators=(",", ":"),
+    )
+
+
+def _feature_collection(
+    rows: Iterable, to_feature: Callable[[Any], str]
+) -> Iterator[str]:
+    """Encode rows as a GeoJSON FeatureCollection one feature at a time."""
+    yield '{"type":"FeatureCollection","features":['
+    separator = ""
+    for row in rows:
+        yield separator + to_feature(row)
+        separator = ","
+    yield "]}"
+
+
+def _within_bbox(query, latitude, longitude, bbox: Optional[BBox]):
+    query = query.filter(latitude.isnot(None), longitude.isnot(None))
+    if bbox is not None:
+        min_lon, min_lat, max_lon, max_lat = bbox
+        query = query.filter(
+            latitude.between(min_lat, max_lat),
+            longitude.between(min_lon, max_lon),
+        )
+    return query
+
+
+def stream_events_geojson(
+    db: Session,
+    bbox: Optional[BBox] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+) -> Iterator[str]:
+    """
+    Stream located events as GeoJSON, optionally limited to a bounding box
+    and to events overlapping the [start, end] time window.
+    Rows are read through a server-side cursor, never as one list.
+    """
+    query = db.query(
+        Event.id,
+        Event.title,
+        Event.event_type,
+        Event.start_time,
+        Event.end_time,
+        Event.organization_id,
+        Event.address,
+        Event.latitude,
+        Event.longitude,
+    )
+    query = _within_bbox(query, Event.latitude, Event.longitude, bbox)
+
+    if start:
+        query = query.filter(func.coalesce(Event.end_time, Event.start_time) >= start)
+    if end:
+        query = query.filter(Event.start_time <= end)
+    if event_type:
+        query = query.filter(Event.event_type == event_type)
+
+    rows = query.order_by(Event.id).yield_per(STREAM_BATCH_SIZE)
+
+    return _feature_collection(
+        rows,
+        lambda row: _feature(
+            row.longitude,
+            row.latitude,
+            {
+                "id": row.id,
+                "title": row.title,
+                "event_type": row.event_type,
+                "start_time": row.start_time,
+                "end_time": row.end_time,
+                "organization_id": row.organization_id,
+                "address": row.address,
+            },
+        ),
+    )
+
+
+def stream_organizations_geojson(
+    db: Session, bbox: Optional[BBox] = None
+) -> Iterator[str]:
+    """Stream located organizations as GeoJSON, optionally within a bounding box."""
+    query = db.query(
+        Organization.id,
+        Organization.name,
+        Organization.location,
+        Organization.latitude,
+        Organization.longitude,
+    )
+    query = _within_bbox(query, Organization.latitude, Organization.longitude, bbox)
+
+    rows = query.order_by(Organization.id).yield_per(STREAM_BATCH_SIZE)
+
+    return _feature_collection(
+        rows,
+        lambda row: _feature(
+            row.longitude,
+            row.latitude,
+            {"id": row.id, "name": row.name, "location": row.location},
+        ),
+    )
@@ -0,0 +1,282 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import delete, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.idempotency import idempotency_store
+from app.core.scheduler import Cron, Interval, Scheduler
+from app.db.models import SchedulerLock
+from app.db.session import DatabaseConnection
+from app.services import (
+    leaderboard_service,
+    notification_service,
+    resource_service,
+    sketch_service,
+    stats_service,
+)
+from app.services.dashboard_service import dashboard_snapshot
+from app.services.event_index import event_index
+
+# Identifies this process in scheduler_locks
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _session() -> Session:
+    return DatabaseConnection().get_session()
+
+
+class DatabaseJobLock:
+    """
+    Job lock leased through the scheduler_locks table.
+
+    A lease expires after the job timeout, so a worker that dies mid-run does
+    not block the job for good. Released leases can be kept until the job's
+    next slot, so other workers skip the slot that was just run.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = _session):
+        self.session_factory = session_factory
+
+    def acquire(self, name: str, ttl: float) -> bool:
+        now = datetime.now()
+        db = self.session_factory()
+        try:
+            taken = db.execute(
+                update(SchedulerLock)
+                .where(
+                    SchedulerLock.name == name,
+                    or_(
+                        SchedulerLock.expires_at < now,
+                        SchedulerLock.owner == WORKER_ID,
+                    ),
+                )
+                .values(owner=WORKER_ID, expires_at=now + timedelta(seconds=ttl))
+            ).rowcount
+            if not taken:
+                try:
+                    with db.begin_nested():
+                        db.execute(
+                            insert(SchedulerLock).values(
+                                name=name,
+                                owner=WORKER_ID,
+                                expires_at=now + timedelta(seconds=ttl),
+                            )
+                        )
+                except IntegrityError:
+                    # Another worker holds a live lease
+                    return False
+            db.commit()
+            return True
+        finally:
+            db.close()
+
+    def release(self, name: str, hold_until: Optional[datetime] = None) -> None:
+        db = self.session_factory()
+        mine = (SchedulerLock.name == name, SchedulerLock.owner == WORKER_ID)
+        try:
+            if hold_until is not None and hold_until > datetime.now():
+                db.execute(
+                    update(SchedulerLock).where(*mine).values(expires_at=hold_until)
+                )
+            else:
+                db.execute(delete(SchedulerLock).where(*mine))
+            db.commit()
+        finally:
+            db.close()
+
+
+scheduler = Scheduler(lock=DatabaseJobLock())
+
+
+def refresh_dashboard_snapshot() -> None:
+    """Keep a dashboard snapshot that is in use warm in this process."""
+    if dashboard_snapshot.age is None:
+        return
+    db = _session()
+    try:
+        dashboard_snapshot.refresh(db)
+    finally:
+        db.close()
+
+
+def rebuild_event_index() -> None:
+    """Rebuild this process's event index if it has been used."""
+    if not event_index.is_built:
+        return
+    db = _session()
+    try:
+        event_index.rebuild(db)
+    finally:
+        db.close()
+
+
+def reconcile_counters() -> None:
+    db = _session()
+    try:
+        stats_service.reconcile_counters(db)
+    finally:
+        db.close()
+
+
+def reconcile_unread_counts() -> None:
+    db = _session()
+    try:
+        notification_service.reconcile_unread_counts(db)
+    finally:
+        db.close()
+
+
+def take_ledger_snapshots() -> None:
+    db = _session()
+    try:
+        resource_service.take_ledger_snapshots(db)
+    finally:
+        db.close()
+
+
+def fold_sketches() -> None:
+    db = _session()
+    try:
+        sketch_service.fold_sketches(db)
+    finally:
+        db.close()
+
+
+def fold_leaderboards() -> None:
+    db = _session()
+    try:
+        leaderboard_service.fold_leaderboards(db)
+    finally:
+        db.close()
+
+
+def clean_up_notifications() -> None:
+    """Delete read notifications older than the retention period."""
+    db = _session()
+    try:
+        notification_service.delete_read_notifications_before(
+            db, datetime.now() - timedelta(days=settings.NOTIFICATION_RETENTION_DAYS)
+        )
+        notification_service.delete_stale_cursors(
+            db, datetime.now() - timedelta(days=1)
+        )
+    finally:
+        db.close()
+
+
+def delete_expired_idempotency_keys() -> None:
+    idempotency_store.delete_expired()
+
+
+def deliver_queued_emails() -> None:
+    db = _session()
+    try:
+        notification_service.deliver_queued_emails(db)
+    finally:
+        db.close()
+
+
+def relay_notifications() -> None:
+    db = _session()
+    try:
+        notification_service.relay_notifications(db, WORKER_ID)
+    finally:
+        db.close()
+
+
+def register_jobs() -> None:
+    """Register the maintenance jobs; safe to call more than once."""
+    if scheduler.jobs:
+        return
+
+    # Process-local caches: every worker refreshes its own copy
+    scheduler.add_job(
+        "refresh_dashboard_snapshot",
+        refresh_dashboard_snapshot,
+        Interval(settings.DASHBOARD_SNAPSHOT_MAX_AGE_SECONDS),
+        jitter=5,
+    )
+    scheduler.add_job(
+        "rebuild_event_index",
+        rebuild_event_index,
+        Interval(settings.EVENT_INDEX_MAX_AGE_SECONDS),
+        jitter=30,
+    )
+    scheduler.add_job(
+        "relay_notifications",
+        relay_notifications,
+        Interval(settings.NOTIFICATION_RELAY_INTERVAL_SECONDS),
+    )
+
+    # Shared database maintenance: one worker per run
+    scheduler.add_job(
+        "take_ledger_snapshots",
+        take_ledger_snapshots,
+        Interval(settings.LEDGER_SNAPSHOT_INTERVAL_SECONDS),
+        jitter=5,
+        leader_only=True,
+    )
+    scheduler.add_job(
+        "fold_sketches",
+        fold_sketches,
+        Interval(settings.SUMMARY_FOLD_INTERVAL_SECONDS),
+        jitter=5,
+        leader_only=True,
+    )
+    scheduler.add_job(
+        "fold_leaderboards",
+        fold_leaderboards,
+        Interval(settings.SUMMARY_FOLD_INTERVAL_SECONDS),
+        jitter=5,
+        leader_only=True,
+    )
+    scheduler.add_job(
+        "deliver_queued_emails",
+        deliver_queued_emails,
+        Interval(settings.NOTIFICATION_EMAIL_INTERVAL_SECONDS),
+        jitter=5,
+        leader_only=True,
+    )
+    scheduler.add_job(
+        "delete_expired_idempotency_keys",
+        delete_expired_idempotency_keys,
+        Cron("7 * * * *"),
+        jitter=60,
+        leader_only=True,
+    )
+    scheduler.add_job(
+        "reconcile_counters",
+        reconcile_counters,
+        Cron("17 3 * * *"),
+        jitter=60,
+        leader_only=True,
+    )
+    scheduler.add_job(
+        "reconcile_unread_counts",
+        reconcile_unread_counts,
+        Cron("29 3 * * *"),
+        jitter=60,
+        leader_only=True,
+    )
+    scheduler.add_job(
+        "clean_up_notifications",
+        clean_up_notifications,
+        Cron("43 3 * * *"),
+        jitter=60,
+        leader_only=True,
+    )
+
+
+def start() -> None:
+    register_jobs()
+    scheduler.start()
+
+
+async def stop() -> None:
+    await scheduler.stop()
@@ -0,0 +1,321 @@
+import heapq
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.functions import upsert
+
+from app.db.models import (
+    User,
+    Organization,
+    Event,
+    ResourceRequest,
+    ResourceContribution,
+    LeaderboardTotal,
+    LeaderboardEntry,
+)
+from app.services.rollup_service import move_cursor, read_cursor, settled_id
+
+BOARDS = ("contributors", "organizations")
+LEADERBOARD_METRICS = ("quantity", "contributions")
+# Entries kept per board; reads can ask for at most this many
+TOP_SIZE = 100
+CURSOR = "leaderboards"
+
+# (user_id, organization_id, resource_type, day, quantity, contributions)
+ContributionDelta = Tuple[Optional[int], Optional[int], Optional[str], date, int, int]
+BoardKey = Tuple[str, str, str]  # (board, period, resource_type)
+
+
+def _board_deltas(rows: Iterable[ContributionDelta]) -> Dict[tuple, List[int]]:
+    """Spread contribution deltas over every board, period and type they count in."""
+    deltas = defaultdict(lambda: [0, 0])
+    for user_id, organization_id, resource_type, day, quantity, count in rows:
+        periods = ("all", day.strftime("%Y-%m"))
+        resource_types = ("", resource_type) if resource_type else ("",)
+        for board, subject_id in (
+            ("contributors", user_id),
+            ("organizations", organization_id),
+        ):
+            if subject_id is None:
+                continue
+            for period in periods:
+                for type_key in resource_types:
+                    delta = deltas[board, period, type_key, subject_id]
+                    delta[0] += quantity
+                    delta[1] += count
+    return deltas
+
+
+def _add_to_total(connection, key, quantity: int, count: int) -> Tuple[int, int]:
+    board, period, resource_type, subject_id = key
+    totals = connection.execute(
+        upsert(connection, LeaderboardTotal)
+        .values(
+            board=board,
+            period=period,
+            resource_type=resource_type,
+            subject_id=subject_id,
+            quantity=quantity,
+            contributions=count,
+        )
+        .on_conflict_do_update(
+            index_elements=[
+                LeaderboardTotal.board,
+                LeaderboardTotal.period,
+                LeaderboardTotal.resource_type,
+                LeaderboardTotal.subject_id,
+            ],
+            set_={
+                "quantity": LeaderboardTotal.quantity + quantity,
+                "contributions": LeaderboardTotal.contributions + count,
+            },
+        )
+        .returning(LeaderboardTotal.quantity, LeaderboardTotal.contributions)
+    ).one()
+    return tuple(totals)
+
+
+def _entry_filter(board_key: BoardKey, metric: str):
+    board, period, resource_type = board_key
+    return (
+        LeaderboardEntry.board == board,
+        LeaderboardEntry.period == period,
+        LeaderboardEntry.resource_type == resource_type,
+        LeaderboardEntry.metric == metric,
+    )
+
+
+def _offer(connection, board_key: BoardKey, metric: str, candidates: Dict[int, int]):
+    """Merge grown totals into a top-N board, evicting whoever falls off."""
+    match = _entry_filter(board_key, metric)
+    current = dict(
+        connection.execute(
+            select(LeaderboardEntry.subject_id, LeaderboardEntry.value).where(*match)
+        ).all()
+    )
+
+    merged = {**current, **candidates}
+    top = dict(
+        heapq.nsmallest(
+            TOP_SIZE, merged.items(), key=lambda item: (-item[1], item[0])
+        )
+    )
+
+    evicted = [subject_id for subject_id in current if subject_id not in top]
+    if evicted:
+        connection.execute(
+            delete(LeaderboardEntry).where(
+                *match, LeaderboardEntry.subject_id.in_(evicted)
+            )
+        )
+    board, period, resource_type = board_key
+    for subject_id, value in top.items():
+        if subject_id not in current:
+            connection.execute(
+                insert(LeaderboardEntry).values(
+                    board=board,
+                    period=period,
+                    resource_type=resource_type,
+                    metric=metric,
+                    subject_id=subject_id,
+                    value=value,
+                )
+            )
+        elif current[subject_id] != value:
+            connection.execute(
+                update(LeaderboardEntry)
+                .where(*match, LeaderboardEntry.subject_id == subject_id)
+                .values(value=value)
+            )
+
+
+def _refill(connection, board_key: BoardKey, metric: str) -> None:
+    """Rebuild a top-N board from the totals, after someone's total shrank."""
+    board, period, resource_type = board_key
+    value = getattr(LeaderboardTotal, metric)
+    connection.execute(delete(LeaderboardEntry).where(*_entry_filter(board_key, metric)))
+    connection.execute(
+        insert(LeaderboardEntry).from_select(
+            ["board", "period", "resource_type", "metric", "subject_id", "value"],
+            select(
+                LeaderboardTotal.board,
+                LeaderboardTotal.period,
+                LeaderboardTotal.resource_type,
+                literal(metric),
+                LeaderboardTotal.subject_id,
+                value,
+            )
+            .where(
+                LeaderboardTotal.board == board,
+                LeaderboardTotal.period == period,
+                LeaderboardTotal.resource_type == resource_type,
+                value > 0,
+            )
+            .order_by(value.desc(), LeaderboardTotal.subject_id)
+            .limit(TOP_SIZE),
+        )
+    )
+
+
+def apply_contributions(db: Session, rows: Iterable[ContributionDelta]) -> None:
+    """
+    Fold contribution deltas into the totals and top-N boards inside the
+    current transaction. Negative deltas refill the affected boards from
+    the totals. Boards are read, merged and written back, so callers must
+    not run concurrently.
+    """
+    connection = db.connection()
+    grown = defaultdict(lambda: defaultdict(dict))
+    shrunk = set()
+
+    for key, (quantity, count) in sorted(_board_deltas(rows).items()):
+        totals = _add_to_total(connection, key, quantity, count)
+        board_key = key[:3]
+        if quantity < 0 or count < 0:
+            shrunk.add(board_key)
+        for metric, value in zip(LEADERBOARD_METRICS, totals):
+            grown[board_key][metric][key[3]] = value
+
+    for board_key, metrics in grown.items():
+        for metric, candidates in metrics.items():
+            if board_key in shrunk:
+                _refill(connection, board_key, metric)
+            else:
+                _offer(connection, board_key, metric, candidates)
+
+
+def get_leaderboard(
+    db: Session,
+    board: str,
+    metric: str = "quantity",
+    period: str = "all",
+    resource_type: Optional[str] = None,
+    limit: int = 10,
+) -> List[Dict[str, Any]]:
+    """Read the top contributors or organizations from their bounded board."""
+    if board not in BOARDS:
+        raise ValueError(f"Unknown leaderboard: {board}")
+    if metric not in LEADERBOARD_METRICS:
+        raise ValueError(f"Unknown leaderboard metric: {metric}")
+
+    if board == "contributors":
+        name = User.full_name
+        subject = User.id
+    else:
+        name = Organization.name
+        subject = Organization.id
+
+    rows = db.execute(
+        select(LeaderboardEntry.subject_id, LeaderboardEntry.value, name)
+        .outerjoin(subject.class_, subject == LeaderboardEntry.subject_id)
+        .where(*_entry_filter((board, period, resource_type or ""), metric))
+        .order_by(LeaderboardEntry.value.desc(), LeaderboardEntry.subject_id)
+        .limit(min(limit, TOP_SIZE))
+    ).all()
+
+    return [
+        {"rank": rank, "id": subject_id, "name": subject_name, metric: value}
+        for rank, (subject_id, value, subject_name) in enumerate(rows, start=1)
+    ]
+
+
+def _contribution_deltas(db: Session, after_id: int, up_to: int):
+    """Deltas of the contributions with an id in (after_id, up_to]."""
+    rows = db.execute(
+        select(
+            ResourceContribution.user_id,
+            Event.organization_id,
+            ResourceRequest.resource_type,
+            ResourceContribution.contribution_time,
+            ResourceContribution.quantity,
+        )
+        .join(ResourceRequest, ResourceContribution.request_id == ResourceRequest.id)
+        .join(Event, ResourceRequest.event_id == Event.id)
+        .where(
+            ~ResourceContribution.is_correction,
+            ResourceContribution.id > after_id,
+            ResourceContribution.id <= up_to,
+        )
+        .execution_options(yield_per=1000)
+    )
+    # Ledger corrections fix a request's total; nobody contributed them
+    return (
+        (user_id, organization_id, resource_type, moment.date(), quantity or 0, 1)
+        for user_id, organization_id, resource_type, moment, quantity in rows
+        if moment is not None
+    )
+
+
+def _settled_contribution_id(db: Session) -> int:
+    return settled_id(
+        db,
+        ResourceContribution.id,
+        ResourceContribution.contribution_time,
+        settings.SUMMARY_FOLD_LAG_SECONDS,
+    )
+
+
+def fold_leaderboards(db: Session) -> int:
+    """
+    Fold contributions added since the last run into the totals and boards,
+    following the ledger by id.
+
+    Contributions younger than SUMMARY_FOLD_LAG_SECONDS wait for a later
+    run, in case a slow transaction still commits one with a lower id; each
+    is counted exactly once. Only one fold may run at a time. Returns the
+    number of contributions folded.
+    """
+    after_id, _ = read_cursor(db, CURSOR)
+    up_to = _settled_contribution_id(db)
+    if up_to <= after_id:
+        return 0
+
+    rows = list(_contribution_deltas(db, after_id, up_to))
+    apply_contributions(db, rows)
+    move_cursor(db, CURSOR, last_id=up_to)
+    db.commit()
+    return len(rows)
+
+
+def rebuild_leaderboards(db: Session) -> int:
+    """
+    Recompute every total and board from the contributions table, up to
+    where the next fold picks up.
+    """
+    up_to = _settled_contribution_id(db)
+    deltas = _board_deltas(_contribution_deltas(db, 0, up_to))
+
+    db.execute(delete(LeaderboardEntry))
+    db.execute(delete(LeaderboardTotal))
+    if deltas:
+        db.execute(
+            insert(LeaderboardTotal),
+            [
+                {
+                    "board": board,
+                    "period": period,
+                    "resource_type": resource_type,
+                    "subject_id": subject_id,
+                    "quantity": quantity,
+                    "contributions": count,
+                }
+                for (board, period, resource_type, subject_id), (
+                    quantity,
+                    count,
+                ) in deltas.items()
+            ],
+        )
+
+    connection = db.connection()
+    for board_key in {key[:3] for key in deltas}:
+        for metric in LEADERBOARD_METRICS:
+            _refill(connection, board_key, metric)
+
+    move_cursor(db, CURSOR, last_id=up_to)
+    db.commit()
+    return len(deltas)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from app.core.config import settings
+
+# Notification ids remembered so the relay does not push them a second time
+REMEMBERED_IDS = 10000
+
+# {"event": name, "data": JSON-serializable payload, "id": optional event id}
+PushEvent = Dict[str, Any]
+
+
+class Subscription:
+    """
+    Events waiting for one connected client, read on its event loop.
+
+    A client that falls more than NOTIFICATION_STREAM_QUEUE_SIZE events
+    behind loses the newer ones and is told to resync instead.
+    """
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, size: int):
+        self.user_id = user_id
+        self.events: "asyncio.Queue[PushEvent]" = asyncio.Queue(size)
+        self.overflowed = False
+        self._loop = loop
+
+    def _put(self, event: PushEvent) -> None:
+        try:
+            self.events.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def put(self, event: PushEvent) -> None:
+        """Hand an event over from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The client's event loop is gone; it unsubscribes as it closes
+            pass
+
+
+class NotificationHub:
+    """
+    Process-local pub/sub of notification events to the streams connected
+    to this worker, keyed by user.
+
+    Publishers can run in any thread. Events carrying a notification id are
+    delivered once: the relay re-reading a notification this worker already
+    published skips it.
+    """
+
+    def __init__(self, queue_size: Optional[int] = None):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+            self._published: "OrderedDict[int, None]" = OrderedDict()
+
+    def subscribe(self, user_id: int) -> Subscription:
+        """Open a subscription for a user; call from the stream's event loop."""
+        subscription = Subscription(
+            user_id,
+            asyncio.get_running_loop(),
+            self.queue_size or settings.NOTIFICATION_STREAM_QUEUE_SIZE,
+        )
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def subscribed_users(self, user_ids: Optional[Iterable[int]] = None) -> Set[int]:
+        """Users with an open stream here, optionally only among `user_ids`."""
+        with self._lock:
+            if user_ids is None:
+                return set(self._subscriptions)
+            return {user_id for user_id in user_ids if user_id in self._subscriptions}
+
+    def publish(
+        self, user_id: int, event: PushEvent, notification_id: Optional[int] = None
+    ) -> int:
+        """Send an event to a user's streams; returns how many got it."""
+        with self._lock:
+            if notification_id is not None:
+                if notification_id in self._published:
+                    return 0
+                self._published[notification_id] = None
+                while len(self._published) > REMEMBERED_IDS:
+                    self._published.popitem(last=False)
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+
+        for subscription in subscriptions:
+            subscription.put(event)
+        return len(subscriptions)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "users": len(self._subscriptions),
+                "streams": sum(len(s) for s in self._subscriptions.values()),
+            }
+
+
+notification_hub = NotificationHub()
+
+
+def format_event(event: PushEvent) -> str:
+    """Render an event in the Server-Sent Events wire format."""
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['event']}")
+    lines.append(f"data: {json.dumps(event['data'])}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(
+    subscription: Subscription,
+    first_events: Iterable[PushEvent] = (),
+    hub: NotificationHub = notification_hub,
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events for a subscription: `first_events`, then everything
+    published to it, with keepalive comments while idle. Ends after
+    NOTIFICATION_STREAM_MAX_SECONDS and always unsubscribes.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.NOTIFICATION_STREAM_MAX_SECONDS
+    try:
+        yield "retry: 3000\n\n"
+        for event in first_events:
+            yield format_event(event)
+
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            if subscription.overflowed:
+                subscription.overflowed = False
+                yield format_event({"event": "resync", "data": {}})
+            try:
+                event = await asyncio.wait_for(
+                    subscription.events.get(),
+                    min(settings.NOTIFICATION_STREAM_KEEPALIVE_SECONDS, remaining),
+                )
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        hub.unsubscribe(subscription)
@@ -1,12 +1,32 @@
+import html
+from sqlalchemy import Boolean, DateTime, Integer, String
+from sqlalchemy import delete, exists, func, insert, literal, select, union, update
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any, Optional
-from datetime import datetime
-from app.db.models import User, Notification
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from typing import List, Dict, Any, Iterable, Optional
+from datetime import datetime, timedelta
+from app.core import geo
+from app.db.functions import haversine, upsert
+from app.db.models import (
+    User,
+    UserRole,
+    Notification,
+    NotificationCounter,
+    NotificationCursor,
+    EventBeneficiary,
+    OrganizationMember,
+    ResourceRequest,
+    ResourceContribution,
+)
 from app.core.config import settings
-from app.schemas.notification import NotificationCreate
+from app.services import email_delivery
+from app.services.email_delivery import OutgoingEmail
+from app.services.notification_hub import notification_hub
+from app.schemas.notification import (
+    AudienceType,
+    NotificationAudience,
+    NotificationCreate,
+    NotificationFanout,
+)
 
 
 def create_notification(
@@ -28,11 +48,306 @@ def create_notification(
     )
 
     db.add(notification)
+    db.flush()
+    _add_unread(db, [notification.user_id], 1)
     db.commit()
     db.refresh(notification)
+    publish_notifications(db, [notification])
     return notification
 
 
+def _live_unread(user_id_column):
+    return (
+        select(func.count())
+        .where(Notification.user_id == user_id_column, Notification.read == False)
+        .scalar_subquery()
+    )
+
+
+def _add_unread(db: Session, user_ids, delta: int) -> None:
+    """
+    Add delta to the unread counters of `user_ids` (a list of ids or a
+    SELECT of them) inside the current transaction, after the notifications
+    themselves were written. Users without a counter get one seeded from a
+    live count, which already includes this transaction's changes; if
+    another transaction seeds it first, the delta is added to that instead.
+    """
+    connection = db.connection()
+    now = datetime.now()
+    counter = NotificationCounter
+    result = connection.execute(
+        update(counter)
+        .where(counter.user_id.in_(user_ids))
+        .values(unread=counter.unread + delta, updated_at=now)
+    )
+    if isinstance(user_ids, list) and result.rowcount == len(set(user_ids)):
+        return
+
+    statement = upsert(connection, counter).from_select(
+        ["user_id", "unread", "updated_at"],
+        select(User.id, _live_unread(User.id), literal(now, DateTime)).where(
+            User.id.in_(user_ids),
+            ~exists().where(counter.user_id == User.id),
+        ),
+    )
+    connection.execute(
+        statement.on_conflict_do_update(
+            index_elements=[counter.user_id],
+            set_={"unread": counter.unread + delta, "updated_at": now},
+        )
+    )
+
+
+def push_payload(notification: Notification) -> Dict[str, Any]:
+    """A notification as pushed to streams, in NotificationResponse's shape."""
+    return {
+        "id": notification.id,
+        "recipient_id": notification.user_id,
+        "title": notification.title,
+        "message": notification.message,
+        "type": notification.notification_type,
+        "reference_id": notification.related_id,
+        "is_read": bool(notification.read),
+        "created_at": (
+            notification.created_at.isoformat() if notification.created_at else None
+        ),
+    }
+
+
+def notification_event(
+    notification: Notification, unread_count: Optional[int] = None
+) -> Dict[str, Any]:
+    data = {"notification": push_payload(notification)}
+    if unread_count is not None:
+        data["unread_count"] = unread_count
+    return {"event": "notification", "id": notification.id, "data": data}
+
+
+def unread_count_event(unread_count: int) -> Dict[str, Any]:
+    return {"event": "unread_count", "data": {"unread_count": unread_count}}
+
+
+def publish_notifications(db: Session, notifications: List[Notification]) -> int:
+    """
+    Push committed notifications, with their user's unread count, to the
+    streams open on this worker. Returns the number of streams reached.
+    """
+    user_ids = notification_hub.subscribed_users(n.user_id for n in notifications)
+    if not user_ids:
+        return 0
+
+    counts = get_unread_counts(db, user_ids)
+    reached = 0
+    for notification in notifications:
+        if notification.user_id not in user_ids:
+            continue
+        reached += notification_hub.publish(
+            notification.user_id,
+            notification_event(notification, counts[notification.user_id]),
+            notification_id=notification.id,
+        )
+    return reached
+
+
+def publish_unread_count(db: Session, user_id: int) -> None:
+    """Tell a user's streams on this worker their new unread count."""
+    if notification_hub.subscribed_users([user_id]):
+        notification_hub.publish(
+            user_id, unread_count_event(get_unread_notification_count(db, user_id))
+        )
+
+
+def relay_notifications(db: Session, worker_id: str) -> int:
+    """
+    Push notifications created since this worker's cursor, by any worker or
+    bulk insert, to the streams open here, then move the cursor. A new
+    cursor starts at the newest notification. Returns the number pushed.
+
+    Ids are handed out before commit, so a lower id can become visible after
+    a higher one. The cursor only moves past notifications older than
+    NOTIFICATION_RELAY_LAG_SECONDS, which must cover the longest write
+    transaction and the clock skew between workers; younger ones are read
+    again next time and the hub drops the ones it already pushed.
+    """
+    newest = db.scalar(select(func.max(Notification.id))) or 0
+    cursor = db.get(NotificationCursor, worker_id)
+    if cursor is None:
+        db.add(NotificationCursor(worker_id=worker_id, last_notification_id=newest))
+        db.commit()
+        return 0
+    if newest <= cursor.last_notification_id:
+        return 0
+
+    pushed = 0
+    user_ids = notification_hub.subscribed_users()
+    if user_ids:
+        notifications = (
+            db.query(Notification)
+            .filter(
+                Notification.id > cursor.last_notification_id,
+                Notification.id <= newest,
+                Notification.user_id.in_(user_ids),
+            )
+            .order_by(Notification.id)
+            .all()
+        )
+        pushed = publish_notifications(db, notifications)
+
+    settled_before = datetime.now() - timedelta(
+        seconds=settings.NOTIFICATION_RELAY_LAG_SECONDS
+    )
+    settled = db.scalar(
+        select(func.max(Notification.id)).where(
+            Notification.id > cursor.last_notification_id,
+            Notification.id <= newest,
+            Notification.created_at <= settled_before,
+        )
+    )
+    if settled is not None:
+        cursor.last_notification_id = settled
+    db.commit()
+    return pushed
+
+
+def delete_stale_cursors(db: Session, cutoff: datetime) -> int:
+    """Delete relay cursors of workers that have not moved since the cutoff."""
+    result = db.execute(
+        delete(NotificationCursor).where(NotificationCursor.updated_at < cutoff)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def _nearby_users(audience: NotificationAudience):
+    """SELECT of the users within the audience's radius, filtered in the database."""
+    min_lat, max_lat, min_lon, max_lon = geo.bounding_box(
+        audience.latitude, audience.longitude, audience.radius_km
+    )
+    return select(User.id).where(
+        # The box lets an index narrow the rows before exact distances
+        User.latitude.between(min_lat, max_lat),
+        User.longitude.between(min_lon, max_lon),
+        haversine(User.latitude, User.longitude, audience.latitude, audience.longitude)
+        <= audience.radius_km,
+    )
+
+
+def _audience_query(db: Session, audience: NotificationAudience):
+    """SELECT of the user ids in one audience."""
+    if audience.type == AudienceType.EVENT_BENEFICIARIES:
+        return select(EventBeneficiary.user_id).where(
+            EventBeneficiary.event_id == audience.event_id
+        )
+    if audience.type == AudienceType.EVENT_CONTRIBUTORS:
+        request = ResourceRequest
+        return (
+            select(ResourceContribution.user_id)
+            .join(request, request.id == ResourceContribution.request_id)
+            .where(
+                ResourceRequest.event_id == audience.event_id,
+                ResourceContribution.user_id.isnot(None),
+            )
+        )
+    if audience.type == AudienceType.ORGANIZATION_MEMBERS:
+        return select(OrganizationMember.user_id).where(
+            OrganizationMember.organization_id == audience.organization_id
+        )
+    if audience.type == AudienceType.ROLE:
+        return select(UserRole.user_id).where(UserRole.role == audience.role.value)
+    return _nearby_users(audience)
+
+
+def fan_out_notification(db: Session, fanout: NotificationFanout) -> Dict[str, int]:
+    """
+    Notify every user in the union of the audiences once, with a single
+    INSERT ... SELECT and one commit.
+
+    With `email` set, each notification is also queued for the email
+    delivery job instead of being sent while the request waits.
+    """
+    recipients = union(
+        *(_audience_query(db, audience) for audience in fanout.audiences)
+    ).subquery()
+    now = datetime.now()
+    queued_at = now if fanout.email else None
+
+    result = db.execute(
+        insert(Notification).from_select(
+            [
+                "user_id",
+                "title",
+                "message",
+                "notification_type",
+                "related_id",
+                "read",
+                "created_at",
+                "email_queued_at",
+                "email_attempts",
+            ],
+            select(
+                recipients.c[0],
+                literal(fanout.title, String),
+                literal(fanout.message, String),
+                literal(fanout.type.value, String),
+                literal(fanout.reference_id, Integer),
+                literal(False, Boolean),
+                literal(now, DateTime),
+                literal(queued_at, DateTime),
+                literal(0, Integer),
+            ),
+        )
+    )
+    _add_unread(db, select(recipients.c[0]), 1)
+    db.commit()
+
+    created = result.rowcount
+    return {"created": created, "emails_queued": created if fanout.email else 0}
+
+
+def deliver_queued_emails(db: Session, limit: Optional[int] = None) -> int:
+    """
+    Email the oldest queued notifications, up to NOTIFICATION_EMAIL_BATCH_SIZE.
+    Failed sends stay queued until NOTIFICATION_EMAIL_MAX_ATTEMPTS.
+    Returns the number sent.
+    """
+    if not email_delivery.is_configured():
+        return 0
+
+    rows = db.execute(
+        select(Notification.id, Notification.title, Notification.message, User.email)
+        .join(User, Notification.user_id == User.id)
+        .where(
+            Notification.emailed_at.is_(None),
+            Notification.email_queued_at.isnot(None),
+            Notification.email_attempts < settings.NOTIFICATION_EMAIL_MAX_ATTEMPTS,
+        )
+        .order_by(Notification.email_queued_at, Notification.id)
+        .limit(limit or settings.NOTIFICATION_EMAIL_BATCH_SIZE)
+    ).all()
+
+    # Sent in parallel over the pool's open connections
+    results = email_delivery.email_pool.send_many(
+        OutgoingEmail(email, title, f"<p>{html.escape(message)}</p>", message)
+        for _, title, message, email in rows
+    )
+    sent = [row.id for row, ok in zip(rows, results) if ok]
+
+    if rows:
+        db.execute(
+            update(Notification)
+            .where(Notification.id.in_([row.id for row in rows]))
+            .values(email_attempts=Notification.email_attempts + 1)
+        )
+    if sent:
+        db.execute(
+            update(Notification)
+            .where(Notification.id.in_(sent))
+            .values(emailed_at=datetime.now())
+        )
+    db.commit()
+    return len(sent)
+
+
 def get_notification(db: Session, notification_id: int) -> Optional[Notification]:
     """
     Get a specific notification by ID.
@@ -56,15 +371,81 @@ def get_user_notifications(
     )
 
 
-def get_unread_notification_count(db: Session, user_id: int) -> int:
+def get_notifications_after(
+    db: Session, user_id: int, notification_id: int, limit: int = 100
+) -> List[Notification]:
     """
-    Get count of unread notifications for a user.
+    A user's notifications newer than `notification_id`, oldest first, for
+    a stream reconnecting with Last-Event-ID.
     """
     return (
         db.query(Notification)
-        .filter(Notification.user_id == user_id, Notification.read == False)
-        .count()
+        .filter(Notification.user_id == user_id, Notification.id > notification_id)
+        .order_by(Notification.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_unread_counts(db: Session, user_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Unread notifications per user, read from their counters. Users without
+    a counter yet get one seeded from a live count, left for the caller to
+    commit.
+    """
+    user_ids = list(user_ids)
+    counter = NotificationCounter
+    query = select(counter.user_id, counter.unread).where(
+        counter.user_id.in_(user_ids)
+    )
+    counts = dict(db.execute(query).all())
+
+    missing = [user_id for user_id in user_ids if user_id not in counts]
+    if missing:
+        _add_unread(db, missing, 0)
+        counts.update(db.execute(query).all())
+
+    return {user_id: counts.get(user_id, 0) for user_id in user_ids}
+
+
+def get_unread_notification_count(db: Session, user_id: int) -> int:
+    """
+    Get count of unread notifications for a user.
+    """
+    return get_unread_counts(db, [user_id])[user_id]
+
+
+def reconcile_unread_counts(db: Session) -> Dict[int, int]:
+    """
+    Recount stored unread counters from the notifications table.
+
+    Returns the drift (live count minus stored value) of every counter that
+    was wrong. Users without a counter are left to be seeded when read.
+    """
+    counter = NotificationCounter
+    live = dict(
+        db.execute(
+            select(Notification.user_id, func.count())
+            .where(Notification.read == False)
+            .group_by(Notification.user_id)
+        ).all()
     )
+    stored = dict(db.execute(select(counter.user_id, counter.unread)).all())
+
+    drift = {
+        user_id: live.get(user_id, 0) - unread
+        for user_id, unread in stored.items()
+        if live.get(user_id, 0) != unread
+    }
+    if drift:
+        # Recounted in the UPDATE itself, so writes since the reads above count
+        db.execute(
+            update(counter)
+            .where(counter.user_id.in_(list(drift)))
+            .values(unread=_live_unread(counter.user_id), updated_at=datetime.now())
+        )
+    db.commit()
+    return drift
 
 
 def mark_notification_as_read(
@@ -73,19 +454,25 @@ def mark_notification_as_read(
     """
     Mark a notification as read.
     """
-    query = db.query(Notification).filter(Notification.id == notification_id)
-
+    conditions = [Notification.id == notification_id]
     if user_id is not None:
-        query = query.filter(Notification.user_id == user_id)
+        conditions.append(Notification.user_id == user_id)
 
-    notification = query.first()
-
-    if not notification:
+    owner = db.scalar(select(Notification.user_id).where(*conditions))
+    if owner is None:
         return False
 
-    notification.read = True
-    notification.read_at = datetime.now()
+    # Only the request that flips it decrements, however many race
+    result = db.execute(
+        update(Notification)
+        .where(*conditions, Notification.read == False)
+        .values(read=True, read_at=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        _add_unread(db, [owner], -result.rowcount)
     db.commit()
+    publish_unread_count(db, owner)
     return True
 
 
@@ -99,8 +486,11 @@ def mark_all_notifications_as_read(db: Session, user_id: int) -> int:
         .filter(Notification.user_id == user_id, Notification.read == False)
         .update({"read": True, "read_at": datetime.now()})
     )
+    if result:
+        _add_unread(db, [user_id], -result)
 
     db.commit()
+    publish_unread_count(db, user_id)
     return result
 
 
@@ -108,70 +498,60 @@ def delete_notification(db: Session, notification_id: int, user_id: int) -> bool
     """
     Delete a notification.
     """
-    notification = (
-        db.query(Notification)
-        .filter(Notification.id == notification_id, Notification.user_id == user_id)
-        .first()
-    )
-
-    if not notification:
+    # Only the request that deletes it decrements, however many race
+    deleted = db.execute(
+        delete(Notification)
+        .where(Notification.id == notification_id, Notification.user_id == user_id)
+        .returning(Notification.read)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if not deleted:
         return False
 
-    db.delete(notification)
+    unread = sum(1 for (read,) in deleted if not read)
+    if unread:
+        _add_unread(db, [user_id], -unread)
     db.commit()
+    publish_unread_count(db, user_id)
     return True
 
 
+def delete_read_notifications_before(db: Session, cutoff: datetime) -> int:
+    """
+    Delete notifications that were read before a cutoff.
+    Returns the number of deleted notifications.
+    """
+    result = (
+        db.query(Notification)
+        .filter(Notification.read == True, Notification.read_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+
+    db.commit()
+    return result
+
+
 def send_email(
     recipient_email: str,
     subject: str,
     html_content: str,
     text_content: Optional[str] = None,
+    wait: bool = False,
 ) -> bool:
     """
-    Send an email to a user.
+    Queue an email to a user on the delivery pool. Returns whether it was
+    queued, or with `wait`, whether it was sent.
     """
     # Skip if email settings are not configured
-    if not settings.EMAIL_HOST or not settings.EMAIL_PORT or not settings.EMAIL_USER:
+    if not email_delivery.is_configured():
         print("Email settings not configured, skipping email send")
         return False
 
-    try:
-        # Create message
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = settings.EMAIL_FROM
-        msg["To"] = recipient_email
-
-        # Add text content if provided, otherwise use a simple extraction from HTML
-        if text_content is None:
-            # Very simplistic HTML to text conversion
-            text_content = (
-                html_content.replace("<br>", "\n")
-                .replace("<p>", "")
-                .replace("</p>", "\n\n")
-            )
-
-        # Attach parts
-        part1 = MIMEText(text_content, "plain")
-        part2 = MIMEText(html_content, "html")
-        msg.attach(part1)
-        msg.attach(part2)
-
-        # Send email
-        with smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT) as server:
-            if settings.EMAIL_USE_TLS:
-                server.starttls()
-
-            if settings.EMAIL_USER and settings.EMAIL_PASSWORD:
-                server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
-
-            server.sendmail(settings.EMAIL_FROM, recipient_email, msg.as_string())
-
-        return True
-    except Exception as e:
-        print(f"Failed to send email: {str(e)}")
-        return False
+    email = OutgoingEmail(recipient_email, subject, html_content, text_content)
+    if wait:
+        return email_delivery.email_pool.send_many([email])[0]
+    email_delivery.email_pool.submit(email)
+    return True
 
 
 def send_email_notification(
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 from app.db.models import Organization, OrganizationMember, User, UserRole
 from app.schemas import (
     OrganizationCreate,
@@ -229,6 +229,22 @@ def is_user_organization_admin(db: Session, user_id: int, org_id: int) -> bool:
     )
 
 
+def get_admin_organization_ids(
+    db: Session, user_id: int, org_ids: Iterable[int]
+) -> Set[int]:
+    """Those of the organizations the user is an admin of, in one query."""
+    memberships = (
+        db.query(OrganizationMember.organization_id)
+        .filter(
+            OrganizationMember.organization_id.in_(set(org_ids)),
+            OrganizationMember.user_id == user_id,
+            OrganizationMember.role == UserRoleEnum.ADMIN.value,
+        )
+        .all()
+    )
+    return {org_id for (org_id,) in memberships}
+
+
 # New helper function
 def get_organization_admin(db: Session, org_id: int) -> Optional[User]:
     """Get the admin of an organization."""
@@ -0,0 +1,183 @@
+import copy
+import functools
+import inspect
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import event as sa_event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+# Entries kept across every cached function before the oldest are dropped
+MAX_ENTRIES = 512
+
+
+def _normalize(value: Any) -> Hashable:
+    """Turn an argument into a hashable, order-independent cache key part."""
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return tuple(sorted((key, _normalize(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_normalize(item) for item in value))
+    return value
+
+
+class QueryCache:
+    """
+    Process-local cache of query results keyed by function and arguments.
+
+    Each entry remembers the versions of the tables it was computed from.
+    Committed writes bump those versions, so an entry is dropped as soon as
+    this process changes its data; the TTL bounds how long writes made by
+    other workers can go unseen.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop every entry and table version."""
+        with self._lock:
+            self._entries: "OrderedDict[Tuple, Tuple[float, Tuple, Any]]" = (
+                OrderedDict()
+            )
+            self._versions: Dict[str, int] = {}
+            self.hits = 0
+            self.misses = 0
+
+    def versions(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(table, 0) for table in tables)
+
+    def bump(self, tables: Iterable[str]) -> None:
+        """Invalidate every entry computed from any of these tables."""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, key: Tuple, tables: Tuple[str, ...]):
+        """Return (True, value) for a fresh entry, or (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, versions, value = entry
+                fresh = expires_at > time.monotonic()
+                if fresh and versions == self.versions(tables):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(
+        self, key: Tuple, tables: Tuple[str, ...], versions: Tuple, value, ttl: float
+    ) -> None:
+        with self._lock:
+            # A write committed while computing makes the result stale already
+            if versions != self.versions(tables):
+                return
+            self._entries[key] = (time.monotonic() + ttl, versions, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+query_cache = QueryCache()
+
+
+def cached_query(
+    *tables: str, ttl: Optional[float] = None
+) -> Callable[[Callable], Callable]:
+    """
+    Cache a `func(db, ...)` query function's result in `query_cache`.
+
+    The key is the function name plus its arguments with defaults applied,
+    so `f(db)` and `f(db, interval="day")` share an entry. Results are
+    invalidated when any of the named tables is written, or after `ttl`
+    seconds (ANALYTICS_CACHE_TTL_SECONDS by default). Callers get a copy,
+    so mutating a result cannot corrupt the cache.
+    """
+    tables = tuple(sorted(tables))
+
+    def decorate(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(db: Session, *args, **kwargs):
+            if not settings.ANALYTICS_CACHE_ENABLED:
+                return func(db, *args, **kwargs)
+
+            bound = signature.bind(db, *args, **kwargs)
+            bound.apply_defaults()
+            key = (name,) + tuple(
+                (parameter, _normalize(value))
+                for parameter, value in list(bound.arguments.items())[1:]
+            )
+
+            found, value = query_cache.get(key, tables)
+            if not found:
+                versions = query_cache.versions(tables)
+                value = func(db, *args, **kwargs)
+                lifetime = settings.ANALYTICS_CACHE_TTL_SECONDS if ttl is None else ttl
+                query_cache.put(key, tables, versions, value, lifetime)
+            return copy.deepcopy(value)
+
+        wrapper.tables = tables
+        return wrapper
+
+    return decorate
+
+
+def _written_tables(session: Session) -> set:
+    return session.info.setdefault("query_cache_tables", set())
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _collect_flushed_tables(session, flush_context):
+    """Remember which tables a transaction wrote until it commits."""
+    written = _written_tables(session)
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        written.update(table.name for table in sa_inspect(obj).mapper.tables)
+
+
+@sa_event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_tables(orm_execute_state):
+    """Bulk insert/update/delete statements skip the flush; record them too."""
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        table = orm_execute_state.statement.table
+        _written_tables(orm_execute_state.session).add(table.name)
+
+
+@sa_event.listens_for(Session, "after_commit")
+def _invalidate_written_tables(session):
+    written = session.info.pop("query_cache_tables", None)
+    if written:
+        query_cache.bump(written)
+
+
+@sa_event.listens_for(Session, "after_rollback")
+def _discard_written_tables(session):
+    session.info.pop("query_cache_tables", None)
+
@@ -1,11 +1,24 @@
+from collections import Counter
+from sqlalchemy import bindparam, func, insert, select, update
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.db.models import ResourceRequest, ResourceContribution, User, Event
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.core.config import settings
+from app.db.models import (
+    ResourceRequest,
+    ResourceRequestSnapshot,
+    ResourceContribution,
+    User,
+    Event,
+)
+from app.db.models.resource import CORRECTION
 from app.schemas import (
     ResourceRequestCreate,
     ResourceRequestUpdate,
+    ResourceRequestBulkItem,
+    ResourceRequestBulkUpdateItem,
     ResourceContributionCreate,
 )
+from app.services.rollup_service import settled_id
 from datetime import datetime
 
 
@@ -43,25 +56,169 @@ def create_resource_request(
     return db_request
 
 
+def _correct_received(
+    db: Session,
+    db_request: ResourceRequest,
+    quantity_received: int,
+    corrected_by: Optional[int],
+) -> None:
+    """Append a correction entry bringing the request's balance to a total."""
+    difference = quantity_received - db_request.received_balance
+    if difference:
+        db.add(
+            ResourceContribution(
+                request_id=db_request.id,
+                quantity=difference,
+                kind=CORRECTION,
+                note=f"Received total corrected to {quantity_received}",
+                recorded_by=corrected_by,
+            )
+        )
+
+
 def update_resource_request(
-    db: Session, request_id: int, request_data: ResourceRequestUpdate
+    db: Session,
+    request_id: int,
+    request_data: ResourceRequestUpdate,
+    corrected_by: Optional[int] = None,
 ) -> Optional[ResourceRequest]:
-    """Update a resource request."""
+    """
+    Update a resource request. A new quantity_received is recorded as a
+    correction entry in the contribution ledger for the difference.
+    """
     db_request = get_resource_request(db, request_id)
     if not db_request:
         return None
 
     # Update fields if provided
     update_data = request_data.model_dump(exclude_unset=True)
+    quantity_received = update_data.pop("quantity_received", None)
 
     for field, value in update_data.items():
         setattr(db_request, field, value)
 
+    if quantity_received is not None:
+        _correct_received(db, db_request, quantity_received, corrected_by)
+
     db.commit()
     db.refresh(db_request)
     return db_request
 
 
+def get_request_organization_ids(
+    db: Session, request_ids: Iterable[int]
+) -> Dict[int, int]:
+    """Map each of the requests that exist to its event's organization."""
+    return dict(
+        db.query(ResourceRequest.id, Event.organization_id)
+        .join(Event, ResourceRequest.event_id == Event.id)
+        .filter(ResourceRequest.id.in_(set(request_ids)))
+        .all()
+    )
+
+
+def _request_result(db_request: ResourceRequest, received: int) -> Dict[str, Any]:
+    return {
+        "id": db_request.id,
+        "event_id": db_request.event_id,
+        "resource_type": db_request.resource_type,
+        "quantity_needed": db_request.quantity_needed,
+        "quantity_received": received,
+    }
+
+
+def create_resource_requests(
+    db: Session, requests: List[ResourceRequestBulkItem]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Create a batch of resource requests in one transaction, batched into
+    multi-row INSERTs.
+
+    Returns (results, errors): the created requests in batch order, or the
+    {"index", "error"} of every invalid item, in which case nothing is
+    written.
+    """
+    found = set(
+        db.scalars(
+            select(Event.id).where(Event.id.in_({r.event_id for r in requests}))
+        )
+    )
+    errors = [
+        {"index": index, "error": "Event not found"}
+        for index, request in enumerate(requests)
+        if request.event_id not in found
+    ]
+    if errors:
+        return [], errors
+
+    db_requests = [
+        ResourceRequest(
+            event_id=request.event_id,
+            resource_type=request.resource_type,
+            quantity_needed=request.quantity_needed,
+            quantity_received=0,
+        )
+        for request in requests
+    ]
+    db.add_all(db_requests)
+    db.flush()
+
+    results = [_request_result(db_request, 0) for db_request in db_requests]
+    db.commit()
+    return results, []
+
+
+def update_resource_requests(
+    db: Session,
+    requests: List[ResourceRequestBulkUpdateItem],
+    corrected_by: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Update a batch of resource requests in one transaction. New received
+    totals become ledger corrections, as in `update_resource_request`.
+    Returns (results, errors) as for `create_resource_requests`.
+    """
+    db_requests = {
+        db_request.id: db_request
+        for db_request in db.scalars(
+            select(ResourceRequest).where(
+                ResourceRequest.id.in_({r.id for r in requests})
+            )
+        )
+    }
+
+    errors = []
+    seen = set()
+    for index, request in enumerate(requests):
+        if request.id not in db_requests:
+            errors.append({"index": index, "error": "Resource request not found"})
+        elif request.id in seen:
+            errors.append(
+                {"index": index, "error": "Resource request is updated twice"}
+            )
+        seen.add(request.id)
+    if errors:
+        return [], errors
+
+    results = []
+    for request in requests:
+        db_request = db_requests[request.id]
+        update_data = request.model_dump(exclude_unset=True, exclude={"id"})
+        quantity_received = update_data.pop("quantity_received", None)
+        for field, value in update_data.items():
+            setattr(db_request, field, value)
+        if quantity_received is not None:
+            _correct_received(db, db_request, quantity_received, corrected_by)
+        else:
+            quantity_received = db_request.received_balance
+        results.append((db_request, quantity_received))
+    db.flush()
+
+    results = [_request_result(*result) for result in results]
+    db.commit()
+    return results, []
+
+
 def delete_resource_request(db: Session, request_id: int) -> bool:
     """Delete a resource request."""
     db_request = get_resource_request(db, request_id)
@@ -77,14 +234,15 @@ def create_resource_contribution(
     db: Session, user_id: int, contribution_data: ResourceContributionCreate
 ) -> Optional[ResourceContribution]:
     """Create a new resource contribution."""
-    # Check if request exists
-    request = get_resource_request(db, contribution_data.request_id)
-    if not request:
-        return None
-
-    # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # The contribution is appended to the ledger and the request row is not
+    # written, so concurrent donors to one request do not wait on each other
+    exists = db.execute(
+        select(ResourceRequest.id).where(
+            ResourceRequest.id == contribution_data.request_id,
+            select(User.id).where(User.id == user_id).exists(),
+        )
+    ).first()
+    if exists is None:
         return None
 
     # Create contribution
@@ -92,18 +250,204 @@ def create_resource_contribution(
         request_id=contribution_data.request_id,
         user_id=user_id,
         quantity=contribution_data.quantity,
-        contribution_time=datetime.utcnow(),
     )
 
     db.add(db_contribution)
+    db.commit()
 
-    # Update quantity received in the request
-    request.quantity_received += contribution_data.quantity
+    return db_contribution
 
+
+def create_resource_contributions(
+    db: Session, user_id: int, contributions: List[ResourceContributionCreate]
+) -> Optional[Dict[str, Any]]:
+    """
+    Record a batch of contributions in one transaction.
+
+    The ledger entries are inserted in one flush, batched into multi-row
+    INSERTs. Returns None, recording nothing, if the user or any of the
+    requests does not exist.
+    """
+    totals = Counter()
+    for contribution in contributions:
+        totals[contribution.request_id] += contribution.quantity
+
+    if db.query(User.id).filter(User.id == user_id).first() is None:
+        return None
+    found = db.scalars(
+        select(ResourceRequest.id).where(ResourceRequest.id.in_(totals))
+    ).all()
+    if len(found) != len(totals):
+        return None
+
+    db.add_all(
+        ResourceContribution(
+            request_id=contribution.request_id,
+            user_id=user_id,
+            quantity=contribution.quantity,
+        )
+        for contribution in contributions
+    )
+    db.flush()
+
+    received = db.execute(
+        select(ResourceRequest.id, ResourceRequest.received_balance)
+        .where(ResourceRequest.id.in_(totals))
+        .order_by(ResourceRequest.id)
+    ).all()
     db.commit()
-    db.refresh(db_contribution)
 
-    return db_contribution
+    return {
+        "created": len(contributions),
+        "requests": [
+            {"request_id": request_id, "quantity_received": quantity_received}
+            for request_id, quantity_received in received
+        ],
+    }
+
+
+def _save_snapshots(db: Session, snapshots: Dict[int, tuple], existing) -> None:
+    """Write (ledger_id, balance) snapshots and mirror them to quantity_received."""
+    if not snapshots:
+        return
+    now = datetime.now()
+    table = ResourceRequestSnapshot.__table__
+    updates = [
+        {"snapshot_request_id": request_id, "ledger": ledger_id, "total": balance}
+        for request_id, (ledger_id, balance) in snapshots.items()
+        if request_id in existing
+    ]
+    inserts = [
+        {
+            "request_id": request_id,
+            "ledger_id": ledger_id,
+            "balance": balance,
+            "taken_at": now,
+        }
+        for request_id, (ledger_id, balance) in snapshots.items()
+        if request_id not in existing
+    ]
+    if updates:
+        db.execute(
+            update(table)
+            .where(table.c.request_id == bindparam("snapshot_request_id"))
+            .values(
+                ledger_id=bindparam("ledger"),
+                balance=bindparam("total"),
+                taken_at=now,
+            ),
+            updates,
+        )
+    if inserts:
+        db.execute(insert(table), inserts)
+
+    requests = ResourceRequest.__table__
+    db.execute(
+        update(requests)
+        .where(requests.c.id == bindparam("snapshot_request_id"))
+        .values(quantity_received=bindparam("total")),
+        [
+            {"snapshot_request_id": request_id, "total": balance}
+            for request_id, (_, balance) in snapshots.items()
+        ],
+    )
+
+
+def take_ledger_snapshots(db: Session) -> int:
+    """
+    Move each request's snapshot forward over its ledger tail and copy the
+    balance to quantity_received.
+
+    Entries stamped less than LEDGER_SNAPSHOT_LAG_SECONDS ago stay in the
+    tail: a slow transaction may still commit an entry with a lower id, and
+    the snapshot must never skip over one. Entries are stamped and the
+    cutoff is taken by the database clock, so the hosts' clocks do not
+    matter; the lag must exceed the longest transaction writing the
+    ledger. Only one snapshot run may happen at a time. Returns the number
+    of requests moved forward.
+    """
+    up_to = settled_id(
+        db,
+        ResourceContribution.id,
+        ResourceContribution.contribution_time,
+        settings.LEDGER_SNAPSHOT_LAG_SECONDS,
+    )
+    if not up_to:
+        return 0
+
+    current = {
+        request_id: (ledger_id, balance)
+        for request_id, ledger_id, balance in db.execute(
+            select(
+                ResourceRequestSnapshot.request_id,
+                ResourceRequestSnapshot.ledger_id,
+                ResourceRequestSnapshot.balance,
+            )
+        )
+    }
+    # Ledger tail of every request, up to the last entry old enough to keep
+    snapshot = ResourceRequestSnapshot
+    tail = db.execute(
+        select(
+            ResourceContribution.request_id,
+            func.sum(ResourceContribution.quantity),
+            func.max(ResourceContribution.id),
+        )
+        .outerjoin(snapshot, snapshot.request_id == ResourceContribution.request_id)
+        .where(
+            ResourceContribution.request_id.isnot(None),
+            ResourceContribution.id > func.coalesce(snapshot.ledger_id, 0),
+            ResourceContribution.id <= up_to,
+        )
+        .group_by(ResourceContribution.request_id)
+    )
+    snapshots = {
+        request_id: (last_id, current.get(request_id, (0, 0))[1] + (quantity or 0))
+        for request_id, quantity, last_id in tail
+    }
+    _save_snapshots(db, snapshots, current)
+    db.commit()
+    return len(snapshots)
+
+
+def replay_ledger(db: Session) -> Dict[int, Dict[str, int]]:
+    """
+    Rebuild every request's snapshot from the full ledger with one grouped
+    query, and return the requests whose stored balance was off as
+    {request_id: {"stored": ..., "replayed": ...}}.
+    """
+    stored = {
+        request_id: balance
+        for request_id, balance in db.execute(
+            select(ResourceRequest.id, ResourceRequest.received_balance)
+        )
+    }
+    existing = set(db.scalars(select(ResourceRequestSnapshot.request_id)))
+
+    replayed = {
+        request_id: (last_id, int(quantity or 0))
+        for request_id, quantity, last_id in db.execute(
+            select(
+                ResourceContribution.request_id,
+                func.sum(ResourceContribution.quantity),
+                func.max(ResourceContribution.id),
+            )
+            .where(ResourceContribution.request_id.in_(stored))
+            .group_by(ResourceContribution.request_id)
+        )
+    }
+    # Requests without entries have received nothing
+    for request_id in stored:
+        replayed.setdefault(request_id, (0, 0))
+
+    _save_snapshots(db, replayed, existing)
+    db.commit()
+
+    return {
+        request_id: {"stored": stored[request_id], "replayed": balance}
+        for request_id, (_, balance) in sorted(replayed.items())
+        if stored[request_id] != balance
+    }
 
 
 def get_contributions_by_user(db: Session, user_id: int) -> List[ResourceContribution]:
@@ -0,0 +1,247 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, event as sa_event
+from sqlalchemy import func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.db.functions import seconds_ago, upsert
+from app.db.models import (
+    User,
+    Event,
+    ResourceContribution,
+    EventBeneficiary,
+    DailyRollup,
+    FoldCursor,
+)
+
+# Metric name -> (model, timestamp column the row is bucketed by)
+METRICS = {
+    "registrations": (User, User.created_at),
+    "events": (Event, Event.created_at),
+    "contributions": (ResourceContribution, ResourceContribution.contribution_time),
+    "beneficiaries": (EventBeneficiary, EventBeneficiary.benefit_time),
+}
+_METRIC_BY_MODEL = {model: name for name, (model, _) in METRICS.items()}
+# Rows of a metric's table that are not events of that metric
+EXCLUDED = {"contributions": ResourceContribution.is_correction}
+
+INTERVALS = ("day", "week", "month")
+
+
+def bucket_start(day: date, interval: str) -> date:
+    """First day of the day/week (Monday)/month bucket containing a day."""
+    if interval == "week":
+        return day - timedelta(days=day.weekday())
+    if interval == "month":
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, interval: str) -> date:
+    if interval == "week":
+        return start + timedelta(days=7)
+    if interval == "month":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def add(db: Session, metric: str, day: date, delta: int) -> None:
+    """
+    Add delta to one daily bucket inside the current transaction. The first
+    writers of a new day race to create its bucket; the upsert lets every
+    one of them land instead of failing on the primary key.
+    """
+    connection = db.connection()
+    connection.execute(
+        upsert(connection, DailyRollup)
+        .values(metric=metric, day=day, count=delta)
+        .on_conflict_do_update(
+            index_elements=[DailyRollup.metric, DailyRollup.day],
+            set_={"count": DailyRollup.count + delta},
+        )
+    )
+
+
+def get_series(
+    db: Session,
+    metric: str,
+    start_date: datetime,
+    end_date: datetime,
+    interval: str = "day",
+) -> List[Dict[str, Any]]:
+    """
+    Counts of a metric per day, week or month between two dates.
+
+    Weeks and months are summed from the daily buckets. Every bucket in the
+    range is returned, including empty ones.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if interval not in INTERVALS:
+        raise ValueError(f"Unknown interval: {interval}")
+
+    first_day = start_date.date() if isinstance(start_date, datetime) else start_date
+    last_day = end_date.date() if isinstance(end_date, datetime) else end_date
+
+    totals = Counter()
+    for day, count in db.execute(
+        select(DailyRollup.day, DailyRollup.count).where(
+            DailyRollup.metric == metric,
+            DailyRollup.day.between(first_day, last_day),
+        )
+    ):
+        totals[bucket_start(day, interval)] += count
+
+    series = []
+    bucket = bucket_start(first_day, interval)
+    while bucket <= last_day:
+        series.append({"date": bucket.strftime("%Y-%m-%d"), "count": totals[bucket]})
+        bucket = _next_bucket(bucket, interval)
+    return series
+
+
+def backfill_rollups(
+    db: Session, metrics: Optional[Iterable[str]] = None
+) -> Dict[str, int]:
+    """
+    Rebuild the daily buckets of metrics from their tables.
+
+    Rows without a timestamp are skipped. Returns the number of rows counted
+    per metric.
+    """
+    metrics = list(metrics) if metrics is not None else list(METRICS)
+    counted = {}
+
+    for metric in metrics:
+        _, column = METRICS[metric]
+        day = func.date(column)
+        query = select(day, func.count()).where(column.isnot(None))
+        if metric in EXCLUDED:
+            query = query.where(~EXCLUDED[metric])
+        rows = db.execute(query.group_by(day)).all()
+
+        db.execute(delete(DailyRollup).where(DailyRollup.metric == metric))
+        if rows:
+            db.execute(
+                insert(DailyRollup),
+                [
+                    {
+                        "metric": metric,
+                        "day": _as_date(value),
+                        "count": count,
+                    }
+                    for value, count in rows
+                ],
+            )
+        counted[metric] = sum(count for _, count in rows)
+
+    db.commit()
+    return counted
+
+
+def _as_date(value) -> date:
+    # SQLite returns date() as text
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def database_today(db: Session) -> date:
+    """
+    Today on the database clock, the day `func.now()` defaults stamp and
+    `backfill_rollups` buckets them by, whatever the host's time zone.
+    """
+    return _as_date(db.execute(select(func.date(func.now()))).scalar())
+
+
+def row_day(obj, column) -> Optional[date]:
+    """Day a flushed row belongs to, without loading expired attributes."""
+    value = inspect(obj).dict.get(column.key)
+    if value is None:
+        return None
+    return value.date() if isinstance(value, datetime) else value
+
+
+def settled_time(db: Session, lag_seconds: int) -> datetime:
+    """
+    The database clock `lag_seconds` ago.
+
+    Rows are stamped before their transaction commits, so one can still
+    appear with a time before this; that is assumed not to happen once
+    the lag has passed. Keep the lag above the longest write transaction.
+    """
+    return db.execute(select(seconds_ago(lag_seconds))).scalar()
+
+
+def settled_id(db: Session, id_column, time_column, lag_seconds: int) -> int:
+    """
+    Newest id of a table among rows stamped at or before `settled_time`,
+    or 0. Ids are handed out before commit too, so the same lag covers a
+    slow transaction adding a row below the newest visible id.
+    """
+    return (
+        db.execute(
+            select(id_column)
+            .where(time_column <= seconds_ago(lag_seconds))
+            .order_by(id_column.desc())
+            .limit(1)
+        ).scalar()
+        or 0
+    )
+
+
+def read_cursor(db: Session, name: str) -> Tuple[int, Optional[datetime]]:
+    """(last_id, last_time) a job has folded under `name`; (0, None) at first."""
+    row = db.execute(
+        select(FoldCursor.last_id, FoldCursor.last_time).where(FoldCursor.name == name)
+    ).first()
+    return tuple(row) if row is not None else (0, None)
+
+
+def move_cursor(
+    db: Session, name: str, last_id: int = 0, last_time: Optional[datetime] = None
+) -> None:
+    """Store how far `name` has folded inside the current transaction."""
+    connection = db.connection()
+    position = {
+        "last_id": last_id,
+        "last_time": last_time,
+        "updated_at": datetime.now(),
+    }
+    connection.execute(
+        upsert(connection, FoldCursor)
+        .values(name=name, **position)
+        .on_conflict_do_update(index_elements=[FoldCursor.name], set_=position)
+    )
+
+
+def _is_excluded(obj) -> bool:
+    return isinstance(obj, ResourceContribution) and obj.is_correction
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _roll_up_flushed_rows(session, flush_context):
+    """Move daily buckets for flushed inserts and deletes in the same transaction."""
+    deltas = Counter()
+    today = None
+
+    for obj in session.new:
+        metric = _METRIC_BY_MODEL.get(type(obj))
+        if metric is not None and not _is_excluded(obj):
+            day = row_day(obj, METRICS[metric][1])
+            if day is None:
+                # Server-side defaults are not loaded yet; they are "now"
+                if today is None:
+                    today = database_today(session)
+                day = today
+            deltas[metric, day] += 1
+    for obj in session.deleted:
+        metric = _METRIC_BY_MODEL.get(type(obj))
+        if metric is not None and not _is_excluded(obj):
+            day = row_day(obj, METRICS[metric][1])
+            if day is not None:
+                deltas[metric, day] -= 1
+
+    for (metric, day), delta in sorted(deltas.items()):
+        if delta:
+            add(session, metric, day, delta)
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, cast, Float, text
+from sqlalchemy import func, cast, Float, literal, text
 from typing import List, Optional, Dict, Any
 from app.db.models import (
     Event,
@@ -7,7 +7,8 @@ from app.db.models import (
     User,
     Organization,
 )
-import math
+from app.core import geo
+from app.db.functions import haversine
 
 
 def search_users(
@@ -130,27 +131,6 @@ def global_search(
     }
 
 
-def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    """
-    Calculate the great circle distance between two points
-    on the earth using the Haversine formula.
-    Returns distance in kilometers.
-    """
-    # Convert decimal degrees to radians
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-
-    # Haversine formula
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = (
-        math.sin(dlat / 2) ** 2
-        + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    )
-    c = 2 * math.asin(math.sqrt(a))
-    r = 6371  # Radius of earth in kilometers
-    return c * r
-
-
 def full_text_search_resources(
     db: Session,
     query: str,
@@ -192,11 +172,24 @@ def geospatial_search_events(
     limit: int = 100,
 ) -> List[Dict[str, Any]]:
     """
-    Find events within a certain radius using more efficient SQL-based calculation.
+    Find events within a certain radius using SQL-side distance calculation.
+    Distance filtering, ordering and pagination all run in the database.
     Returns events with calculated distance.
     """
-    # Base query
-    query = db.query(Event)
+    distance = haversine(
+        literal(latitude, Float),
+        literal(longitude, Float),
+        Event.latitude,
+        Event.longitude,
+    )
+
+    # Bounding box prefilter lets the database skip most rows cheaply
+    min_lat, max_lat, min_lon, max_lon = geo.bounding_box(latitude, longitude, radius)
+    query = db.query(Event, distance.label("distance_km")).filter(
+        Event.latitude.between(min_lat, max_lat),
+        Event.longitude.between(min_lon, max_lon),
+        distance <= radius,
+    )
 
     # Apply filters
     if event_type:
@@ -208,38 +201,24 @@ def geospatial_search_events(
     if end_date:
         query = query.filter(Event.end_time <= end_date)
 
-    # Get all events with coordinates
-    events_with_coords = query.filter(
-        Event.latitude.isnot(None), Event.longitude.isnot(None)
-    ).all()
-
-    # Calculate distance for each event
-    result = []
-    for event in events_with_coords:
-        distance = calculate_distance(
-            latitude, longitude, event.latitude, event.longitude
-        )
-        if distance <= radius:
-            event_dict = {
-                "id": event.id,
-                "title": event.title,
-                "description": event.description,
-                "start_time": event.start_time,
-                "end_time": event.end_time,
-                "event_type": event.event_type,
-                "organization_id": event.organization_id,
-                "address": event.address,
-                "latitude": event.latitude,
-                "longitude": event.longitude,
-                "distance_km": round(distance, 2),
-            }
-            result.append(event_dict)
-
-    # Sort by distance
-    result.sort(key=lambda x: x["distance_km"])
-
-    # Apply pagination
-    return result[skip : skip + limit]
+    # Order by distance with id as a tiebreaker so pages are stable
+    rows = query.order_by(distance, Event.id).offset(skip).limit(limit).all()
+
+    return [
+        {
+            "id": event.id,
+            "title": event.title,
+            "start_time": event.start_time,
+            "end_time": event.end_time,
+            "event_type": event.event_type,
+            "organization_id": event.organization_id,
+            "address": event.address,
+            "latitude": event.latitude,
+            "longitude": event.longitude,
+            "distance_km": round(distance_km, 2),
+        }
+        for event, distance_km in rows
+    ]
 
 
 def full_text_search_organizations(
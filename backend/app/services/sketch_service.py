@@ -0,0 +1,239 @@
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.hyperloglog import HyperLogLog
+from app.db.functions import upsert
+from app.db.models import (
+    Event,
+    ResourceRequest,
+    ResourceContribution,
+    EventBeneficiary,
+    UniqueSketch,
+)
+from app.services.rollup_service import move_cursor, read_cursor, settled_time
+
+# Distinct people tracked: beneficiaries served and contributors giving
+METRICS = ("beneficiaries", "contributors")
+SCOPES = ("all", "event", "organization", "wilaya")
+# Metric -> timestamp of the rows its people are read from
+MOMENTS = {
+    "beneficiaries": EventBeneficiary.benefit_time,
+    "contributors": ResourceContribution.contribution_time,
+}
+
+SketchKey = Tuple[str, str, date]  # (scope, scope_key, day)
+
+
+def _scope_keys(event_id, organization_id, wilaya):
+    """Every (scope, scope_key) a row of an event contributes to."""
+    yield "all", ""
+    if event_id is not None:
+        yield "event", str(event_id)
+    if organization_id is not None:
+        yield "organization", str(organization_id)
+    if wilaya:
+        yield "wilaya", wilaya
+
+
+def _merge_sketches(db: Session, metric: str, sketches: Dict[SketchKey, HyperLogLog]):
+    """Merge new (scope, scope_key, day) sketches into the stored ones."""
+    connection = db.connection()
+    stored = {
+        (scope, scope_key, day): registers
+        for scope, scope_key, day, registers in connection.execute(
+            select(
+                UniqueSketch.scope,
+                UniqueSketch.scope_key,
+                UniqueSketch.day,
+                UniqueSketch.registers,
+            ).where(
+                UniqueSketch.metric == metric,
+                UniqueSketch.day.in_({day for _, _, day in sketches}),
+            )
+        )
+    }
+
+    rows = []
+    for key, sketch in sorted(sketches.items()):
+        if key in stored:
+            sketch.merge(HyperLogLog.from_bytes(stored[key]))
+        registers = sketch.to_bytes()
+        if registers != stored.get(key):
+            scope, scope_key, day = key
+            rows.append(
+                {
+                    "metric": metric,
+                    "scope": scope,
+                    "scope_key": scope_key,
+                    "day": day,
+                    "registers": registers,
+                }
+            )
+    if rows:
+        statement = upsert(connection, UniqueSketch)
+        connection.execute(
+            statement.on_conflict_do_update(
+                index_elements=[
+                    UniqueSketch.metric,
+                    UniqueSketch.scope,
+                    UniqueSketch.scope_key,
+                    UniqueSketch.day,
+                ],
+                set_={"registers": statement.excluded.registers},
+            ),
+            rows,
+        )
+
+
+def count_unique(
+    db: Session,
+    metric: str,
+    start_date: datetime,
+    end_date: datetime,
+    scope: str = "all",
+    scope_key: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Estimate the distinct people of a metric over a window of days.
+
+    Daily sketches are merged, so the answer costs a few kilobytes per day
+    in the window regardless of how many rows were written.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    if scope not in SCOPES:
+        raise ValueError(f"Unknown scope: {scope}")
+    if scope == "all":
+        scope_key = ""
+    elif not scope_key:
+        raise ValueError(f"A {scope} scope needs a key")
+
+    first_day = start_date.date() if isinstance(start_date, datetime) else start_date
+    last_day = end_date.date() if isinstance(end_date, datetime) else end_date
+
+    merged = HyperLogLog()
+    days = 0
+    for (registers,) in db.execute(
+        select(UniqueSketch.registers).where(
+            UniqueSketch.metric == metric,
+            UniqueSketch.scope == scope,
+            UniqueSketch.scope_key == scope_key,
+            UniqueSketch.day.between(first_day, last_day),
+        )
+    ):
+        merged.merge(HyperLogLog.from_bytes(registers))
+        days += 1
+
+    return {"estimate": merged.count(), "days": days}
+
+
+def _sketch_rows(db: Session, metric: str, since: Optional[datetime] = None):
+    """
+    (user_id, moment, event_id, organization_id, wilaya) of the rows of a
+    metric, or only of those stamped at or after `since`.
+    """
+    if metric == "beneficiaries":
+        query = select(
+            EventBeneficiary.user_id,
+            EventBeneficiary.benefit_time,
+            Event.id,
+            Event.organization_id,
+            Event.wilaya,
+        ).join(Event, EventBeneficiary.event_id == Event.id)
+    else:
+        query = (
+            select(
+                ResourceContribution.user_id,
+                ResourceContribution.contribution_time,
+                Event.id,
+                Event.organization_id,
+                Event.wilaya,
+            )
+            .join(
+                ResourceRequest, ResourceContribution.request_id == ResourceRequest.id
+            )
+            .join(Event, ResourceRequest.event_id == Event.id)
+        )
+    if since is not None:
+        query = query.where(MOMENTS[metric] >= since)
+    return db.execute(query.execution_options(yield_per=1000))
+
+
+def _collect(rows) -> Dict[SketchKey, HyperLogLog]:
+    """Sketch rows per (scope, scope_key, day)."""
+    sketches = defaultdict(HyperLogLog)
+    for user_id, moment, event_id, organization_id, wilaya in rows:
+        if user_id is None or moment is None:
+            continue
+        day = moment.date() if isinstance(moment, datetime) else moment
+        for scope, scope_key in _scope_keys(event_id, organization_id, wilaya):
+            sketches[scope, scope_key, day].add(user_id)
+    return sketches
+
+
+def fold_sketches(db: Session) -> int:
+    """
+    Fold the people of rows added since the last run into their daily
+    sketches.
+
+    Each run reads every row stamped since the previous run's settled time,
+    SUMMARY_FOLD_LAG_SECONDS before it started by the database clock, so a
+    slow transaction committing an older row is still seen; folding a
+    person twice is harmless. Only one fold may run at a time. Returns the
+    number of sketches merged.
+    """
+    settled = settled_time(db, settings.SUMMARY_FOLD_LAG_SECONDS)
+    merged = 0
+    for metric in METRICS:
+        cursor = f"sketches:{metric}"
+        _, since = read_cursor(db, cursor)
+        sketches = _collect(_sketch_rows(db, metric, since))
+        if sketches:
+            _merge_sketches(db, metric, sketches)
+            merged += len(sketches)
+        move_cursor(db, cursor, last_time=settled)
+    db.commit()
+    return merged
+
+
+def rebuild_sketches(
+    db: Session, metrics: Optional[Iterable[str]] = None
+) -> Dict[str, int]:
+    """
+    Rebuild the sketches of metrics from their tables.
+
+    Sketches cannot forget a person, so this is also how deleted rows stop
+    being counted. Returns the number of sketches written per metric.
+    """
+    metrics = list(metrics) if metrics is not None else list(METRICS)
+    written = {}
+
+    for metric in metrics:
+        settled = settled_time(db, settings.SUMMARY_FOLD_LAG_SECONDS)
+        sketches = _collect(_sketch_rows(db, metric))
+
+        db.execute(delete(UniqueSketch).where(UniqueSketch.metric == metric))
+        if sketches:
+            db.execute(
+                insert(UniqueSketch),
+                [
+                    {
+                        "metric": metric,
+                        "scope": scope,
+                        "scope_key": scope_key,
+                        "day": day,
+                        "registers": sketch.to_bytes(),
+                    }
+                    for (scope, scope_key, day), sketch in sketches.items()
+                ],
+            )
+        move_cursor(db, f"sketches:{metric}", last_time=settled)
+        written[metric] = len(sketches)
+
+    db.commit()
+    return written
@@ -0,0 +1,197 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import event as sa_event
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.functions import upsert
+from app.db.models import (
+    User,
+    Organization,
+    Event,
+    ResourceRequest,
+    ResourceContribution,
+    EventBeneficiary,
+    StatsCounter,
+)
+
+# Models whose inserts and deletes move a counter of the same name
+TRACKED_MODELS = {
+    User: "users",
+    Organization: "organizations",
+    Event: "events",
+    ResourceRequest: "resource_requests",
+    ResourceContribution: "resource_contributions",
+    EventBeneficiary: "event_beneficiaries",
+}
+
+# Live query for every counter, used to seed and reconcile the stored values
+COUNTER_QUERIES = {
+    name: select(func.count()).select_from(model)
+    for model, name in TRACKED_MODELS.items()
+}
+# Correction entries in the contribution ledger are not contributions
+COUNTER_QUERIES["resource_contributions"] = COUNTER_QUERIES[
+    "resource_contributions"
+].where(~ResourceContribution.is_correction)
+# Distinct users registered as a beneficiary of at least one event
+COUNTER_QUERIES["beneficiaries"] = select(
+    func.count(func.distinct(EventBeneficiary.user_id))
+)
+
+
+def increment(db: Session, name: str, delta: int) -> None:
+    """
+    Add delta to a counter inside the current transaction.
+
+    A counter that has no row yet is seeded from a live count, which already
+    includes the rows flushed in this transaction. If another transaction
+    seeds it first, the delta is added to that row instead of failing.
+    """
+    connection = db.connection()
+    now = datetime.now()
+    result = connection.execute(
+        update(StatsCounter)
+        .where(StatsCounter.name == name)
+        .values(value=StatsCounter.value + delta, updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(
+            upsert(connection, StatsCounter)
+            .values(
+                name=name,
+                value=connection.execute(COUNTER_QUERIES[name]).scalar_one(),
+                updated_at=now,
+            )
+            .on_conflict_do_update(
+                index_elements=[StatsCounter.name],
+                set_={"value": StatsCounter.value + delta, "updated_at": now},
+            )
+        )
+
+
+def get_counts(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """
+    Read counters by name. Counters that have never been stored are counted
+    live; nothing is written, so the caller's transaction stays a read.
+    """
+    names = list(names)
+    counts = dict(
+        db.execute(
+            select(StatsCounter.name, StatsCounter.value).where(
+                StatsCounter.name.in_(names)
+            )
+        ).all()
+    )
+
+    for name in names:
+        if name not in counts:
+            counts[name] = db.execute(COUNTER_QUERIES[name]).scalar_one()
+
+    return {name: counts[name] for name in names}
+
+
+def get_count(db: Session, name: str) -> int:
+    return get_counts(db, [name])[name]
+
+
+def reconcile_counters(
+    db: Session, names: Optional[Iterable[str]] = None
+) -> Dict[str, int]:
+    """
+    Recount counters from their tables and store the result.
+
+    Returns the drift (live count minus stored value) of every counter that
+    was wrong; counters seeded for the first time report their full count.
+    """
+    names = list(names) if names is not None else list(COUNTER_QUERIES)
+    stored = dict(
+        db.execute(
+            select(StatsCounter.name, StatsCounter.value).where(
+                StatsCounter.name.in_(names)
+            )
+        ).all()
+    )
+
+    drift = {}
+    for name in names:
+        actual = db.execute(COUNTER_QUERIES[name]).scalar_one()
+        if name not in stored:
+            # A concurrent first increment may have seeded it meanwhile
+            db.execute(
+                upsert(db.connection(), StatsCounter)
+                .values(name=name, value=actual, updated_at=datetime.now())
+                .on_conflict_do_update(
+                    index_elements=[StatsCounter.name],
+                    set_={"value": actual, "updated_at": datetime.now()},
+                )
+            )
+        elif stored[name] != actual:
+            db.execute(
+                update(StatsCounter)
+                .where(StatsCounter.name == name)
+                .values(value=actual, updated_at=datetime.now())
+            )
+        else:
+            continue
+        drift[name] = actual - stored.get(name, 0)
+
+    db.commit()
+    return drift
+
+
+def _is_correction(obj) -> bool:
+    return isinstance(obj, ResourceContribution) and obj.is_correction
+
+
+def _beneficiary_delta(session: Session, added: Counter, removed: Counter) -> int:
+    """Change in distinct beneficiaries, given per-user rows added and removed."""
+    user_ids = set(added) | set(removed)
+    remaining = dict(
+        session.connection()
+        .execute(
+            select(EventBeneficiary.user_id, func.count())
+            .where(EventBeneficiary.user_id.in_(user_ids))
+            .group_by(EventBeneficiary.user_id)
+        )
+        .all()
+    )
+
+    delta = 0
+    for user_id in user_ids:
+        now = remaining.get(user_id, 0)
+        before = now - added[user_id] + removed[user_id]
+        delta += (now > 0) - (before > 0)
+    return delta
+
+
+@sa_event.listens_for(Session, "after_flush")
+def _count_flushed_rows(session, flush_context):
+    """Move counters for flushed inserts and deletes in the same transaction."""
+    deltas = Counter()
+    beneficiaries_added = Counter()
+    beneficiaries_removed = Counter()
+
+    for obj in session.new:
+        name = TRACKED_MODELS.get(type(obj))
+        if name is not None and not _is_correction(obj):
+            deltas[name] += 1
+            if isinstance(obj, EventBeneficiary):
+                beneficiaries_added[obj.user_id] += 1
+    for obj in session.deleted:
+        name = TRACKED_MODELS.get(type(obj))
+        if name is not None and not _is_correction(obj):
+            deltas[name] -= 1
+            if isinstance(obj, EventBeneficiary):
+                beneficiaries_removed[obj.user_id] += 1
+
+    if beneficiaries_added or beneficiaries_removed:
+        deltas["beneficiaries"] += _beneficiary_delta(
+            session, beneficiaries_added, beneficiaries_removed
+        )
+
+    for name, delta in sorted(deltas.items()):
+        if delta:
+            increment(session, name, delta)
@@ -21,9 +21,20 @@ from app.db import (
     EventCollaborator,
     ResourceContribution,
     ResourceRequest,
+    ResourceRequestSnapshot,
     EventBeneficiary,
     OAuthConnection,
     Notification,
+    NotificationCounter,
+    NotificationCursor,
+    StatsCounter,
+    DailyRollup,
+    UniqueSketch,
+    LeaderboardTotal,
+    LeaderboardEntry,
+    FoldCursor,
+    SchedulerLock,
+    IdempotencyKey,
     Base,
 )
 
@@ -0,0 +1,33 @@
+"""fold leaderboards
+
+Revision ID: 1088e734dc05
+Revises: 6125bd292c20
+Create Date: 2026-10-19 02:24:11.153368
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1088e734dc05'
+down_revision: Union[str, None] = '6125bd292c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Leaderboards were kept up to date on every contribution until now
+    op.execute(
+        "INSERT INTO fold_cursors (name, last_id, updated_at) "
+        "SELECT 'leaderboards', COALESCE(MAX(id), 0), CURRENT_TIMESTAMP "
+        "FROM resource_contributions"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM fold_cursors WHERE name = 'leaderboards'")
@@ -0,0 +1,48 @@
+"""seed stats counters
+
+Revision ID: 3b9ec825c7a1
+Revises: 9147cf44b2fc
+Create Date: 2026-10-19 02:17:38.187604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9ec825c7a1'
+down_revision: Union[str, None] = '9147cf44b2fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Live count behind every dashboard counter, as in stats_service
+COUNTER_QUERIES = {
+    "users": "SELECT COUNT(*) FROM users",
+    "organizations": "SELECT COUNT(*) FROM organizations",
+    "events": "SELECT COUNT(*) FROM events",
+    "resource_requests": "SELECT COUNT(*) FROM resource_requests",
+    "resource_contributions": (
+        "SELECT COUNT(*) FROM resource_contributions WHERE kind != 'correction'"
+    ),
+    "event_beneficiaries": "SELECT COUNT(*) FROM event_beneficiaries",
+    "beneficiaries": "SELECT COUNT(DISTINCT user_id) FROM event_beneficiaries",
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Store every counter up front so the first writes only ever update
+    for name, query in COUNTER_QUERIES.items():
+        op.execute(
+            f"INSERT INTO stats_counters (name, value, updated_at) "
+            f"SELECT '{name}', ({query}), CURRENT_TIMESTAMP WHERE NOT EXISTS "
+            f"(SELECT 1 FROM stats_counters WHERE name = '{name}')"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Seeded rows are valid counters; nothing to undo
+    pass
@@ -0,0 +1,65 @@
+"""add contribution ledger snapshots
+
+Revision ID: 7761bf0b8d28
+Revises: 73cf1ca92f6a
+Create Date: 2026-10-19 01:07:44.436411
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7761bf0b8d28'
+down_revision: Union[str, None] = '73cf1ca92f6a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('resource_request_snapshots',
+    sa.Column('request_id', sa.Integer(), nullable=False),
+    sa.Column('ledger_id', sa.Integer(), nullable=False),
+    sa.Column('balance', sa.BigInteger(), nullable=False),
+    sa.Column('taken_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['request_id'], ['resource_requests.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('request_id')
+    )
+    with op.batch_alter_table('resource_contributions') as batch_op:
+        batch_op.add_column(sa.Column('kind', sa.String(length=20), server_default='contribution', nullable=False))
+        batch_op.add_column(sa.Column('note', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('recorded_by', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_resource_contributions_request_ledger', ['request_id', 'id'], unique=False)
+        batch_op.create_foreign_key('fk_resource_contributions_recorded_by_users', 'users', ['recorded_by'], ['id'])
+
+    # Snapshot every request's current total as of its latest ledger entry
+    op.execute(
+        "INSERT INTO resource_request_snapshots (request_id, ledger_id, balance, taken_at) "
+        "SELECT id, COALESCE((SELECT MAX(id) FROM resource_contributions "
+        "WHERE request_id = resource_requests.id), 0), COALESCE(quantity_received, 0), "
+        "CURRENT_TIMESTAMP FROM resource_requests"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Bring quantity_received up to date with the ledger tail
+    op.execute(
+        "UPDATE resource_requests SET quantity_received = "
+        "COALESCE((SELECT balance FROM resource_request_snapshots "
+        "WHERE request_id = resource_requests.id), 0) + "
+        "(SELECT COALESCE(SUM(quantity), 0) FROM resource_contributions "
+        "WHERE request_id = resource_requests.id AND id > COALESCE("
+        "(SELECT ledger_id FROM resource_request_snapshots "
+        "WHERE request_id = resource_requests.id), 0))"
+    )
+    with op.batch_alter_table('resource_contributions') as batch_op:
+        batch_op.drop_constraint('fk_resource_contributions_recorded_by_users', type_='foreignkey')
+        batch_op.drop_index('ix_resource_contributions_request_ledger')
+        batch_op.drop_column('recorded_by')
+        batch_op.drop_column('note')
+        batch_op.drop_column('kind')
+    op.drop_table('resource_request_snapshots')
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the daily activity rollups, distinct-people sketches and
+contributor leaderboards behind the Tweeza dashboards.
+
+Run it once after upgrading, and whenever rows were written outside the ORM.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.session import DatabaseConnection
+from app.services import rollup_service, sketch_service, leaderboard_service
+
+
+def setup_argparse():
+    """Configure the argument parser."""
+    parser = argparse.ArgumentParser(description="Rebuild daily rollups")
+
+    parser.add_argument(
+        "metrics",
+        nargs="*",
+        help="Metrics to rebuild (default: all)",
+    )
+
+    return parser
+
+
+def main(argv=None):
+    """Main function to rebuild the rollups."""
+    parser = setup_argparse()
+    args = parser.parse_args(argv)
+    # Checked here: argparse rejects an empty nargs="*" list given choices
+    unknown = sorted(set(args.metrics) - set(rollup_service.METRICS))
+    if unknown:
+        parser.error(f"unknown metric(s): {', '.join(unknown)}")
+
+    db = DatabaseConnection().get_session()
+    try:
+        counted = rollup_service.backfill_rollups(db, args.metrics or None)
+        for metric, rows in sorted(counted.items()):
+            print(f"{metric}: {rows} rows rolled up")
+        if not args.metrics:
+            written = sketch_service.rebuild_sketches(db)
+            for metric, sketches in sorted(written.items()):
+                print(f"{metric}: {sketches} daily sketches rebuilt")
+            totals = leaderboard_service.rebuild_leaderboards(db)
+            print(f"leaderboards: {totals} totals rebuilt")
+    except Exception as e:
+        print(f"Error rebuilding rollups: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
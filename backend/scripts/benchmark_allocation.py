@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Script to time the resource allocation engine on synthetic data.
+
+Requests and pledges are scattered over northern Algeria with random
+resource types, shortfalls and start times; no database is needed.
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.allocation import allocate
+from app.schemas import ResourceTypeEnum
+
+
+def setup_argparse():
+    """Configure the argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark resource allocation")
+
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--pledges", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+
+    return parser
+
+
+def main():
+    """Main function to run the benchmark."""
+    args = setup_argparse().parse_args()
+    rng = np.random.default_rng(args.seed)
+    types = np.array([t.value for t in ResourceTypeEnum], dtype=object)
+
+    def points(count):
+        return rng.uniform(19, 37, count), rng.uniform(-8, 12, count)
+
+    request_latitudes, request_longitudes = points(args.requests)
+    pledge_latitudes, pledge_longitudes = points(args.pledges)
+
+    started = time.perf_counter()
+    plan = allocate(
+        request_latitudes=request_latitudes,
+        request_longitudes=request_longitudes,
+        shortfall=rng.integers(1, 200, args.requests),
+        days_until_start=rng.uniform(0, 30, args.requests),
+        request_types=types[rng.integers(0, len(types), args.requests)],
+        pledge_latitudes=pledge_latitudes,
+        pledge_longitudes=pledge_longitudes,
+        quantity=rng.integers(1, 50, args.pledges),
+        pledge_types=types[rng.integers(0, len(types), args.pledges)],
+    )
+    elapsed = time.perf_counter() - started
+
+    assignments = len(plan.quantity)
+    print(f"{args.requests} requests x {args.pledges} pledges: {elapsed:.2f}s")
+    print(f"assignments: {assignments}")
+    print(f"allocated: {int(plan.quantity.sum())}")
+    print(f"unmet need: {int(plan.unmet.sum())}")
+    print(f"unallocated supply: {int(plan.leftover.sum())}")
+    if assignments:
+        print(f"mean trip: {plan.total_distance_km / assignments:.1f} km")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Script to measure email throughput against a local SMTP sink.
+
+Sends the same batch twice: once opening a connection per message, as email
+used to be sent, and once through the delivery pool. `--latency` delays
+every server reply to stand in for a remote mail relay.
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from tests.smtp_sink import SMTPSink
+from app.services.email_delivery import (
+    EmailDeliveryPool,
+    OutgoingEmail,
+    build_message,
+    connect_smtp,
+)
+
+
+def setup_argparse():
+    """Configure the argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark email delivery")
+
+    parser.add_argument("--messages", type=int, default=500, help="Emails to send")
+    parser.add_argument(
+        "--workers", type=int, default=settings.EMAIL_WORKERS, help="Pool workers"
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.005,
+        help="Seconds the sink waits before each reply",
+    )
+
+    return parser
+
+
+def one_connection_per_message(emails):
+    for email in emails:
+        server = connect_smtp()
+        try:
+            message = build_message(email)
+            server.sendmail(settings.EMAIL_FROM, [email.recipient], message)
+        finally:
+            server.quit()
+
+
+def main():
+    """Main function to run the benchmark."""
+    parser = setup_argparse()
+    args = parser.parse_args()
+
+    emails = [
+        OutgoingEmail(f"user{i}@example.com", f"Benchmark {i}", f"<p>Message {i}</p>")
+        for i in range(args.messages)
+    ]
+
+    with SMTPSink(delay=args.latency) as sink:
+        settings.EMAIL_HOST = sink.host
+        settings.EMAIL_PORT = sink.port
+        settings.EMAIL_USER = "benchmark"
+        settings.EMAIL_PASSWORD = "benchmark"
+        settings.EMAIL_USE_TLS = False
+
+        started = time.perf_counter()
+        one_connection_per_message(emails)
+        serial = time.perf_counter() - started
+        serial_connections = sink.counts["connections"]
+
+        pool = EmailDeliveryPool(workers=args.workers)
+        started = time.perf_counter()
+        results = pool.send_many(emails)
+        pooled = time.perf_counter() - started
+        pool.stop()
+
+    for label, seconds, connections in (
+        ("connection per message", serial, serial_connections),
+        (f"pool of {args.workers}", pooled, pool.stats()["connections"]),
+    ):
+        print(
+            f"{label}: {args.messages / seconds:.0f} emails/s "
+            f"({seconds:.2f}s, {connections} connections)"
+        )
+    print(f"Failed through the pool: {results.count(False)}")
+
+
+if __name__ == "__main__":
+    main()
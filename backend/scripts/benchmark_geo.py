@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark radius filtering of nearby-event candidates.
+
+Compares the per-row Python haversine loop that the nearby endpoints used
+against the vectorized filter in app.core.geo.
+"""
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core import geo
+
+
+def setup_argparse():
+    """Configure the argument parser."""
+    parser = argparse.ArgumentParser(description="Benchmark radius filtering")
+
+    parser.add_argument(
+        "--candidates", type=int, default=100_000, help="Number of candidates"
+    )
+    parser.add_argument("--radius", type=float, default=25.0, help="Radius in km")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    return parser
+
+
+def loop_filter(latitude, longitude, ids, latitudes, longitudes, radius):
+    """The previous implementation: one haversine call per candidate row."""
+    nearby = []
+    for event_id, lat, lon in zip(ids, latitudes, longitudes):
+        distance = geo.haversine(latitude, longitude, lat, lon)
+        if distance <= radius:
+            nearby.append((event_id, distance))
+    nearby.sort(key=lambda item: item[1])
+    return nearby
+
+
+def best_of(repeat, func, *args):
+    """Return the fastest wall-clock time and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    args = setup_argparse().parse_args()
+    rng = random.Random(args.seed)
+
+    # Candidates scattered around Algiers, as a bounding box prefilter returns
+    origin = (36.75, 3.04)
+    ids = list(range(1, args.candidates + 1))
+    latitudes = [origin[0] + rng.uniform(-0.5, 0.5) for _ in ids]
+    longitudes = [origin[1] + rng.uniform(-0.5, 0.5) for _ in ids]
+    call_args = (origin[0], origin[1], ids, latitudes, longitudes, args.radius)
+
+    loop_time, loop_result = best_of(args.repeat, loop_filter, *call_args)
+    vector_time, vector_result = best_of(
+        args.repeat, geo.filter_within_radius, *call_args
+    )
+
+    assert [i for i, _ in loop_result] == [i for i, _ in vector_result]
+
+    print(f"candidates: {args.candidates}, radius: {args.radius} km")
+    print(f"numpy available: {geo.HAS_NUMPY}")
+    print(f"matches: {len(vector_result)}")
+    print(f"python loop: {loop_time * 1000:.1f} ms")
+    print(f"vectorized:  {vector_time * 1000:.1f} ms")
+    print(f"speedup:     {loop_time / vector_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
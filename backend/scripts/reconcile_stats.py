@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Script to repair drift in the Tweeza dashboard counters.
+
+Counters are moved by the ORM on every insert and delete; writes that bypass
+the ORM (bulk deletes, manual SQL) leave them off until this runs.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.session import DatabaseConnection
+from app.services import stats_service
+
+
+def setup_argparse():
+    """Configure the argument parser."""
+    parser = argparse.ArgumentParser(description="Recount dashboard counters")
+
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help="Counters to reconcile (default: all)",
+    )
+
+    return parser
+
+
+def main(argv=None):
+    """Main function to reconcile the counters."""
+    parser = setup_argparse()
+    args = parser.parse_args(argv)
+    # Not argparse choices, which reject the empty default list
+    unknown = sorted(set(args.names) - set(stats_service.COUNTER_QUERIES))
+    if unknown:
+        parser.error(f"unknown counter(s): {', '.join(unknown)}")
+
+    db = DatabaseConnection().get_session()
+    try:
+        drift = stats_service.reconcile_counters(db, args.names or None)
+        if not drift:
+            print("All counters are in sync")
+        for name, delta in sorted(drift.items()):
+            print(f"{name}: corrected by {delta:+d}")
+    except Exception as e:
+        print(f"Error reconciling counters: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
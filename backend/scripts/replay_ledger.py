@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Script to audit resource request balances against the contribution ledger.
+
+Every request's snapshot is rebuilt from the full ledger in one pass;
+requests whose stored balance disagreed with the replay are reported.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.db.session import DatabaseConnection
+from app.services import resource_service
+
+
+def setup_argparse():
+    """Configure the argument parser."""
+    return argparse.ArgumentParser(
+        description="Rebuild resource request balances from the contribution ledger"
+    )
+
+
+def main():
+    """Main function to replay the ledger."""
+    parser = setup_argparse()
+    parser.parse_args()
+
+    db = DatabaseConnection().get_session()
+    try:
+        mismatches = resource_service.replay_ledger(db)
+        if not mismatches:
+            print("All request balances match the ledger")
+        for request_id, balances in mismatches.items():
+            print(
+                f"request {request_id}: stored {balances['stored']}, "
+                f"replayed {balances['replayed']}"
+            )
+    except Exception as e:
+        print(f"Error replaying ledger: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,9 +11,47 @@ from app.schemas import UserRoleEnum
 from app.db.models import User, UserRole, Organization, OrganizationMember
 from app.services import user_service
 from app.schemas import UserCreate
+from app.services.event_index import event_index
+from app.services.dashboard_service import dashboard_snapshot
+from app.services.query_cache import query_cache
+from app.core.idempotency import idempotency_store
+from app.services.notification_hub import notification_hub
+from app.core.config import settings
+from tests.smtp_sink import SMTPSink
+from app.services import email_delivery
 from tests.utils import create_random_user_data
 
 
+@pytest.fixture(autouse=True)
+def reset_process_caches():
+    """Clear process-local snapshots so tests don't see each other's data."""
+    event_index.reset()
+    dashboard_snapshot.reset()
+    query_cache.reset()
+    notification_hub.reset()
+    yield
+    event_index.reset()
+    dashboard_snapshot.reset()
+    query_cache.reset()
+    notification_hub.reset()
+
+
+@pytest.fixture
+def smtp_sink(monkeypatch):
+    """Point email delivery at a local SMTP sink with a fresh worker pool."""
+    with SMTPSink() as sink:
+        monkeypatch.setattr(settings, "EMAIL_HOST", sink.host)
+        monkeypatch.setattr(settings, "EMAIL_PORT", sink.port)
+        monkeypatch.setattr(settings, "EMAIL_USER", "mailer")
+        monkeypatch.setattr(settings, "EMAIL_PASSWORD", "secret")
+        monkeypatch.setattr(settings, "EMAIL_USE_TLS", False)
+        monkeypatch.setattr(settings, "EMAIL_RETRY_BACKOFF_SECONDS", 0.01)
+        pool = email_delivery.EmailDeliveryPool(workers=2)
+        monkeypatch.setattr(email_delivery, "email_pool", pool)
+        yield sink
+        pool.stop()
+
+
 @pytest.fixture(scope="session")
 def test_db_engine():
     """Create a test database engine with proper SQLite settings."""
@@ -56,7 +94,15 @@ def db_session(test_db_engine):
 
 
 @pytest.fixture
-def client(db_session):
+def idempotency_sessions(db_session, monkeypatch):
+    """Keep Idempotency-Key records in the test database."""
+    Session = sessionmaker(bind=db_session.connection())
+    monkeypatch.setattr(idempotency_store, "session_factory", Session)
+    return Session
+
+
+@pytest.fixture
+def client(db_session, idempotency_sessions):
     """Create a test client with overridden dependencies."""
 
     def override_get_db():
@@ -0,0 +1,154 @@
+import socketserver
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional
+
+
+@dataclass
+class SinkMessage:
+    mail_from: str
+    recipients: List[str]
+    data: str
+
+
+def _address(argument: str) -> str:
+    """Pull the bare address out of "FROM:<a@b> SIZE=10" or "TO:<a@b>"."""
+    path = argument.partition(":")[2].strip().split(" ")[0]
+    return path.strip("<>")
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, *lines: str) -> None:
+        if self.server.sink.delay:
+            time.sleep(self.server.sink.delay)
+        self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+    def read_data(self) -> str:
+        lines = []
+        while True:
+            line = self.rfile.readline()
+            if not line or line == b".\r\n":
+                return "".join(lines)
+            if line.startswith(b".."):
+                line = line[1:]
+            lines.append(line.decode("utf-8", "replace"))
+
+    def handle(self) -> None:
+        sink = self.server.sink
+        sink._record("connections")
+        self.reply("220 tweeza-sink ESMTP")
+        mail_from, recipients = None, []
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            text = line.decode("utf-8", "replace").strip()
+            command, _, argument = text.partition(" ")
+            command = command.upper()
+
+            failure = sink._take_failure(command)
+            if failure:
+                self.reply(failure)
+                if failure.startswith("421"):
+                    return
+            elif command == "EHLO":
+                self.reply("250-tweeza-sink", "250-AUTH PLAIN", "250 8BITMIME")
+            elif command == "HELO":
+                self.reply("250 tweeza-sink")
+            elif command == "AUTH":
+                sink._record("logins")
+                self.reply("235 2.7.0 Authentication successful")
+            elif command == "MAIL":
+                mail_from, recipients = _address(argument), []
+                self.reply("250 OK")
+            elif command == "RCPT":
+                recipients.append(_address(argument))
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                sink._keep(SinkMessage(mail_from, recipients, self.read_data()))
+                mail_from, recipients = None, []
+                self.reply("250 OK")
+            elif command in ("RSET", "NOOP"):
+                if command == "RSET":
+                    mail_from, recipients = None, []
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class SMTPSink:
+    """
+    In-process SMTP server that accepts every message and keeps it, as a
+    local stand-in for a mail relay in tests and benchmarks.
+
+    Speaks enough of SMTP for smtplib (EHLO, AUTH PLAIN, MAIL, RCPT, DATA,
+    RSET, NOOP, QUIT) without TLS. `delay` is slept before every reply to
+    mimic a distant server; `fail` makes the next replies to a command an
+    error, such as "421 Try again later", which also drops the connection.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self._server = _Server((host, port), _SMTPHandler)
+        self._server.sink = self
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._failures: Dict[str, Deque[str]] = defaultdict(deque)
+        self.messages: List[SinkMessage] = []
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    @property
+    def host(self) -> str:
+        return self._server.server_address[0]
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def fail(self, command: str, reply: str, times: int = 1) -> None:
+        with self._lock:
+            self._failures[command.upper()].extend([reply] * times)
+
+    def start(self) -> "SMTPSink":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="smtp-sink", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "SMTPSink":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _record(self, name: str) -> None:
+        with self._lock:
+            self.counts[name] += 1
+
+    def _keep(self, message: SinkMessage) -> None:
+        with self._lock:
+            self.messages.append(message)
+
+    def _take_failure(self, command: str) -> Optional[str]:
+        with self._lock:
+            failures = self._failures.get(command)
+            return failures.popleft() if failures else None
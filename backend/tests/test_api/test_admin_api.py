@@ -0,0 +1,20 @@
+from fastapi import status
+
+
+def test_get_jobs(client, admin_token_headers):
+    """Test admins can see the maintenance jobs of this worker."""
+    response = client.get("/api/v1/admin/jobs", headers=admin_token_headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["running"] is True
+    names = {job["name"] for job in data["jobs"]}
+    assert {"reconcile_counters", "clean_up_notifications"} <= names
+    assert all(job["next_run"] is not None for job in data["jobs"])
+
+
+def test_get_jobs_requires_admin(client, token_headers):
+    """Test regular users cannot see the jobs."""
+    response = client.get("/api/v1/admin/jobs", headers=token_headers)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,78 @@
+from fastapi import status
+
+
+def test_activity_trend(client, admin_token_headers):
+    """Test reading a rollup series through the API."""
+    response = client.get(
+        "/api/v1/analytics/trends/registrations",
+        params={"interval": "week"},
+        headers=admin_token_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert len(data) >= 5
+    assert sum(item["count"] for item in data) >= 1
+
+
+def test_activity_trend_unknown_metric(client, admin_token_headers):
+    """Test unknown metrics return 404."""
+    response = client.get(
+        "/api/v1/analytics/trends/logins", headers=admin_token_headers
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_activity_trend_requires_admin(client, token_headers):
+    """Test regular users cannot read analytics."""
+    response = client.get(
+        "/api/v1/analytics/trends/registrations", headers=token_headers
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_dashboard_snapshot(client, admin_token_headers):
+    """Test the dashboard is served from a snapshot with its age."""
+    first = client.get("/api/v1/analytics/dashboard", headers=admin_token_headers)
+    second = client.get("/api/v1/analytics/dashboard", headers=admin_token_headers)
+
+    assert first.status_code == status.HTTP_200_OK
+    data = second.json()
+    assert data["entity_counts"]["users"] >= 1
+    assert "registration_trend" in data
+    assert data["generated_at"] == first.json()["generated_at"]
+    assert data["snapshot_age_seconds"] >= 0
+
+
+def test_fulfillment_report_for_org_admin(
+    client, admin_token_headers, token_headers, test_organization
+):
+    """Test org admins see their organization; other users are refused."""
+    response = client.get(
+        "/api/v1/analytics/fulfillment",
+        params={"group_by": "organization", "organization_id": test_organization.id},
+        headers=admin_token_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert isinstance(response.json(), list)
+
+    response = client.get(
+        "/api/v1/analytics/fulfillment",
+        params={"organization_id": test_organization.id},
+        headers=token_headers,
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_unique_people(client, admin_token_headers):
+    """Test estimating distinct contributors through the API."""
+    response = client.get(
+        "/api/v1/analytics/unique/contributors", headers=admin_token_headers
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["scope"] == "all"
+    assert data["estimate"] >= 0
@@ -35,6 +35,44 @@ def test_create_event_unauthorized(client, token_headers, test_organization):
     assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+def test_create_events_bulk(
+    client, admin_token_headers, token_headers, test_organization
+):
+    """Test a campaign of events with requests is created in one call."""
+    bulk_data = {
+        "events": [
+            {
+                **create_random_event_data(test_organization.id),
+                "resource_requests": [
+                    {"resource_type": "food", "quantity_needed": 200},
+                    {"resource_type": "time", "quantity_needed": 10},
+                ],
+            }
+            for _ in range(4)
+        ]
+    }
+
+    response = client.post(
+        "/api/v1/events/bulk", json=bulk_data, headers=admin_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["count"] == 4
+    assert [len(event["resource_requests"]) for event in data["results"]] == [2] * 4
+
+    response = client.put(
+        "/api/v1/events/bulk",
+        json={"events": [{"id": data["results"][0]["id"], "title": "Renamed"}]},
+        headers=admin_token_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["results"][0]["title"] == "Renamed"
+
+    # Workers of the organization cannot create its events
+    response = client.post("/api/v1/events/bulk", json=bulk_data, headers=token_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
 def test_list_events(client):
     """Test listing events - should be publicly accessible."""
     response = client.get("/api/v1/events/")
@@ -76,6 +114,28 @@ def test_get_event(client, test_event_id):
     assert data["id"] == test_event_id
 
 
+def test_get_event_detail(client, admin_token_headers, test_event_id):
+    """Test the event page aggregate includes request progress."""
+    client.post(
+        f"/api/v1/resources/requests/event/{test_event_id}",
+        json={"resource_type": "food", "quantity_needed": 40},
+        headers=admin_token_headers,
+    )
+
+    response = client.get(f"/api/v1/events/{test_event_id}/full")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["id"] == test_event_id
+    assert data["organization"]["id"] == data["organization_id"]
+    assert data["resource_requests"][0]["progress"] == 0.0
+    assert data["collaborators"] == []
+    assert data["beneficiary_count"] == 0
+
+    response = client.get("/api/v1/events/999999/full")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
 def test_update_event(client, admin_token_headers, test_event_id):
     """Test updating an event."""
     new_title = "Updated Event Title"
@@ -187,6 +247,24 @@ def test_add_beneficiary_to_event(
     assert response.status_code == status.HTTP_200_OK
 
 
+def test_retried_beneficiary_registration(
+    client, admin_token_headers, test_event_id, test_user
+):
+    """Test a retried registration replays instead of registering again."""
+    headers = {**admin_token_headers, "Idempotency-Key": "beneficiary-1"}
+    for _ in range(2):
+        response = client.post(
+            f"/api/v1/events/{test_event_id}/beneficiaries",
+            json={"user_id": test_user.id},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    assert response.headers["idempotent-replayed"] == "true"
+    beneficiaries = client.get(f"/api/v1/events/{test_event_id}/beneficiaries")
+    assert [user["id"] for user in beneficiaries.json()] == [test_user.id]
+
+
 def test_list_event_beneficiaries(
     client, admin_token_headers, test_event_id, test_user
 ):
@@ -316,3 +394,44 @@ def test_search_events_by_title(client, admin_token_headers, test_organization):
     data = response.json()
     assert len(data) >= 1
     assert any(e["title"] == "Special Ramadan Celebration" for e in data)
+
+
+def test_get_nearest_events(client, admin_token_headers, test_organization):
+    """Test getting the closest events without a radius."""
+    event_data = create_random_event_data(test_organization.id)
+    event_data.update({"latitude": 36.7528, "longitude": 3.0429})
+    create_response = client.post(
+        "/api/v1/events/", json=event_data, headers=admin_token_headers
+    )
+    assert create_response.status_code == status.HTTP_200_OK
+
+    response = client.get(
+        "/api/v1/events/nearest",
+        params={"latitude": 36.75, "longitude": 3.04, "k": 5},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data[0]["title"] == event_data["title"]
+    assert data[0]["distance"] < 1
+
+
+def test_get_event_clusters(client, admin_token_headers, test_organization):
+    """Test getting map clusters for a viewport."""
+    event_data = create_random_event_data(test_organization.id)
+    event_data.update({"latitude": 36.7528, "longitude": 3.0429})
+    client.post("/api/v1/events/", json=event_data, headers=admin_token_headers)
+
+    response = client.get(
+        "/api/v1/events/clusters", params={"bbox": "-9,18,12,38", "zoom": 6}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert sum(cluster["count"] for cluster in data) >= 1
+    assert {"count", "latitude", "longitude", "event_types"} <= set(data[0])
+
+    response = client.get(
+        "/api/v1/events/clusters", params={"bbox": "bad", "zoom": 6}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
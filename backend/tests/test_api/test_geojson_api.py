@@ -0,0 +1,77 @@
+import pytest
+from fastapi import status
+from datetime import datetime, timedelta
+from app.db.models import Event
+
+
+@pytest.fixture
+def located_events(db_session, test_organization):
+    """Create events inside and outside the Algiers area."""
+    start_time = datetime.now() + timedelta(days=1)
+    events = [
+        Event(
+            title="GeoJSON Algiers",
+            event_type="IFTAR",
+            organization_id=test_organization.id,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=2),
+            latitude=36.7528,
+            longitude=3.0429,
+        ),
+        Event(
+            title="GeoJSON Oran",
+            event_type="DONATION",
+            organization_id=test_organization.id,
+            start_time=start_time + timedelta(days=10),
+            latitude=35.6971,
+            longitude=-0.6308,
+        ),
+    ]
+    db_session.add_all(events)
+    db_session.commit()
+    return events
+
+
+def test_events_geojson(client, located_events):
+    """Test streaming events as a FeatureCollection."""
+    response = client.get("/api/v1/events.geojson")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/geo+json")
+
+    data = response.json()
+    assert data["type"] == "FeatureCollection"
+    titles = {f["properties"]["title"] for f in data["features"]}
+    assert {"GeoJSON Algiers", "GeoJSON Oran"} <= titles
+
+    feature = next(
+        f for f in data["features"] if f["properties"]["title"] == "GeoJSON Algiers"
+    )
+    assert feature["geometry"] == {"type": "Point", "coordinates": [3.0429, 36.7528]}
+
+
+def test_events_geojson_filters(client, located_events):
+    """Test bbox and time window filters."""
+    response = client.get("/api/v1/events.geojson", params={"bbox": "2,36,4,37.5"})
+    titles = [f["properties"]["title"] for f in response.json()["features"]]
+    assert titles == ["GeoJSON Algiers"]
+
+    end = (datetime.now() + timedelta(days=5)).isoformat()
+    response = client.get("/api/v1/events.geojson", params={"end": end})
+    titles = [f["properties"]["title"] for f in response.json()["features"]]
+    assert "GeoJSON Oran" not in titles
+
+    response = client.get("/api/v1/events.geojson", params={"bbox": "1,2"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_organizations_geojson(client, test_organization):
+    """Test streaming organizations as a FeatureCollection."""
+    response = client.get("/api/v1/organizations.geojson")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["type"] == "FeatureCollection"
+    assert any(
+        f["properties"]["name"] == test_organization.name for f in data["features"]
+    )
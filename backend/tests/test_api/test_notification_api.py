@@ -1,6 +1,9 @@
 import pytest
 from fastapi import status
+from app.core.config import settings
+from app.db.models import Notification
 from app.schemas import NotificationCreate, NotificationType
+from app.services.notification_hub import notification_hub
 
 
 def test_get_user_notifications(client, token_headers):
@@ -88,3 +91,73 @@ def test_delete_notification(client, token_headers, db_session):
     assert response.status_code == status.HTTP_200_OK
     data = response.json()
     assert data["success"] is True
+
+
+def test_fan_out_notification(
+    client, admin_token_headers, token_headers, test_event_id, test_organization
+):
+    """Test org admins can notify their members but not arbitrary roles."""
+    fanout = {
+        "title": "Meeting",
+        "message": "Volunteers meet at 18:00",
+        "type": "event_update",
+        "audiences": [
+            {"type": "organization_members", "organization_id": test_organization.id},
+            {"type": "event_beneficiaries", "event_id": test_event_id},
+        ],
+    }
+
+    response = client.post(
+        "/api/v1/notifications/fanout", json=fanout, headers=admin_token_headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["created"] >= 2
+
+    response = client.post(
+        "/api/v1/notifications/fanout", json=fanout, headers=token_headers
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.post(
+        "/api/v1/notifications/fanout",
+        json={**fanout, "audiences": [{"type": "role", "role": "worker"}]},
+        headers=admin_token_headers,
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.post(
+        "/api/v1/notifications/fanout",
+        json={**fanout, "audiences": [{"type": "nearby", "latitude": 36.7}]},
+        headers=admin_token_headers,
+    )
+    assert response.status_code == 422
+
+
+def test_stream_notifications(
+    client, token_headers, test_user, db_session, monkeypatch
+):
+    """Test the stream starts with missed notifications and the unread count."""
+    monkeypatch.setattr(settings, "NOTIFICATION_STREAM_MAX_SECONDS", 0)
+    notifications = [
+        Notification(user_id=test_user.id, title=f"Update {i}", message="m")
+        for i in range(3)
+    ]
+    db_session.add_all(notifications)
+    db_session.commit()
+
+    response = client.get(
+        "/api/v1/notifications/stream",
+        headers={**token_headers, "Last-Event-ID": str(notifications[0].id)},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/event-stream")
+    body = response.text
+    assert f"id: {notifications[0].id}\n" not in body
+    assert f"id: {notifications[1].id}\nevent: notification" in body
+    assert f"id: {notifications[2].id}\nevent: notification" in body
+    assert "event: unread_count" in body
+    assert notification_hub.stats()["streams"] == 0
+
+    response = client.get("/api/v1/notifications/stream")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -214,3 +214,42 @@ def test_user_can_remove_self_from_organization(
     )
 
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_export_organization_events(
+    client, admin_token_headers, test_organization, test_event
+):
+    """Test org admins can stream an export, gzipped when accepted."""
+    url = f"/api/v1/organizations/{test_organization.id}/exports/events"
+
+    plain = client.get(
+        url, headers={**admin_token_headers, "Accept-Encoding": "identity"}
+    )
+    gzipped = client.get(
+        url,
+        params={"format": "ndjson"},
+        headers={**admin_token_headers, "Accept-Encoding": "gzip"},
+    )
+
+    assert plain.status_code == status.HTTP_200_OK
+    assert plain.headers["content-type"].startswith("text/csv")
+    assert "content-encoding" not in plain.headers
+    assert plain.text.startswith("id,title,event_type")
+    assert "attachment" in plain.headers["content-disposition"]
+
+    assert gzipped.status_code == status.HTTP_200_OK
+    assert gzipped.headers["content-encoding"] == "gzip"
+    # The test client decompresses transparently
+    assert f'"id":{test_event.id}' in gzipped.text
+
+
+def test_export_organization_as_unauthorized_user(
+    client, token_headers, test_organization
+):
+    """Test regular users cannot export an organization's data."""
+    response = client.get(
+        f"/api/v1/organizations/{test_organization.id}/exports/contributions",
+        headers=token_headers,
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -65,6 +65,34 @@ def test_create_resource_request_unauthorized(client, token_headers, test_event_
     assert response.status_code == status.HTTP_403_FORBIDDEN
 
 
+def test_create_resource_requests_bulk(client, admin_token_headers, test_event_id):
+    """Test requests for an event are created in one call."""
+    requests = [
+        create_random_resource_request_data(test_event_id)
+        for _ in range(5)
+    ]
+
+    response = client.post(
+        "/api/v1/resources/requests/bulk",
+        json={"requests": requests},
+        headers=admin_token_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["count"] == 5
+    assert [r["quantity_needed"] for r in data["results"]] == [
+        r["quantity_needed"] for r in requests
+    ]
+
+    response = client.post(
+        "/api/v1/resources/requests/bulk",
+        json={"requests": requests + [{**requests[0], "event_id": 999999}]},
+        headers=admin_token_headers,
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == [{"index": 5, "error": "Event not found"}]
+
+
 def test_list_event_resource_requests(client, test_event_id, test_resource_request_id):
     """Test listing resource requests for an event."""
     response = client.get(f"/api/v1/resources/requests/event/{test_event_id}")
@@ -142,6 +170,38 @@ def test_create_contribution(client, token_headers, test_resource_request_id):
     assert data["quantity"] == 10
 
 
+def test_retried_contribution_is_recorded_once(
+    client, token_headers, test_resource_request_id
+):
+    """Test retries with the same Idempotency-Key replay the first response."""
+    headers = {**token_headers, "Idempotency-Key": "contribution-1"}
+    contribution = {"request_id": test_resource_request_id, "quantity": 3}
+
+    first = client.post(
+        "/api/v1/resources/contributions", json=contribution, headers=headers
+    )
+    retry = client.post(
+        "/api/v1/resources/contributions", json=contribution, headers=headers
+    )
+
+    assert first.status_code == retry.status_code == status.HTTP_200_OK
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    contributions = client.get(
+        f"/api/v1/resources/contributions/request/{test_resource_request_id}",
+        headers=token_headers,
+    ).json()
+    assert len(contributions) == 1
+
+    # The same key cannot be reused for another contribution
+    response = client.post(
+        "/api/v1/resources/contributions",
+        json={**contribution, "quantity": 4},
+        headers=headers,
+    )
+    assert response.status_code == 422
+
+
 def test_get_user_contributions(client, token_headers, test_resource_request_id):
     """Test getting all contributions made by the current user."""
     # First, create a contribution
@@ -184,3 +244,101 @@ def test_get_request_contributions(client, token_headers, test_resource_request_
         c["request_id"] == test_resource_request_id and c["quantity"] == 20
         for c in data
     )
+
+
+def test_contributor_leaderboard(
+    client, db_session, token_headers, test_user, test_resource_request_id, monkeypatch
+):
+    """Test a new contribution shows up on the public leaderboard once folded."""
+    from app.core.config import settings
+    from app.services import leaderboard_service
+
+    contribution_data = {"request_id": test_resource_request_id, "quantity": 25}
+    client.post(
+        "/api/v1/resources/contributions", json=contribution_data, headers=token_headers
+    )
+    monkeypatch.setattr(settings, "SUMMARY_FOLD_LAG_SECONDS", 0)
+    leaderboard_service.fold_leaderboards(db_session)
+
+    response = client.get("/api/v1/leaderboards/contributors", params={"limit": 5})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data[0]["rank"] == 1
+    assert any(row["id"] == test_user.id and row["quantity"] >= 25 for row in data)
+
+    response = client.get("/api/v1/leaderboards/donors")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_create_contributions_bulk(client, token_headers, test_resource_request_id):
+    """Test recording a batch of contributions."""
+    response = client.post(
+        "/api/v1/resources/contributions/bulk",
+        json={
+            "contributions": [
+                {"request_id": test_resource_request_id, "quantity": 4},
+                {"request_id": test_resource_request_id, "quantity": 6},
+            ]
+        },
+        headers=token_headers,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["created"] == 2
+    assert data["requests"][0]["request_id"] == test_resource_request_id
+
+    response = client.post(
+        "/api/v1/resources/contributions/bulk",
+        json={"contributions": [{"request_id": 999999, "quantity": 1}]},
+        headers=token_headers,
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_plan_allocation(client, admin_token_headers, token_headers):
+    """Test admins can plan an allocation and other users cannot."""
+    plan_data = {
+        "pledges": [
+            {"resource_type": "food", "quantity": 5, "latitude": 36.7, "longitude": 3.0}
+        ]
+    }
+
+    response = client.post(
+        "/api/v1/resources/allocations/plan",
+        json=plan_data,
+        headers=admin_token_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["allocated"] + data["unallocated_supply"] == 5
+
+    response = client.post(
+        "/api/v1/resources/allocations/plan", json=plan_data, headers=token_headers
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_request_shows_ledger_tail(
+    client, token_headers, test_event_id, test_resource_request_id
+):
+    """Test request reads include contributions not in a snapshot yet."""
+
+    def received():
+        response = client.get(f"/api/v1/resources/requests/event/{test_event_id}")
+        assert response.status_code == status.HTTP_200_OK
+        return next(
+            r["quantity_received"]
+            for r in response.json()
+            if r["id"] == test_resource_request_id
+        )
+
+    before = received()
+    client.post(
+        "/api/v1/resources/contributions",
+        json={"request_id": test_resource_request_id, "quantity": 7},
+        headers=token_headers,
+    )
+
+    assert received() == before + 7
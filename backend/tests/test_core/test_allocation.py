@@ -0,0 +1,71 @@
+import numpy as np
+from app.core.allocation import allocate
+
+
+def _allocate(requests, pledges, **kwargs):
+    """requests: (lat, lon, shortfall, days, type); pledges: (lat, lon, qty, type)."""
+    lat, lon, shortfall, days, types = zip(*requests) if requests else ([],) * 5
+    p_lat, p_lon, quantity, p_types = zip(*pledges) if pledges else ([],) * 4
+    return allocate(lat, lon, shortfall, days, types, p_lat, p_lon, quantity, p_types)
+
+
+def test_nearest_request_is_served_first():
+    """Test a pledge goes to the closer of two equally urgent requests."""
+    plan = _allocate(
+        [(36.75, 3.06, 10, 1, "food"), (35.70, -0.63, 10, 1, "food")],
+        [(36.70, 3.10, 10, "food")],
+    )
+
+    assert plan.request_index.tolist() == [0]
+    assert plan.quantity.tolist() == [10]
+    assert plan.unmet.tolist() == [0, 10]
+    assert plan.distance_km[0] < 10
+
+
+def test_urgency_outweighs_short_distance():
+    """Test an event starting today beats a slightly closer one next month."""
+    plan = _allocate(
+        [(36.75, 3.06, 5, 30, "food"), (36.80, 3.30, 5, 0, "food")],
+        [(36.75, 3.06, 5, "food")],
+    )
+
+    assert plan.request_index.tolist() == [1]
+
+
+def test_resource_types_are_not_mixed():
+    """Test pledges only cover requests of their own type."""
+    plan = _allocate(
+        [(36.75, 3.06, 10, 1, "money")],
+        [(36.75, 3.06, 10, "food")],
+    )
+
+    assert len(plan.quantity) == 0
+    assert plan.unmet.tolist() == [10]
+    assert plan.leftover.tolist() == [10]
+
+
+def test_unmet_need_is_minimized():
+    """Test repair passes reach requests beyond each pledge's candidates."""
+    rng = np.random.default_rng(3)
+    requests = [
+        (rng.uniform(19, 37), rng.uniform(-8, 12), int(rng.integers(1, 20)), 1, "food")
+        for _ in range(200)
+    ]
+    # Every pledge sits in one town, so its nearest candidates fill up fast
+    pledges = [(36.75, 3.06, 3, "food") for _ in range(400)]
+
+    plan = _allocate(requests, pledges)
+
+    need = sum(request[2] for request in requests)
+    assert plan.quantity.sum() == min(need, 1200)
+    assert plan.unmet.sum() == max(need - 1200, 0)
+    assert plan.leftover.sum() == max(1200 - need, 0)
+    # Nothing is handed out twice
+    given = np.bincount(plan.pledge_index, weights=plan.quantity, minlength=400)
+    assert (given <= 3).all()
+
+
+def test_empty_inputs():
+    """Test no requests or no pledges give an empty plan."""
+    assert len(_allocate([], [(36.75, 3.06, 5, "food")]).quantity) == 0
+    assert _allocate([(36.75, 3.06, 5, 0, "food")], []).unmet.tolist() == [5]
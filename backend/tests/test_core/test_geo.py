@@ -0,0 +1,52 @@
+import pytest
+from app.core import geo
+
+
+def test_haversine_known_distance():
+    """Test haversine distance between Algiers and Oran (~350km)."""
+    distance = geo.haversine(36.7528, 3.0429, 35.6971, -0.6308)
+    assert 340 < distance < 360
+
+
+def test_haversine_many_matches_scalar():
+    """Test the vectorized distances match the scalar implementation."""
+    latitudes = [36.76, 36.9, 35.2]
+    longitudes = [3.05, 3.2, 0.6377]
+
+    distances = list(geo.haversine_many(36.75, 3.04, latitudes, longitudes))
+
+    for distance, lat, lon in zip(distances, latitudes, longitudes):
+        assert distance == pytest.approx(geo.haversine(36.75, 3.04, lat, lon))
+
+
+def test_filter_within_radius_sorted(monkeypatch):
+    """Test radius filtering returns sorted pairs with and without NumPy."""
+    ids = [1, 2, 3, 4]
+    latitudes = [36.80, 36.7528, 35.2, 36.76]
+    longitudes = [3.04, 3.0429, 0.6377, 3.04]
+
+    expected = geo.filter_within_radius(36.75, 3.04, ids, latitudes, longitudes, 10)
+    assert [event_id for event_id, _ in expected] == [2, 4, 1]
+    assert all(distance <= 10 for _, distance in expected)
+
+    monkeypatch.setattr(geo, "HAS_NUMPY", False)
+    fallback = geo.filter_within_radius(36.75, 3.04, ids, latitudes, longitudes, 10)
+    assert [event_id for event_id, _ in fallback] == [2, 4, 1]
+
+
+def test_bounding_box_widens_longitude():
+    """Test the bounding box covers the radius at higher latitudes."""
+    min_lat, max_lat, min_lon, max_lon = geo.bounding_box(36.75, 3.04, 10)
+
+    assert max_lat - min_lat == pytest.approx(20 / geo.KM_PER_DEGREE)
+    assert max_lon - min_lon > max_lat - min_lat
+
+
+def test_parse_bbox():
+    """Test bounding box parsing and validation."""
+    assert geo.parse_bbox("1,2,3,4") == (1.0, 2.0, 3.0, 4.0)
+    assert geo.parse_bbox(None) == (-180.0, -90.0, 180.0, 90.0)
+    with pytest.raises(ValueError):
+        geo.parse_bbox("1,2,3")
+    with pytest.raises(ValueError):
+        geo.parse_bbox("3,2,1,4")
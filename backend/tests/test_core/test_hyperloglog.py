@@ -0,0 +1,39 @@
+import pytest
+from app.core.hyperloglog import HyperLogLog
+
+
+def test_estimates_are_close():
+    """Test estimates stay within a few percent across cardinalities."""
+    for cardinality in [0, 1, 50, 2000, 50000]:
+        sketch = HyperLogLog()
+        sketch.update(range(cardinality))
+        # Duplicates do not change the estimate
+        sketch.update(range(cardinality))
+
+        assert sketch.count() == pytest.approx(cardinality, rel=0.05, abs=1)
+
+
+def test_merge_is_a_union():
+    """Test merged sketches estimate the union of their inputs."""
+    first, second = HyperLogLog(), HyperLogLog()
+    first.update(range(0, 6000))
+    second.update(range(3000, 9000))
+
+    first.merge(second)
+
+    assert first.count() == pytest.approx(9000, rel=0.05)
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLog(precision=10))
+
+
+def test_round_trip_bytes():
+    """Test sketches survive serialization and stay a few kilobytes."""
+    sketch = HyperLogLog()
+    sketch.update(["a", "b", "c"])
+
+    data = sketch.to_bytes()
+    restored = HyperLogLog.from_bytes(data)
+
+    assert len(data) == 4096
+    assert restored.precision == sketch.precision
+    assert restored.count() == 3
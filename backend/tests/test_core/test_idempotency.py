@@ -0,0 +1,122 @@
+import threading
+import time
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.idempotency import (
+    IN_FLIGHT,
+    IdempotencyMiddleware,
+    IdempotencyStore,
+    StoredResponse,
+)
+
+KEY = ("abc", "POST", "/items", "")
+
+
+def _response(fingerprint="f"):
+    return StoredResponse(
+        fingerprint=fingerprint,
+        status=200,
+        headers=[(b"content-type", b"application/json")],
+        body=b"{}",
+    )
+
+
+def test_store_claims_and_replays_across_workers(idempotency_sessions):
+    """Test a key claimed by one worker is in flight, then replayed, for another."""
+    first = IdempotencyStore(idempotency_sessions)
+    second = IdempotencyStore(idempotency_sessions)
+
+    assert first.begin(KEY, "f") is None
+    assert second.begin(KEY, "f") == IN_FLIGHT
+
+    first.finish(KEY, _response())
+    replayed = second.begin(KEY, "f")
+    assert replayed.body == b"{}"
+    assert replayed.headers == [(b"content-type", b"application/json")]
+    with pytest.raises(ValueError):
+        second.begin(KEY, "other body")
+
+
+def test_store_releases_keys_without_a_response(idempotency_sessions):
+    """Test a key finished without a response can be claimed again."""
+    store = IdempotencyStore(idempotency_sessions)
+    assert store.begin(KEY, "f") is None
+    store.finish(KEY, None)
+
+    assert store.begin(KEY, "f") is None
+
+
+def test_store_drops_expired_keys(idempotency_sessions, monkeypatch):
+    """Test responses past their TTL are claimed again and purged."""
+    store = IdempotencyStore(idempotency_sessions)
+    monkeypatch.setattr(settings, "IDEMPOTENCY_TTL_SECONDS", -1)
+    for name in ("a", "b"):
+        key = (name,) + KEY[1:]
+        store.begin(key, "f")
+        store.finish(key, _response())
+
+    assert store.begin(("a",) + KEY[1:], "f") is None
+    assert store.delete_expired() == 1
+
+
+def test_middleware_coalesces_concurrent_duplicates(idempotency_sessions):
+    """Test duplicates arriving mid-request wait and share its response."""
+    calls = []
+    started = threading.Event()
+
+    app = FastAPI()
+    app.add_middleware(
+        IdempotencyMiddleware, store=IdempotencyStore(idempotency_sessions)
+    )
+
+    @app.post("/items")
+    def create_item(item: dict):
+        calls.append(item)
+        started.set()
+        time.sleep(0.3)
+        return {"id": len(calls)}
+
+    client = TestClient(app)
+    headers = {"Idempotency-Key": "retry-1"}
+    responses = []
+
+    def post():
+        responses.append(client.post("/items", json={"n": 1}, headers=headers))
+
+    first = threading.Thread(target=post)
+    first.start()
+    started.wait(5)
+    post()
+    first.join()
+
+    assert len(calls) == 1
+    assert [response.json() for response in responses] == [{"id": 1}, {"id": 1}]
+    assert sorted(
+        response.headers.get("idempotent-replayed", "") for response in responses
+    ) == ["", "true"]
+
+
+def test_middleware_keeps_no_server_errors(idempotency_sessions, monkeypatch):
+    """Test a failed request runs again on retry."""
+    calls = []
+    app = FastAPI()
+    app.add_middleware(
+        IdempotencyMiddleware, store=IdempotencyStore(idempotency_sessions)
+    )
+
+    @app.post("/items")
+    def create_item():
+        calls.append(1)
+        raise RuntimeError("database is down")
+
+    client = TestClient(app, raise_server_exceptions=False)
+    for _ in range(2):
+        response = client.post("/items", headers={"Idempotency-Key": "k"})
+        assert response.status_code == 500
+    assert len(calls) == 2
+
+    monkeypatch.setattr(settings, "IDEMPOTENCY_ENABLED", False)
+    assert client.post("/items", headers={"Idempotency-Key": "k"}).status_code == 500
+    assert len(calls) == 3
@@ -0,0 +1,51 @@
+import random
+from app.core import geo
+from app.core.kdtree import KDTree
+
+
+def _brute_force(points, target):
+    return sorted(
+        (sum((a - b) ** 2 for a, b in zip(point, target)), key)
+        for key, point in points.items()
+    )
+
+
+def test_kdtree_nearest_matches_brute_force():
+    """Test k-nearest search agrees with a linear scan."""
+    rng = random.Random(7)
+    points = {
+        i: geo.to_unit_vector(rng.uniform(19, 37), rng.uniform(-8, 12))
+        for i in range(500)
+    }
+    tree = KDTree(list(points), list(points.values()))
+    target = geo.to_unit_vector(36.75, 3.04)
+
+    assert tree.nearest(target, 10) == _brute_force(points, target)[:10]
+
+
+def test_kdtree_filters_and_radius():
+    """Test accept predicates and radius queries."""
+    rng = random.Random(11)
+    points = {
+        i: geo.to_unit_vector(rng.uniform(35, 37), rng.uniform(2, 4))
+        for i in range(300)
+    }
+    tree = KDTree(list(points), list(points.values()))
+    target = geo.to_unit_vector(36.0, 3.0)
+
+    even = tree.nearest(target, 5, accept=lambda key: key % 2 == 0)
+    assert len(even) == 5
+    assert all(key % 2 == 0 for _, key in even)
+
+    radius = geo.chord_from_km(30)
+    expected = [
+        item for item in _brute_force(points, target) if item[0] <= radius**2
+    ]
+    assert tree.within(target, radius) == expected
+
+
+def test_kdtree_empty():
+    """Test queries on an empty tree."""
+    tree = KDTree([], [])
+    assert tree.nearest((0.0, 0.0, 1.0), 3) == []
+    assert tree.within((0.0, 0.0, 1.0), 1.0) == []
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import pytest
+from datetime import datetime, timedelta
+from app.core.scheduler import Cron, Interval, Scheduler
+
+
+class _Lock:
+    def __init__(self, free=True):
+        self.free = free
+        self.released = []
+
+    def acquire(self, name, ttl):
+        return self.free
+
+    def release(self, name, hold_until=None):
+        self.released.append(name)
+        self.held_until = hold_until
+
+
+def test_cron_next_after():
+    """Test crontab matching across hours, days, weekdays and months."""
+    start = datetime(2025, 3, 14, 10, 30, 15)  # a Friday
+
+    assert Cron("*/15 * * * *").next_after(start) == datetime(2025, 3, 14, 10, 45)
+    assert Cron("0 3 * * *").next_after(start) == datetime(2025, 3, 15, 3, 0)
+    assert Cron("0 9 * * 1").next_after(start) == datetime(2025, 3, 17, 9, 0)
+    assert Cron("0 0 1 1 *").next_after(start) == datetime(2026, 1, 1, 0, 0)
+    assert Cron("30 10 * * 5,7").next_after(start) == datetime(2025, 3, 16, 10, 30)
+    # Both day fields restricted: either may match
+    assert Cron("0 0 20 * 6").next_after(start) == datetime(2025, 3, 15, 0, 0)
+
+
+def test_cron_rejects_bad_expressions():
+    """Test malformed crontab expressions."""
+    for expression in ["* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *"]:
+        with pytest.raises(ValueError):
+            Cron(expression)
+    with pytest.raises(ValueError):
+        Cron("0 0 31 2 *").next_after(datetime(2025, 1, 1))
+
+
+def test_interval():
+    """Test interval schedules."""
+    start = datetime(2025, 3, 14, 10, 30)
+
+    assert Interval(90).next_after(start) == start + timedelta(seconds=90)
+    with pytest.raises(ValueError):
+        Interval(0)
+
+
+def test_overlapping_runs_are_skipped():
+    """Test a job is not started again while it is still running."""
+    release = threading.Event()
+    scheduler = Scheduler()
+    job = scheduler.add_job("slow", lambda: release.wait(5), Interval(60))
+
+    async def run_twice():
+        first = asyncio.create_task(scheduler.run_job(job))
+        await asyncio.sleep(0.05)
+        second = await scheduler.run_job(job)
+        release.set()
+        return await first, second
+
+    assert asyncio.run(run_twice()) == (True, False)
+    assert job.runs == 1
+    assert job.skipped == 1
+    assert job.running is False
+
+
+def test_leader_only_jobs_take_the_lock():
+    """Test leader-only jobs run only when the lock is free."""
+    calls = []
+    lock = _Lock(free=False)
+    scheduler = Scheduler(lock=lock)
+    leader = scheduler.add_job(
+        "leader", lambda: calls.append("leader"), Interval(60), leader_only=True
+    )
+    local = scheduler.add_job("local", lambda: calls.append("local"), Interval(60))
+
+    asyncio.run(scheduler.run_job(leader))
+    asyncio.run(scheduler.run_job(local))
+    assert calls == ["local"]
+    assert leader.skipped == 1
+
+    lock.free = True
+    asyncio.run(scheduler.run_job(leader))
+    assert calls == ["local", "leader"]
+    assert lock.released == ["leader"]
+    assert lock.held_until is None
+
+    # A scheduled run keeps the lock until the job's next slot
+    slot = datetime(2025, 3, 14, 3, 17)
+    asyncio.run(scheduler.run_job(leader, slot))
+    assert lock.held_until == slot + timedelta(seconds=60)
+
+
+def test_failures_are_recorded():
+    """Test a failing job records its error and keeps its schedule."""
+
+    def fail():
+        raise RuntimeError("boom")
+
+    scheduler = Scheduler()
+    job = scheduler.add_job("failing", fail, Interval(60))
+
+    assert asyncio.run(scheduler.run_job(job)) is True
+    assert job.failures == 1
+    assert "boom" in job.last_error
+
+
+def test_scheduler_loop_runs_jobs():
+    """Test started jobs run on their schedule until stopped."""
+    calls = []
+    scheduler = Scheduler()
+    scheduler.add_job("tick", lambda: calls.append(1), Interval(0.01))
+
+    async def run():
+        scheduler.start()
+        assert scheduler.running
+        await asyncio.sleep(0.2)
+        await scheduler.stop()
+
+    asyncio.run(run())
+    assert len(calls) >= 2
+    assert not scheduler.running
@@ -0,0 +1,75 @@
+import pytest
+from datetime import datetime, timedelta
+from app.services import allocation_service
+from app.schemas import ResourcePledge
+from app.db.models import Event, ResourceRequest, ResourceContribution
+
+
+@pytest.fixture
+def located_requests(db_session, test_organization):
+    """Create an upcoming located event with a food and a money request."""
+    event = Event(
+        organization_id=test_organization.id,
+        title="Algiers Drive",
+        event_type="donation",
+        latitude=36.75,
+        longitude=3.06,
+        start_time=datetime.now() + timedelta(days=2),
+        end_time=datetime.now() + timedelta(days=3),
+    )
+    past = Event(
+        organization_id=test_organization.id,
+        title="Finished Drive",
+        event_type="donation",
+        latitude=36.75,
+        longitude=3.06,
+        start_time=datetime.now() - timedelta(days=3),
+        end_time=datetime.now() - timedelta(days=2),
+    )
+    db_session.add_all([event, past])
+    db_session.flush()
+    requests = [
+        ResourceRequest(event_id=event.id, resource_type="food", quantity_needed=30),
+        ResourceRequest(event_id=event.id, resource_type="money", quantity_needed=50),
+        ResourceRequest(event_id=past.id, resource_type="food", quantity_needed=30),
+    ]
+    db_session.add_all(requests)
+    db_session.flush()
+    # Shortfalls come from the ledger balance
+    db_session.add_all(
+        [
+            ResourceContribution(request_id=requests[0].id, quantity=10),
+            ResourceContribution(request_id=requests[1].id, quantity=50),
+        ]
+    )
+    db_session.commit()
+    return requests
+
+
+def test_open_requests(db_session, located_requests, test_organization):
+    """Test only unmet requests of events that have not ended are open."""
+    rows = allocation_service.get_open_requests(db_session, test_organization.id)
+
+    assert [(row.id, row.shortfall) for row in rows] == [(located_requests[0].id, 20)]
+
+
+def test_plan_allocation(db_session, located_requests, test_organization):
+    """Test pledges are split over the open shortfall."""
+    plan = allocation_service.plan_allocation(
+        db_session,
+        [
+            ResourcePledge(
+                resource_type="food", quantity=15, latitude=36.7, longitude=3.0
+            ),
+            ResourcePledge(
+                resource_type="food", quantity=15, latitude=36.8, longitude=3.1
+            ),
+        ],
+        organization_id=test_organization.id,
+    )
+
+    assert plan["allocated"] == 20
+    assert plan["unmet_need"] == 0
+    assert plan["unallocated_supply"] == 10
+    assert {a["request_id"] for a in plan["assignments"]} == {located_requests[0].id}
+    assert sum(a["quantity"] for a in plan["assignments"]) == 20
@@ -146,3 +146,64 @@ def test_get_resource_statistics(db_session, test_events_data, test_user):
     assert resource_stats["total_contributions"] >= 1
     assert "fulfillment_rate" in resource_stats
     assert 0 <= resource_stats["fulfillment_rate"] <= 1
+
+
+def test_fulfillment_report(db_session, test_events_data, test_user):
+    """Test per-event, per-organization and per-type fulfillment in one query."""
+    event = test_events_data[0]
+    created = datetime(2025, 3, 1, 8, 0)
+    food = ResourceRequest(
+        event_id=event.id,
+        resource_type="food",
+        quantity_needed=10,
+        quantity_received=10,
+        created_at=created,
+    )
+    water = ResourceRequest(
+        event_id=event.id,
+        resource_type="water",
+        quantity_needed=30,
+        quantity_received=5,
+        created_at=created,
+    )
+    db_session.add_all([food, water])
+    db_session.commit()
+
+    for request, quantity, hours in [(food, 4, 2), (food, 6, 6), (water, 5, 24)]:
+        db_session.add(
+            ResourceContribution(
+                request_id=request.id,
+                user_id=test_user.id,
+                quantity=quantity,
+                contribution_time=created + timedelta(hours=hours),
+            )
+        )
+    db_session.commit()
+
+    by_event = analytics_service.fulfillment_report(db_session, "event")
+    row = next(item for item in by_event if item["event_id"] == event.id)
+    assert row["request_count"] == 2
+    assert row["fulfilled_requests"] == 1
+    assert row["quantity_needed"] == 40
+    assert row["fulfillment_ratio"] == pytest.approx(15 / 40)
+    assert row["contribution_count"] == 3
+    assert row["quantity_contributed"] == 15
+    # 15 units over 22 hours counts as one day
+    assert row["contribution_velocity_per_day"] == pytest.approx(15.0)
+    # Only the food request was covered, 6 hours after it was created
+    assert row["avg_hours_to_fulfil"] == pytest.approx(6.0)
+
+    by_type = analytics_service.fulfillment_report(db_session, "resource_type")
+    ratios = {item["resource_type"]: item["fulfillment_ratio"] for item in by_type}
+    assert ratios["water"] < ratios["food"]
+    # Least supplied groups come first
+    assert [item["fulfillment_ratio"] for item in by_type] == sorted(ratios.values())
+
+    by_org = analytics_service.fulfillment_report(
+        db_session, "organization", organization_id=event.organization_id
+    )
+    assert len(by_org) == 1
+    assert by_org[0]["organization_id"] == event.organization_id
+
+    with pytest.raises(ValueError):
+        analytics_service.fulfillment_report(db_session, "user")
@@ -0,0 +1,57 @@
+import threading
+from app.services import dashboard_service
+from app.services.dashboard_service import DashboardSnapshot
+
+
+class _Session:
+    def close(self):
+        pass
+
+
+def test_dashboard_snapshot_is_reused(db_session, test_user, monkeypatch):
+    """Test a fresh snapshot is served without recomputing."""
+    calls = []
+    compute = dashboard_service.compute_dashboard
+
+    def counting_compute(db):
+        calls.append(db)
+        return compute(db)
+
+    monkeypatch.setattr(dashboard_service, "compute_dashboard", counting_compute)
+    snapshot = DashboardSnapshot()
+
+    first = snapshot.get(db_session)
+    second = snapshot.get(db_session)
+
+    assert len(calls) == 1
+    assert first["entity_counts"]["users"] >= 1
+    assert second["entity_counts"] == first["entity_counts"]
+    assert second["generated_at"] == first["generated_at"]
+    assert second["snapshot_age_seconds"] >= first["snapshot_age_seconds"]
+
+
+def test_stale_snapshot_refreshes_once_in_background(monkeypatch):
+    """Test stale reads are served immediately while one refresh runs."""
+    release = threading.Event()
+    refreshed = threading.Event()
+    calls = []
+
+    def slow_compute(db):
+        calls.append(db)
+        if len(calls) > 1:
+            release.wait(5)
+            refreshed.set()
+        return {"version": len(calls)}
+
+    monkeypatch.setattr(dashboard_service, "compute_dashboard", slow_compute)
+    snapshot = DashboardSnapshot()
+    snapshot.refresh(_Session())
+
+    assert snapshot.refresh_in_background(_Session) is True
+    assert snapshot.refresh_in_background(_Session) is False
+    # Readers keep getting the old payload while the refresh is running
+    assert snapshot._payload == {"version": 1}
+
+    release.set()
+    assert refreshed.wait(5)
+    assert len(calls) == 2
@@ -0,0 +1,124 @@
+import threading
+import time
+from app.core.config import settings
+from app.services import email_delivery, notification_service
+from app.services.email_delivery import OutgoingEmail
+
+
+def _emails(count):
+    return [
+        OutgoingEmail(f"user{i}@example.com", f"Subject {i}", f"<p>Body {i}</p>")
+        for i in range(count)
+    ]
+
+
+def test_messages_share_persistent_connections(smtp_sink):
+    """Test many messages go out over one logged-in connection per worker."""
+    results = email_delivery.email_pool.send_many(_emails(50))
+
+    assert results == [True] * 50
+    assert len(smtp_sink.messages) == 50
+    assert smtp_sink.counts["connections"] <= 2
+    assert smtp_sink.counts["logins"] == smtp_sink.counts["connections"]
+    assert email_delivery.email_pool.stats()["sent"] == 50
+
+
+def test_connection_is_renewed_after_message_limit(smtp_sink, monkeypatch):
+    """Test workers reconnect once a connection has carried its share."""
+    monkeypatch.setattr(settings, "EMAIL_MESSAGES_PER_CONNECTION", 5)
+    pool = email_delivery.EmailDeliveryPool(workers=1)
+    try:
+        assert all(pool.send_many(_emails(12)))
+    finally:
+        pool.stop()
+
+    assert smtp_sink.counts["connections"] == 3
+
+
+def test_temporary_failure_is_retried(smtp_sink):
+    """Test a 421 reply drops the connection and the message is sent again."""
+    smtp_sink.fail("MAIL", "421 4.3.2 Try again later", times=2)
+
+    assert email_delivery.email_pool.send_many(_emails(1)) == [True]
+    assert len(smtp_sink.messages) == 1
+    assert email_delivery.email_pool.stats()["retries"] == 2
+
+
+def test_permanent_failure_is_not_retried(smtp_sink):
+    """Test a 5xx reply fails the message without retrying it."""
+    smtp_sink.fail("RCPT", "550 5.1.1 No such user")
+
+    results = email_delivery.email_pool.send_many(_emails(2))
+    assert sorted(results) == [False, True]
+    stats = email_delivery.email_pool.stats()
+    assert stats["failed"] == 1
+    assert stats["retries"] == 0
+
+
+def test_unexpected_errors_fail_the_email_not_the_worker(smtp_sink, monkeypatch):
+    """Test an error outside SMTP resolves the email and keeps the worker."""
+    build_message = email_delivery.build_message
+
+    def ascii_only(email):
+        email.recipient.encode("ascii")
+        return build_message(email)
+
+    monkeypatch.setattr(email_delivery, "build_message", ascii_only)
+    pool = email_delivery.EmailDeliveryPool(workers=1)
+    try:
+        emails = [OutgoingEmail("زائر@example.com", "Hi", "<p>Hi</p>")] + _emails(1)
+        assert pool.send_many(emails) == [False, True]
+        assert pool.stats()["failed"] == 1
+    finally:
+        pool.stop()
+
+
+def test_dead_workers_are_replaced(smtp_sink):
+    """Test the next submit restarts workers that have exited."""
+    pool = email_delivery.EmailDeliveryPool(workers=1)
+    try:
+        assert pool.send_many(_emails(1)) == [True]
+        [worker] = pool._threads
+        pool._queue.put(None)
+        worker.join(5)
+
+        assert pool.send_many(_emails(1)) == [True]
+        assert pool._threads[0] is not worker
+    finally:
+        pool.stop()
+
+
+def test_send_many_gives_up_after_timeout(monkeypatch):
+    """Test emails still waiting at the deadline count as not sent."""
+    monkeypatch.setattr(settings, "EMAIL_MAX_RETRIES", 0)
+    release = threading.Event()
+
+    def stalled_connect():
+        release.wait(5)
+        raise OSError("no route to host")
+
+    pool = email_delivery.EmailDeliveryPool(workers=1, connect=stalled_connect)
+    try:
+        started = time.monotonic()
+        assert pool.send_many(_emails(2), timeout=0.2) == [False, False]
+        assert time.monotonic() - started < 2
+    finally:
+        release.set()
+        pool.stop()
+
+
+def test_send_email_waits_for_delivery(smtp_sink):
+    """Test send_email queues on the pool and can wait for the result."""
+    assert notification_service.send_email(
+        "user@example.com", "Hello", "<p>Hi</p>", wait=True
+    )
+    [message] = smtp_sink.messages
+    assert "Subject: Hello" in message.data
+    assert "text/plain" in message.data
+
+
+def test_send_email_skips_without_settings(monkeypatch):
+    """Test nothing is queued when no mail server is configured."""
+    monkeypatch.setattr(settings, "EMAIL_HOST", "")
+
+    assert notification_service.send_email("user@example.com", "Hi", "Hi") is False
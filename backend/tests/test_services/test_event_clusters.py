@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+from app.schemas import EventCreate, EventUpdate
+from app.services import event_service
+import pytest
+
+ALGERIA = (-9.0, 18.0, 12.0, 38.0)
+
+
+def _create_event(db_session, organization_id, title, event_type, lat, lon):
+    start_time = datetime.now() + timedelta(days=2)
+    return event_service.create_event(
+        db_session,
+        EventCreate(
+            title=title,
+            event_type=event_type,
+            start_time=start_time,
+            end_time=start_time + timedelta(hours=2),
+            organization_id=organization_id,
+            latitude=lat,
+            longitude=lon,
+        ),
+    )
+
+
+def test_event_clusters_by_zoom(db_session, test_organization):
+    """Test events merge into one cluster when zoomed out and split when zoomed in."""
+    _create_event(db_session, test_organization.id, "A", "IFTAR", 36.75, 3.04)
+    _create_event(db_session, test_organization.id, "B", "DONATION", 36.76, 3.05)
+    _create_event(db_session, test_organization.id, "C", "IFTAR", 35.69, -0.63)
+
+    clusters = event_service.get_event_clusters(db_session, ALGERIA, 3)
+    assert sum(c["count"] for c in clusters) == 3
+
+    algiers = next(c for c in clusters if c["event_types"].get("DONATION"))
+    assert algiers["count"] == 2
+    assert algiers["event_types"] == {"IFTAR": 1, "DONATION": 1}
+    assert algiers["latitude"] == pytest.approx(36.755)
+
+    clusters = event_service.get_event_clusters(db_session, ALGERIA, 16)
+    assert len(clusters) == 3
+
+
+def test_event_clusters_follow_writes(db_session, test_organization):
+    """Test updates and deletes are applied to the pyramid incrementally."""
+    event = _create_event(db_session, test_organization.id, "A", "IFTAR", 36.75, 3.04)
+    assert event_service.get_event_clusters(db_session, ALGERIA, 5)[0]["count"] == 1
+
+    event_service.update_event(
+        db_session, event.id, EventUpdate(latitude=35.69, longitude=-0.63)
+    )
+    clusters = event_service.get_event_clusters(db_session, ALGERIA, 5)
+    assert len(clusters) == 1
+    assert clusters[0]["latitude"] == pytest.approx(35.69)
+
+    event_service.delete_event(db_session, event.id)
+    assert event_service.get_event_clusters(db_session, ALGERIA, 5) == []
+
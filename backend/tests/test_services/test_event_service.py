@@ -1,14 +1,17 @@
 import pytest
+from sqlalchemy import event as sa_event
 from datetime import datetime, timedelta
 from app.services import event_service
 from app.schemas import (
     EventCreate,
     EventUpdate,
+    EventBulkItem,
+    EventBulkUpdateItem,
     EventCollaboratorCreate,
     EventBeneficiaryCreate,
     EventTypeEnum,
 )
-from app.db.models import Event
+from app.db.models import Event, ResourceRequest
 from tests.utils import create_random_event_data
 
 
@@ -50,6 +53,57 @@ def test_get_event(db_session, test_event):
     assert event.title == test_event.title
 
 
+def test_get_event_detail(db_session, test_event, test_organization, test_user):
+    """Test the event aggregate is read in a fixed number of queries."""
+    db_session.add_all(
+        [
+            ResourceRequest(
+                event_id=test_event.id,
+                resource_type="food",
+                quantity_needed=needed,
+                quantity_received=0,
+            )
+            for needed in (10, 20, 30)
+        ]
+    )
+    db_session.commit()
+    event_service.add_collaborator_to_event(
+        db_session,
+        test_event.id,
+        EventCollaboratorCreate(organization_id=test_organization.id),
+    )
+    event_service.add_beneficiary_to_event(
+        db_session, test_event.id, EventBeneficiaryCreate(user_id=test_user.id)
+    )
+    event_id, title = test_event.id, test_event.title
+    organization_id, name = test_organization.id, test_organization.name
+    db_session.expunge_all()
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    connection = db_session.connection()
+    sa_event.listen(connection, "before_cursor_execute", count_statement)
+    try:
+        detail = event_service.get_event_detail(db_session, event_id)
+        collaborators = [org.name for org in detail["collaborators"]]
+        needed = sorted(r.quantity_needed for r in detail["resource_requests"])
+        balances = [r.received_balance for r in detail["resource_requests"]]
+    finally:
+        sa_event.remove(connection, "before_cursor_execute", count_statement)
+
+    assert len(statements) == 3
+    assert detail["title"] == title
+    assert detail["organization"].id == organization_id
+    assert collaborators == [name]
+    assert needed == [10, 20, 30]
+    assert balances == [0, 0, 0]
+    assert detail["beneficiary_count"] == 1
+    assert event_service.get_event_detail(db_session, 999999) is None
+
+
 def test_get_events(db_session, test_event):
     """Test getting list of events."""
     events = event_service.get_events(db_session)
@@ -83,6 +137,94 @@ def test_update_event(db_session, test_event):
     assert updated_event.title == new_title
 
 
+def test_create_events(db_session, test_organization):
+    """Test a batch of events is created with its resource requests."""
+    items = [
+        EventBulkItem(
+            **create_random_event_data(test_organization.id),
+            resource_requests=[
+                {"resource_type": "food", "quantity_needed": 100 + day},
+                {"resource_type": "money", "quantity_needed": 5000},
+            ],
+        )
+        for day in range(3)
+    ]
+
+    results, errors = event_service.create_events(db_session, items)
+
+    assert errors == []
+    assert [result["title"] for result in results] == [item.title for item in items]
+    assert [
+        request["quantity_needed"]
+        for result in results
+        for request in result["resource_requests"]
+    ] == [100, 5000, 101, 5000, 102, 5000]
+    for result in results:
+        requests = db_session.query(ResourceRequest).filter(
+            ResourceRequest.event_id == result["id"]
+        )
+        assert requests.count() == 2
+
+
+def test_create_events_rejects_whole_batch(db_session, test_organization):
+    """Test one invalid item keeps the whole batch from being written."""
+    valid = create_random_event_data(test_organization.id)
+    backwards = {
+        **create_random_event_data(test_organization.id),
+        "end_time": datetime.now(),
+        "start_time": datetime.now() + timedelta(days=1),
+    }
+    count = db_session.query(Event).count()
+
+    results, errors = event_service.create_events(
+        db_session,
+        [
+            EventBulkItem(**valid),
+            EventBulkItem(**backwards),
+            EventBulkItem(**{**valid, "organization_id": 999999}),
+        ],
+    )
+
+    assert results == []
+    assert errors == [
+        {"index": 1, "error": "Event ends before it starts"},
+        {"index": 2, "error": "Organization does not exist"},
+    ]
+    assert db_session.query(Event).count() == count
+
+
+def test_update_events(db_session, test_event, test_organization):
+    """Test a batch of updates only changes the fields set per item."""
+    other = event_service.create_event(
+        db_session, EventCreate(**create_random_event_data(test_organization.id))
+    )
+
+    results, errors = event_service.update_events(
+        db_session,
+        [
+            EventBulkUpdateItem(id=test_event.id, title="Iftar day 1"),
+            EventBulkUpdateItem(id=other.id, address="Place des Martyrs"),
+        ],
+    )
+
+    assert errors == []
+    assert [(r["title"], r["address"]) for r in results] == [
+        ("Iftar day 1", test_event.address),
+        (other.title, "Place des Martyrs"),
+    ]
+
+    results, errors = event_service.update_events(
+        db_session,
+        [
+            EventBulkUpdateItem(id=test_event.id, title="Changed"),
+            EventBulkUpdateItem(id=999999, title="Missing"),
+        ],
+    )
+    assert errors == [{"index": 1, "error": "Event not found"}]
+    db_session.refresh(test_event)
+    assert test_event.title == "Iftar day 1"
+
+
 def test_delete_event(db_session, test_organization):
     """Test event deletion."""
     # Create an event to delete
@@ -287,3 +429,44 @@ def test_search_events_by_address(db_session, test_organization):
         db_session, "Algeria", event_type="IFTAR"
     )
     assert len(all_events) == 2
+
+
+def test_get_nearest_events(db_session, test_organization):
+    """Test finding the k closest upcoming events without a radius."""
+    from app.schemas import EventCreate
+    from app.services import event_service
+
+    start_time = datetime.now() + timedelta(days=1)
+    created = []
+    for title, latitude, longitude in [
+        ("Nearest Algiers", 36.7528, 3.0429),
+        ("Nearest Blida", 36.47, 2.83),
+        ("Nearest Oran", 35.6971, -0.6308),
+    ]:
+        created.append(
+            event_service.create_event(
+                db_session,
+                EventCreate(
+                    title=title,
+                    event_type="IFTAR",
+                    start_time=start_time,
+                    end_time=start_time + timedelta(hours=2),
+                    organization_id=test_organization.id,
+                    latitude=latitude,
+                    longitude=longitude,
+                ),
+            )
+        )
+
+    nearest = event_service.get_nearest_events(
+        db_session, latitude=36.75, longitude=3.04, k=2
+    )
+    assert [e.id for e in nearest] == [created[0].id, created[1].id]
+    assert nearest[0].distance < nearest[1].distance
+
+    # Writes after the index was built are patched in incrementally
+    event_service.delete_event(db_session, created[0].id)
+    nearest = event_service.get_nearest_events(
+        db_session, latitude=36.75, longitude=3.04, k=2
+    )
+    assert [e.id for e in nearest] == [created[1].id, created[2].id]
@@ -0,0 +1,112 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime
+from app.services import export_service
+from app.db.models import ResourceRequest, ResourceContribution, EventBeneficiary
+
+
+@pytest.fixture
+def contributions(db_session, test_event, test_user):
+    """Create contributions to a request of the test organization's event."""
+    request = ResourceRequest(
+        event_id=test_event.id, resource_type="food", quantity_needed=100
+    )
+    db_session.add(request)
+    db_session.commit()
+
+    rows = [
+        ResourceContribution(
+            request_id=request.id,
+            user_id=test_user.id,
+            quantity=quantity,
+            contribution_time=datetime(2025, 3, day, 12, 0),
+        )
+        for day, quantity in [(1, 5), (10, 7), (20, 9)]
+    ]
+    db_session.add_all(rows)
+    db_session.commit()
+    return rows
+
+
+def _body(chunks):
+    return b"".join(chunks).decode("utf-8")
+
+
+def test_export_contributions_csv(db_session, test_organization, contributions):
+    """Test contributions export as CSV filtered by date."""
+    body = _body(
+        export_service.stream_export(
+            db_session,
+            "contributions",
+            test_organization.id,
+            start=datetime(2025, 3, 5),
+            end=datetime(2025, 3, 31),
+        )
+    )
+
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [int(row["quantity"]) for row in rows] == [7, 9]
+    assert rows[0]["resource_type"] == "food"
+    assert rows[0]["contributor_name"] == "Test User"
+    assert rows[0]["contribution_time"] == "2025-03-10T12:00:00"
+
+
+def test_export_ndjson_gzip(db_session, test_organization, contributions):
+    """Test gzipped NDJSON exports decompress to one object per row."""
+    compressed = b"".join(
+        export_service.stream_export(
+            db_session,
+            "contributions",
+            test_organization.id,
+            export_format="ndjson",
+            compress=True,
+        )
+    )
+
+    lines = gzip.decompress(compressed).decode("utf-8").splitlines()
+    assert [json.loads(line)["quantity"] for line in lines] == [5, 7, 9]
+
+
+def test_export_beneficiaries_and_events(
+    db_session, test_organization, test_event, test_user
+):
+    """Test beneficiaries and events exports are scoped to the organization."""
+    db_session.add(EventBeneficiary(event_id=test_event.id, user_id=test_user.id))
+    db_session.commit()
+
+    beneficiaries = list(
+        csv.DictReader(
+            io.StringIO(
+                _body(
+                    export_service.stream_export(
+                        db_session, "beneficiaries", test_organization.id
+                    )
+                )
+            )
+        )
+    )
+    events = _body(
+        export_service.stream_export(
+            db_session, "events", test_organization.id, export_format="ndjson"
+        )
+    )
+
+    assert beneficiaries[0]["beneficiary_name"] == "Test User"
+    assert test_event.id in [json.loads(line)["id"] for line in events.splitlines()]
+    assert _body(export_service.stream_export(db_session, "events", -1)) == (
+        "id,title,event_type,start_time,end_time,address,latitude,longitude,"
+        "created_at\r\n"
+    )
+
+
+def test_export_rejects_unknown_dataset(db_session, test_organization):
+    """Test unknown datasets and formats are rejected before streaming."""
+    with pytest.raises(ValueError):
+        export_service.stream_export(db_session, "users", test_organization.id)
+    with pytest.raises(ValueError):
+        export_service.stream_export(
+            db_session, "events", test_organization.id, export_format="xlsx"
+        )
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from app.services import job_service
+from app.services.job_service import DatabaseJobLock
+from app.db.models import Notification, SchedulerLock
+
+
+def test_database_job_lock(db_session, monkeypatch):
+    """Test only one worker holds a job lease until it is released or expires."""
+    lock = DatabaseJobLock(lambda: db_session)
+
+    assert lock.acquire("nightly", 60) is True
+    # The holder may renew its own lease
+    assert lock.acquire("nightly", 60) is True
+
+    monkeypatch.setattr(job_service, "WORKER_ID", "other-worker")
+    assert lock.acquire("nightly", 60) is False
+
+    # An expired lease can be taken over
+    db_session.query(SchedulerLock).filter(SchedulerLock.name == "nightly").update(
+        {"expires_at": datetime.now() - timedelta(seconds=1)}
+    )
+    db_session.commit()
+    assert lock.acquire("nightly", 60) is True
+
+    lock.release("nightly")
+    assert db_session.get(SchedulerLock, "nightly") is None
+
+    # Held past the run, other workers waking within the slot skip it
+    next_slot = datetime.now() + timedelta(hours=1)
+    assert lock.acquire("nightly", 60) is True
+    lock.release("nightly", hold_until=next_slot)
+    assert db_session.get(SchedulerLock, "nightly").expires_at == next_slot
+    monkeypatch.setattr(job_service, "WORKER_ID", "third-worker")
+    assert lock.acquire("nightly", 60) is False
+
+
+def test_clean_up_notifications(db_session, test_user, monkeypatch):
+    """Test only notifications read before the retention period are deleted."""
+    old = datetime.now() - timedelta(days=365)
+    notifications = [
+        Notification(
+            user_id=test_user.id, title="Old", message="m", read=True, read_at=old
+        ),
+        Notification(
+            user_id=test_user.id, title="Unread", message="m", created_at=old
+        ),
+        Notification(
+            user_id=test_user.id,
+            title="Recent",
+            message="m",
+            read=True,
+            read_at=datetime.now(),
+        ),
+    ]
+    db_session.add_all(notifications)
+    db_session.commit()
+    user_id = test_user.id
+    monkeypatch.setattr(job_service, "_session", lambda: db_session)
+
+    job_service.clean_up_notifications()
+
+    titles = {
+        n.title
+        for n in db_session.query(Notification).filter(
+            Notification.user_id == user_id
+        )
+    }
+    assert "Old" not in titles
+    assert {"Unread", "Recent"} <= titles
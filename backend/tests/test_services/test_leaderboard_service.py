@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime
+from app.core.config import settings
+from app.services import leaderboard_service, resource_service
+from app.schemas import ResourceContributionCreate
+from app.db.models import ResourceRequest, ResourceContribution, LeaderboardEntry
+
+
+@pytest.fixture
+def requests_by_type(db_session, test_event):
+    """Create a food and a water request on the test event."""
+    requests = {
+        resource_type: ResourceRequest(
+            event_id=test_event.id, resource_type=resource_type, quantity_needed=100
+        )
+        for resource_type in ["food", "water"]
+    }
+    db_session.add_all(requests.values())
+    db_session.commit()
+    return requests
+
+
+@pytest.fixture(autouse=True)
+def no_fold_lag(monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_FOLD_LAG_SECONDS", 0)
+
+
+def _contribute(db_session, user, request, quantity):
+    return resource_service.create_resource_contribution(
+        db_session,
+        user.id,
+        ResourceContributionCreate(request_id=request.id, quantity=quantity),
+    )
+
+
+def _scores(db_session, board="contributors", **kwargs):
+    return {
+        row["id"]: row[kwargs.get("metric", "quantity")]
+        for row in leaderboard_service.get_leaderboard(db_session, board, **kwargs)
+    }
+
+
+def test_contributions_update_boards(
+    db_session, requests_by_type, test_user, test_user2, test_event
+):
+    """Test totals are ranked overall, per type and per organization."""
+    _contribute(db_session, test_user, requests_by_type["food"], 5)
+    _contribute(db_session, test_user2, requests_by_type["food"], 3)
+    _contribute(db_session, test_user2, requests_by_type["water"], 4)
+    assert leaderboard_service.fold_leaderboards(db_session) == 3
+
+    overall = leaderboard_service.get_leaderboard(db_session, "contributors")
+    assert [row["id"] for row in overall[:2]] == [test_user2.id, test_user.id]
+    assert overall[0] == {
+        "rank": 1,
+        "id": test_user2.id,
+        "name": test_user2.full_name,
+        "quantity": 7,
+    }
+
+    assert _scores(db_session, resource_type="food") == {
+        test_user.id: 5,
+        test_user2.id: 3,
+    }
+    assert _scores(db_session, metric="contributions")[test_user2.id] == 2
+    month = datetime.utcnow().strftime("%Y-%m")
+    assert _scores(db_session, period=month)[test_user.id] == 5
+    assert _scores(db_session, "organizations")[test_event.organization_id] == 12
+
+
+def test_boards_stay_bounded(db_session, requests_by_type, test_user, monkeypatch):
+    """Test only the top entries are kept and deletes refill from totals."""
+    monkeypatch.setattr(leaderboard_service, "TOP_SIZE", 2)
+    day = datetime.utcnow().date()
+    leaderboard_service.apply_contributions(
+        db_session,
+        [(user_id, None, None, day, quantity, 1) for user_id, quantity in [
+            (9001, 10), (9002, 20), (9003, 30)
+        ]],
+    )
+
+    assert _scores(db_session) == {9003: 30, 9002: 20}
+    count = (
+        db_session.query(LeaderboardEntry)
+        .filter(
+            LeaderboardEntry.board == "contributors",
+            LeaderboardEntry.period == "all",
+            LeaderboardEntry.resource_type == "",
+        )
+        .count()
+    )
+    assert count == 4  # two subjects for each metric
+
+    leaderboard_service.apply_contributions(
+        db_session, [(9003, None, None, day, -25, -1)]
+    )
+    assert _scores(db_session) == {9002: 20, 9001: 10}
+
+
+def test_fold_counts_each_contribution_once(
+    db_session, requests_by_type, test_user
+):
+    """Test contributions reach the boards on the next fold and only once."""
+    _contribute(db_session, test_user, requests_by_type["food"], 5)
+    assert test_user.id not in _scores(db_session)
+
+    assert leaderboard_service.fold_leaderboards(db_session) == 1
+    assert leaderboard_service.fold_leaderboards(db_session) == 0
+    assert _scores(db_session)[test_user.id] == 5
+
+
+def test_deleted_contribution_leaves_board_on_rebuild(
+    db_session, requests_by_type, test_user
+):
+    """Test a contribution deleted outside the ledger drops out on rebuild."""
+    contribution = _contribute(db_session, test_user, requests_by_type["food"], 5)
+    leaderboard_service.fold_leaderboards(db_session)
+    assert _scores(db_session)[test_user.id] == 5
+
+    db_session.delete(contribution)
+    db_session.commit()
+    leaderboard_service.rebuild_leaderboards(db_session)
+
+    assert test_user.id not in _scores(db_session)
+    # The rebuild leaves nothing for the next fold to count again
+    assert leaderboard_service.fold_leaderboards(db_session) == 0
+
+
+def test_rebuild_leaderboards(db_session, requests_by_type, test_user):
+    """Test boards can be rebuilt from the contributions table."""
+    _contribute(db_session, test_user, requests_by_type["water"], 6)
+    leaderboard_service.fold_leaderboards(db_session)
+    before = _scores(db_session, resource_type="water")
+
+    leaderboard_service.rebuild_leaderboards(db_session)
+
+    assert _scores(db_session, resource_type="water") == before
+    with pytest.raises(ValueError):
+        leaderboard_service.get_leaderboard(db_session, "donors")
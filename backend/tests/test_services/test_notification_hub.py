@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+from app.core.config import settings
+from app.services.notification_hub import NotificationHub, event_stream, format_event
+
+
+def test_publish_from_another_thread_once_per_notification():
+    """Test events cross threads and a notification id is delivered once."""
+    hub = NotificationHub()
+
+    async def scenario():
+        subscription = hub.subscribe(7)
+        event = {"event": "notification", "id": 1, "data": {"n": 1}}
+        publisher = threading.Thread(
+            target=lambda: [hub.publish(7, event, notification_id=1) for _ in range(2)]
+        )
+        publisher.start()
+        publisher.join()
+        first = await asyncio.wait_for(subscription.events.get(), 1)
+        await asyncio.sleep(0)
+        return first, subscription.events.qsize()
+
+    first, left = asyncio.run(scenario())
+    assert first["data"] == {"n": 1}
+    assert left == 0
+    assert hub.publish(8, {"event": "unread_count", "data": {}}) == 0
+
+
+def test_stream_resyncs_slow_clients_and_closes(monkeypatch):
+    """Test a full queue ends in a resync event and the stream unsubscribes."""
+    monkeypatch.setattr(settings, "NOTIFICATION_STREAM_MAX_SECONDS", 0.2)
+    hub = NotificationHub(queue_size=2)
+
+    async def scenario():
+        subscription = hub.subscribe(7)
+        for number in range(3):
+            hub.publish(7, {"event": "unread_count", "data": {"unread_count": number}})
+        await asyncio.sleep(0)
+        first = [{"event": "unread_count", "data": {"unread_count": 0}}]
+        return [chunk async for chunk in event_stream(subscription, first, hub)]
+
+    chunks = asyncio.run(scenario())
+
+    assert chunks[0] == "retry: 3000\n\n"
+    assert chunks[1] == 'event: unread_count\ndata: {"unread_count": 0}\n\n'
+    assert chunks[2] == format_event({"event": "resync", "data": {}})
+    assert 'data: {"unread_count": 1}' in chunks[4]
+    assert hub.stats() == {"users": 0, "streams": 0}
+
+
+def test_format_event_with_id():
+    """Test event ids are sent so clients can resume with Last-Event-ID."""
+    event = {"event": "notification", "id": 5, "data": {"a": 1}}
+
+    assert format_event(event) == 'id: 5\nevent: notification\ndata: {"a": 1}\n\n'
@@ -1,7 +1,25 @@
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
 from app.services import notification_service
-from app.schemas import NotificationCreate, NotificationType
+from app.schemas import (
+    NotificationCreate,
+    NotificationType,
+    NotificationFanout,
+    EventBeneficiaryCreate,
+    ResourceContributionCreate,
+)
+from app.db.models import (
+    Notification,
+    NotificationCounter,
+    NotificationCursor,
+    ResourceRequest,
+    UserRole,
+)
+from app.services import event_service, resource_service
+from app.services.notification_hub import notification_hub
+from app.core.config import settings
+from sqlalchemy import func
 
 
 @pytest.fixture
@@ -117,3 +135,287 @@ def test_send_sms_notification(mock_send_sms):
 
     # Verify SMS was sent
     mock_send_sms.assert_called_once_with(phone_number, message)
+
+
+def test_fan_out_notification(
+    db_session, test_event, test_organization, test_user, test_user2, test_admin_user
+):
+    """Test an event audience is notified once per user, in one statement."""
+    event_service.add_beneficiary_to_event(
+        db_session, test_event.id, EventBeneficiaryCreate(user_id=test_user.id)
+    )
+    request = ResourceRequest(
+        event_id=test_event.id, resource_type="time", quantity_needed=5
+    )
+    db_session.add(request)
+    db_session.commit()
+    for user in (test_user, test_user2):
+        resource_service.create_resource_contribution(
+            db_session,
+            user.id,
+            ResourceContributionCreate(request_id=request.id, quantity=1),
+        )
+
+    result = notification_service.fan_out_notification(
+        db_session,
+        NotificationFanout(
+            title="Iftar moved",
+            message="The iftar now starts at 19:30",
+            type=NotificationType.EVENT_UPDATE,
+            reference_id=test_event.id,
+            audiences=[
+                {"type": "event_beneficiaries", "event_id": test_event.id},
+                {"type": "event_contributors", "event_id": test_event.id},
+            ],
+        ),
+    )
+
+    assert result == {"created": 2, "emails_queued": 0}
+    recipients = [
+        n.user_id
+        for n in db_session.query(Notification).filter(
+            Notification.title == "Iftar moved"
+        )
+    ]
+    assert sorted(recipients) == sorted([test_user.id, test_user2.id])
+    assert test_admin_user.id not in recipients
+
+
+def test_fan_out_nearby_with_queued_email(
+    db_session, test_user, test_user2, smtp_sink
+):
+    """Test emails for a fan-out are queued, then sent by the delivery job."""
+    test_user.latitude, test_user.longitude = 36.75, 3.06
+    # Inside the bounding box but about 12.6 km away, past the radius
+    test_user2.latitude, test_user2.longitude = 36.78, 3.1
+    db_session.commit()
+
+    result = notification_service.fan_out_notification(
+        db_session,
+        NotificationFanout(
+            title="Food drive",
+            message="Collection point open <today>",
+            type=NotificationType.GENERAL,
+            email=True,
+            audiences=[
+                {"type": "nearby", "latitude": 36.7, "longitude": 3.0, "radius_km": 10}
+            ],
+        ),
+    )
+    assert result == {"created": 1, "emails_queued": 1}
+
+    assert notification_service.deliver_queued_emails(db_session) == 1
+    [message] = smtp_sink.messages
+    assert message.recipients == [test_user.email]
+    assert "<p>Collection point open &lt;today&gt;</p>" in message.data
+    assert notification_service.deliver_queued_emails(db_session) == 0
+
+
+def _pushed(subscription):
+    """Events handed to a subscription so far."""
+    events = []
+    while not subscription.events.empty():
+        events.append(subscription.events.get_nowait())
+    return events
+
+
+def test_create_notification_is_pushed(db_session, test_user):
+    """Test a new notification reaches the user's open streams at once."""
+
+    async def scenario():
+        subscription = notification_hub.subscribe(test_user.id)
+        notification = notification_service.create_notification(
+            db_session,
+            NotificationCreate(
+                title="Pushed",
+                message="Hello",
+                type=NotificationType.GENERAL,
+                recipient_id=test_user.id,
+            ),
+        )
+        notification_service.mark_all_notifications_as_read(db_session, test_user.id)
+        await asyncio.sleep(0)
+        return notification, _pushed(subscription)
+
+    notification, events = asyncio.run(scenario())
+
+    assert [event["event"] for event in events] == ["notification", "unread_count"]
+    assert events[0]["id"] == notification.id
+    assert events[0]["data"]["notification"]["title"] == "Pushed"
+    assert events[0]["data"]["unread_count"] >= 1
+    assert events[1]["data"] == {"unread_count": 0}
+
+
+def test_relay_pushes_notifications_from_elsewhere(
+    db_session, test_user, test_user2, monkeypatch
+):
+    """Test the relay pushes rows it did not publish, each exactly once."""
+    monkeypatch.setattr(settings, "NOTIFICATION_RELAY_LAG_SECONDS", 0)
+
+    async def scenario():
+        subscription = notification_hub.subscribe(test_user.id)
+        assert notification_service.relay_notifications(db_session, "worker-a") == 0
+
+        # Inserted with INSERT ... SELECT, as another worker would
+        notification_service.fan_out_notification(
+            db_session,
+            NotificationFanout(
+                title="Relayed",
+                message="From elsewhere",
+                type=NotificationType.GENERAL,
+                audiences=[{"type": "role", "role": "beneficiary"}],
+            ),
+        )
+        db_session.add(Notification(user_id=test_user2.id, title="t", message="m"))
+        db_session.commit()
+        relayed = notification_service.relay_notifications(db_session, "worker-a")
+        again = notification_service.relay_notifications(db_session, "worker-a")
+        await asyncio.sleep(0)
+        return relayed, again, _pushed(subscription)
+
+    test_user.roles.append(UserRole(role="beneficiary"))
+    db_session.commit()
+    relayed, again, events = asyncio.run(scenario())
+
+    assert (relayed, again) == (1, 0)
+    [event] = events
+    assert event["data"]["notification"]["title"] == "Relayed"
+    cursor = db_session.get(NotificationCursor, "worker-a")
+    newest = db_session.query(Notification).order_by(Notification.id.desc()).first()
+    assert cursor.last_notification_id == newest.id
+
+
+def test_relay_pushes_lower_id_committed_late(db_session, test_user):
+    """Test the cursor lags behind young rows so a late lower id is pushed."""
+    newest = db_session.query(func.max(Notification.id)).scalar() or 0
+
+    async def scenario():
+        subscription = notification_hub.subscribe(test_user.id)
+        notification_service.relay_notifications(db_session, "worker-a")
+
+        # The higher id commits first
+        db_session.add(
+            Notification(id=newest + 2, user_id=test_user.id, title="b", message="m")
+        )
+        db_session.commit()
+        first = notification_service.relay_notifications(db_session, "worker-a")
+        db_session.add(
+            Notification(id=newest + 1, user_id=test_user.id, title="a", message="m")
+        )
+        db_session.commit()
+        second = notification_service.relay_notifications(db_session, "worker-a")
+        await asyncio.sleep(0)
+        return first, second, _pushed(subscription)
+
+    first, second, events = asyncio.run(scenario())
+
+    assert (first, second) == (1, 1)
+    assert [event["data"]["notification"]["title"] for event in events] == ["b", "a"]
+    cursor = db_session.get(NotificationCursor, "worker-a")
+    assert cursor.last_notification_id == newest
+
+
+def _stored_unread(db_session, user_id):
+    return db_session.get(NotificationCounter, user_id).unread
+
+
+def _unread(db_session, user_id):
+    return notification_service.get_unread_notification_count(db_session, user_id)
+
+
+def test_unread_counter_follows_every_write(db_session, test_user, test_user2):
+    """Test create, fan-out, mark read, read-all and delete move the counter."""
+    assert _unread(db_session, test_user.id) == 0
+
+    created = [
+        notification_service.create_notification(
+            db_session,
+            NotificationCreate(
+                title=f"Counted {i}",
+                message="m",
+                type=NotificationType.GENERAL,
+                recipient_id=test_user.id,
+            ),
+        )
+        for i in range(3)
+    ]
+    assert _stored_unread(db_session, test_user.id) == 3
+
+    test_user.roles.append(UserRole(role="beneficiary"))
+    test_user2.roles.append(UserRole(role="beneficiary"))
+    db_session.commit()
+    notification_service.fan_out_notification(
+        db_session,
+        NotificationFanout(
+            title="Counted fan-out",
+            message="m",
+            type=NotificationType.GENERAL,
+            audiences=[{"type": "role", "role": "beneficiary"}],
+        ),
+    )
+    assert _stored_unread(db_session, test_user.id) == 4
+    # No counter yet: seeded from a live count, which includes the fan-out
+    assert _unread(db_session, test_user2.id) == 1
+
+    notification_service.mark_notification_as_read(db_session, created[0].id)
+    notification_service.mark_notification_as_read(db_session, created[0].id)
+    assert _stored_unread(db_session, test_user.id) == 3
+
+    notification_service.delete_notification(db_session, created[0].id, test_user.id)
+    notification_service.delete_notification(db_session, created[1].id, test_user.id)
+    assert _stored_unread(db_session, test_user.id) == 2
+
+    notification_service.mark_all_notifications_as_read(db_session, test_user.id)
+    assert _unread(db_session, test_user.id) == 0
+
+
+def test_unread_count_read_leaves_the_transaction_to_caller(db_session, test_user):
+    """Test seeding a missing counter on read is not committed by the read."""
+    db_session.add(Notification(user_id=test_user.id, title="t", message="m"))
+    db_session.commit()
+
+    with patch.object(db_session, "commit") as commit:
+        assert _unread(db_session, test_user.id) == 1
+    commit.assert_not_called()
+
+    db_session.commit()
+    assert _stored_unread(db_session, test_user.id) == 1
+
+
+def test_repeated_delete_decrements_once(db_session, test_user):
+    """Test a notification deleted twice moves the counter once."""
+    notification = notification_service.create_notification(
+        db_session,
+        NotificationCreate(
+            title="Deleted",
+            message="m",
+            type=NotificationType.GENERAL,
+            recipient_id=test_user.id,
+        ),
+    )
+    notification_id = notification.id
+
+    assert notification_service.delete_notification(
+        db_session, notification_id, test_user.id
+    )
+    assert not notification_service.delete_notification(
+        db_session, notification_id, test_user.id
+    )
+    assert _stored_unread(db_session, test_user.id) == 0
+
+
+def test_reconcile_unread_counts(db_session, test_user):
+    """Test the repair job fixes counters moved by writes that skipped them."""
+    assert _unread(db_session, test_user.id) == 0
+    db_session.add_all(
+        Notification(user_id=test_user.id, title="Raw", message="m", read=False)
+        for _ in range(2)
+    )
+    db_session.commit()
+    assert _unread(db_session, test_user.id) == 0
+
+    drift = notification_service.reconcile_unread_counts(db_session)
+
+    assert drift[test_user.id] == 2
+    assert _unread(db_session, test_user.id) == 2
+    assert test_user.id not in notification_service.reconcile_unread_counts(db_session)
@@ -0,0 +1,81 @@
+from sqlalchemy import update
+from app.services import analytics_service, user_service
+from app.schemas import UserCreate
+from app.services.query_cache import cached_query, query_cache
+from app.db.models import User
+from tests.utils import create_random_user_data
+
+
+def test_identical_calls_share_an_entry(db_session, test_user):
+    """Test defaults and explicit arguments normalize to the same key."""
+    first = analytics_service.fulfillment_report(db_session)
+    second = analytics_service.fulfillment_report(db_session, group_by="event")
+
+    assert first == second
+    assert query_cache.stats()["hits"] == 1
+
+    analytics_service.fulfillment_report(db_session, group_by="organization")
+    assert query_cache.stats()["misses"] == 2
+
+
+def test_commit_invalidates_dependent_entries(db_session, test_user):
+    """Test a committed write drops entries computed from its table."""
+    before = analytics_service.count_entities(db_session)
+    roles = analytics_service.user_roles_distribution(db_session)
+
+    user_service.create_user(db_session, UserCreate(**create_random_user_data()))
+
+    assert analytics_service.count_entities(db_session)["users"] == before["users"] + 1
+    # user_roles was not written, so that entry is still served
+    hits = query_cache.stats()["hits"]
+    assert analytics_service.user_roles_distribution(db_session) == roles
+    assert query_cache.stats()["hits"] == hits + 1
+
+
+def test_rolled_back_writes_keep_entries(db_session, test_user):
+    """Test only committed writes invalidate."""
+    analytics_service.geographical_distribution(db_session)
+
+    savepoint = db_session.begin_nested()
+    db_session.execute(
+        update(User).where(User.id == test_user.id).values(location="Oran")
+    )
+    savepoint.rollback()
+
+    assert "users" not in db_session.info.get("query_cache_tables", set())
+
+
+def test_bulk_statements_invalidate(db_session, test_user):
+    """Test ORM bulk updates are tracked like flushed objects."""
+    before = analytics_service.geographical_distribution(db_session)
+
+    db_session.execute(
+        update(User).where(User.id == test_user.id).values(location="Tlemcen")
+    )
+    db_session.commit()
+
+    after = analytics_service.geographical_distribution(db_session)
+    assert after != before
+    assert {"location": "Tlemcen", "count": 1} in after
+
+
+def test_ttl_and_copies(db_session, monkeypatch):
+    """Test entries expire after their TTL and results are copied out."""
+    calls = []
+
+    @cached_query("users", ttl=60)
+    def payload(db, limit=10):
+        calls.append(limit)
+        return {"items": [1, 2, 3]}
+
+    payload(db_session)["items"].append(4)
+    assert payload(db_session) == {"items": [1, 2, 3]}
+    assert calls == [10]
+
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.query_cache.time.monotonic", lambda: clock[0])
+    query_cache.reset()
+    payload(db_session)
+    clock[0] += 61
+    payload(db_session)
+    assert calls == [10, 10, 10]
@@ -1,12 +1,19 @@
 import pytest
-from app.services import resource_service
+from app.services import resource_service, leaderboard_service
 from app.schemas import (
     ResourceRequestCreate,
     ResourceRequestUpdate,
+    ResourceRequestBulkItem,
+    ResourceRequestBulkUpdateItem,
     ResourceContributionCreate,
     ResourceTypeEnum,
 )
-from app.db.models import ResourceRequest, ResourceContribution
+from app.core.config import settings
+from app.db.models import (
+    ResourceRequest,
+    ResourceContribution,
+    ResourceRequestSnapshot,
+)
 from tests.utils import create_random_resource_request_data
 
 
@@ -97,7 +104,86 @@ def test_delete_resource_request(db_session, test_event):
     assert deleted_request is None
 
 
-def test_create_resource_contribution(db_session, test_resource_request, test_user):
+def test_bulk_resource_requests(
+    db_session, test_event, test_resource_request, test_user, test_admin_user
+):
+    """Test requests are created and updated in batches."""
+    results, errors = resource_service.create_resource_requests(
+        db_session,
+        [
+            ResourceRequestBulkItem(
+                event_id=test_event.id, resource_type="food", quantity_needed=40
+            ),
+            ResourceRequestBulkItem(
+                event_id=test_event.id, resource_type="money", quantity_needed=900
+            ),
+        ],
+    )
+    assert errors == []
+    assert [(r["resource_type"], r["quantity_received"]) for r in results] == [
+        ("food", 0),
+        ("money", 0),
+    ]
+
+    resource_service.create_resource_contribution(
+        db_session,
+        test_user.id,
+        ResourceContributionCreate(request_id=test_resource_request.id, quantity=6),
+    )
+    results, errors = resource_service.update_resource_requests(
+        db_session,
+        [
+            ResourceRequestBulkUpdateItem(id=results[0]["id"], quantity_needed=60),
+            ResourceRequestBulkUpdateItem(
+                id=test_resource_request.id, quantity_received=4
+            ),
+        ],
+        corrected_by=test_admin_user.id,
+    )
+    assert errors == []
+    assert [(r["quantity_needed"], r["quantity_received"]) for r in results] == [
+        (60, 0),
+        (50, 4),
+    ]
+    db_session.refresh(test_resource_request)
+    assert test_resource_request.received_balance == 4
+
+
+def test_bulk_resource_requests_reject_missing(
+    db_session, test_event, test_resource_request
+):
+    """Test a batch naming a missing event or request writes nothing."""
+    count = db_session.query(ResourceRequest).count()
+    results, errors = resource_service.create_resource_requests(
+        db_session,
+        [
+            ResourceRequestBulkItem(
+                event_id=test_event.id, resource_type="food", quantity_needed=1
+            ),
+            ResourceRequestBulkItem(
+                event_id=999999, resource_type="food", quantity_needed=1
+            ),
+        ],
+    )
+    assert (results, errors) == ([], [{"index": 1, "error": "Event not found"}])
+    assert db_session.query(ResourceRequest).count() == count
+
+    request_id = test_resource_request.id
+    results, errors = resource_service.update_resource_requests(
+        db_session,
+        [
+            ResourceRequestBulkUpdateItem(id=request_id, quantity_needed=9),
+            ResourceRequestBulkUpdateItem(id=request_id, quantity_needed=8),
+        ],
+    )
+    assert errors == [{"index": 1, "error": "Resource request is updated twice"}]
+    db_session.refresh(test_resource_request)
+    assert test_resource_request.quantity_needed == 50
+
+
+def test_create_resource_contribution(
+    db_session, test_resource_request, test_user, monkeypatch
+):
     """Test creating a new resource contribution."""
     # Initial quantity received should be 0
     assert test_resource_request.quantity_received == 0
@@ -118,9 +204,16 @@ def test_create_resource_contribution(db_session, test_resource_request, test_us
     assert contribution.user_id == test_user.id
     assert contribution.quantity == 25
 
-    # Verify resource request was updated
+    # The balance includes the ledger tail; a snapshot copies it over
+    db_session.refresh(test_resource_request)
+    assert test_resource_request.received_balance == 25
+    assert test_resource_request.quantity_received == 0
+
+    monkeypatch.setattr(settings, "LEDGER_SNAPSHOT_LAG_SECONDS", 0)
+    assert resource_service.take_ledger_snapshots(db_session) == 1
     db_session.refresh(test_resource_request)
     assert test_resource_request.quantity_received == 25
+    assert test_resource_request.received_balance == 25
 
 
 def test_get_contributions_by_user(db_session, test_resource_request, test_user):
@@ -186,4 +279,164 @@ def test_multiple_contributions_update_quantity(
     updated_request = resource_service.get_resource_request(
         db_session, test_resource_request.id
     )
-    assert updated_request.quantity_received == 12  # 5 + 7
+    assert updated_request.received_balance == 12  # 5 + 7
+
+
+def test_contribution_to_missing_request(db_session, test_user):
+    """Test contributing to a missing request records nothing."""
+    contribution_data = ResourceContributionCreate(request_id=999999, quantity=5)
+
+    assert (
+        resource_service.create_resource_contribution(
+            db_session, test_user.id, contribution_data
+        )
+        is None
+    )
+    assert db_session.query(ResourceContribution).count() == 0
+
+
+def test_bulk_contributions(
+    db_session, test_resource_request, test_user, test_event, monkeypatch
+):
+    """Test a batch of contributions updates every request total once."""
+    other_request = ResourceRequest(
+        event_id=test_event.id,
+        resource_type=ResourceTypeEnum.MONEY.value,
+        quantity_needed=100,
+        quantity_received=0,
+    )
+    db_session.add(other_request)
+    db_session.commit()
+
+    result = resource_service.create_resource_contributions(
+        db_session,
+        test_user.id,
+        [
+            ResourceContributionCreate(request_id=test_resource_request.id, quantity=10),
+            ResourceContributionCreate(request_id=other_request.id, quantity=12),
+            ResourceContributionCreate(request_id=test_resource_request.id, quantity=15),
+        ],
+    )
+
+    assert result["created"] == 3
+    assert {
+        total["request_id"]: total["quantity_received"] for total in result["requests"]
+    } == {test_resource_request.id: 25, other_request.id: 12}
+    assert len(
+        resource_service.get_contributions_by_request(
+            db_session, test_resource_request.id
+        )
+    ) == 2
+    # The batch is folded into the boards like single contributions
+    monkeypatch.setattr(settings, "SUMMARY_FOLD_LAG_SECONDS", 0)
+    leaderboard_service.fold_leaderboards(db_session)
+    board = leaderboard_service.get_leaderboard(db_session, "contributors")
+    assert {"id": test_user.id, "quantity": 37} in [
+        {"id": row["id"], "quantity": row["quantity"]} for row in board
+    ]
+
+
+def test_bulk_contributions_with_missing_request(
+    db_session, test_resource_request, test_user
+):
+    """Test a batch naming a missing request is rejected as a whole."""
+    result = resource_service.create_resource_contributions(
+        db_session,
+        test_user.id,
+        [
+            ResourceContributionCreate(request_id=test_resource_request.id, quantity=3),
+            ResourceContributionCreate(request_id=999999, quantity=4),
+        ],
+    )
+
+    assert result is None
+    db_session.refresh(test_resource_request)
+    assert test_resource_request.quantity_received == 0
+
+
+def test_snapshot_keeps_recent_entries_in_tail(
+    db_session, test_resource_request, test_user, monkeypatch
+):
+    """Test snapshots only move over entries older than the lag."""
+    for quantity in (4, 6):
+        resource_service.create_resource_contribution(
+            db_session,
+            test_user.id,
+            ResourceContributionCreate(
+                request_id=test_resource_request.id, quantity=quantity
+            ),
+        )
+    assert resource_service.take_ledger_snapshots(db_session) == 0
+
+    monkeypatch.setattr(settings, "LEDGER_SNAPSHOT_LAG_SECONDS", 0)
+    assert resource_service.take_ledger_snapshots(db_session) == 1
+    assert resource_service.take_ledger_snapshots(db_session) == 0
+
+    resource_service.create_resource_contribution(
+        db_session,
+        test_user.id,
+        ResourceContributionCreate(request_id=test_resource_request.id, quantity=5),
+    )
+    request = resource_service.get_resource_request(
+        db_session, test_resource_request.id
+    )
+    assert (request.quantity_received, request.received_balance) == (10, 15)
+
+
+def test_correction_is_a_ledger_entry(
+    db_session, test_resource_request, test_user, test_admin_user, monkeypatch
+):
+    """Test correcting the received total appends the difference."""
+    resource_service.create_resource_contribution(
+        db_session,
+        test_user.id,
+        ResourceContributionCreate(request_id=test_resource_request.id, quantity=8),
+    )
+
+    request = resource_service.update_resource_request(
+        db_session,
+        test_resource_request.id,
+        ResourceRequestUpdate(quantity_received=5),
+        corrected_by=test_admin_user.id,
+    )
+
+    assert request.received_balance == 5
+    entries = resource_service.get_contributions_by_request(db_session, request.id)
+    assert [(entry.quantity, entry.kind) for entry in entries] == [
+        (8, "contribution"),
+        (-3, "correction"),
+    ]
+    assert entries[1].user_id is None
+    assert entries[1].recorded_by == test_admin_user.id
+    # Nobody donated the correction
+    monkeypatch.setattr(settings, "SUMMARY_FOLD_LAG_SECONDS", 0)
+    leaderboard_service.fold_leaderboards(db_session)
+    board = leaderboard_service.get_leaderboard(db_session, "contributors")
+    assert {"id": test_user.id, "quantity": 8} in [
+        {"id": row["id"], "quantity": row["quantity"]} for row in board
+    ]
+
+
+def test_replay_ledger_repairs_snapshots(
+    db_session, test_resource_request, test_user, monkeypatch
+):
+    """Test a replay rebuilds balances from the full ledger."""
+    resource_service.create_resource_contribution(
+        db_session,
+        test_user.id,
+        ResourceContributionCreate(request_id=test_resource_request.id, quantity=9),
+    )
+    monkeypatch.setattr(settings, "LEDGER_SNAPSHOT_LAG_SECONDS", 0)
+    resource_service.take_ledger_snapshots(db_session)
+    assert resource_service.replay_ledger(db_session) == {}
+
+    snapshot = db_session.get(ResourceRequestSnapshot, test_resource_request.id)
+    snapshot.balance = 2
+    db_session.commit()
+
+    assert resource_service.replay_ledger(db_session) == {
+        test_resource_request.id: {"stored": 2, "replayed": 9}
+    }
+    db_session.refresh(test_resource_request)
+    assert test_resource_request.quantity_received == 9
+    assert test_resource_request.received_balance == 9
@@ -0,0 +1,189 @@
+import time
+import pytest
+from unittest.mock import patch
+from datetime import date, datetime, timedelta
+from sqlalchemy import delete, func, select
+from app.services import rollup_service, analytics_service
+from app.db.models import DailyRollup, ResourceContribution, ResourceRequest
+from scripts import backfill_rollups
+
+
+def _daily(series):
+    return {item["date"]: item["count"] for item in series}
+
+
+def test_bucket_start():
+    """Test day, week and month buckets."""
+    day = date(2025, 3, 13)  # a Thursday
+
+    assert rollup_service.bucket_start(day, "day") == day
+    assert rollup_service.bucket_start(day, "week") == date(2025, 3, 10)
+    assert rollup_service.bucket_start(day, "month") == date(2025, 3, 1)
+
+
+def test_registrations_are_rolled_up(db_session, test_user, test_user2):
+    """Test new users land in today's registration bucket."""
+    today = datetime.now()
+    series = analytics_service.user_registration_over_time(
+        db_session, today - timedelta(days=2), today
+    )
+
+    assert len(series) == 3
+    assert _daily(series)[today.strftime("%Y-%m-%d")] >= 2
+
+
+def test_weekly_and_monthly_series(db_session):
+    """Test coarser series are summed from daily buckets, including empty ones."""
+    for day, count in [(date(2025, 3, 3), 2), (date(2025, 3, 9), 1), (date(2025, 4, 1), 4)]:
+        rollup_service.add(db_session, "events", day, count)
+
+    weekly = rollup_service.get_series(
+        db_session, "events", datetime(2025, 3, 3), datetime(2025, 3, 20), "week"
+    )
+    monthly = rollup_service.get_series(
+        db_session, "events", datetime(2025, 3, 1), datetime(2025, 4, 30), "month"
+    )
+
+    assert weekly == [
+        {"date": "2025-03-03", "count": 3},
+        {"date": "2025-03-10", "count": 0},
+        {"date": "2025-03-17", "count": 0},
+    ]
+    assert monthly == [
+        {"date": "2025-03-01", "count": 3},
+        {"date": "2025-04-01", "count": 4},
+    ]
+
+
+def test_deletes_and_backfill(db_session, test_event, test_user):
+    """Test deletes decrement their bucket and backfill rebuilds from rows."""
+    request = ResourceRequest(
+        event_id=test_event.id, resource_type="food", quantity_needed=10
+    )
+    db_session.add(request)
+    db_session.commit()
+
+    contribution_time = datetime(2025, 2, 14, 12, 0)
+    contributions = [
+        ResourceContribution(
+            request_id=request.id,
+            user_id=test_user.id,
+            quantity=1,
+            contribution_time=contribution_time,
+        )
+        for _ in range(3)
+    ]
+    db_session.add_all(contributions)
+    db_session.commit()
+
+    def count():
+        series = rollup_service.get_series(
+            db_session, "contributions", contribution_time, contribution_time
+        )
+        return series[0]["count"]
+
+    assert count() == 3
+
+    db_session.delete(contributions[0])
+    db_session.commit()
+    assert count() == 2
+
+    db_session.execute(delete(DailyRollup))
+    db_session.commit()
+    assert count() == 0
+
+    counted = rollup_service.backfill_rollups(db_session, ["contributions"])
+
+    assert counted["contributions"] >= 2
+    assert count() == 2
+
+
+@pytest.fixture
+def host_time_zone(monkeypatch):
+    """Set the host's local time zone for the test, restoring it after."""
+
+    def set_zone(name):
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+
+    yield set_zone
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_server_stamped_rows_use_the_database_day(
+    db_session, test_event, test_user, host_time_zone, monkeypatch
+):
+    """Test rows stamped by the database land on the day backfill gives them."""
+    # Leave the stamp unread at flush, as on databases without RETURNING
+    monkeypatch.setattr(ResourceContribution.__mapper__, "eager_defaults", False)
+    request = ResourceRequest(
+        event_id=test_event.id, resource_type="food", quantity_needed=10
+    )
+    db_session.add(request)
+    db_session.commit()
+
+    # At any moment the host's date differs from UTC's in one of these
+    for zone in ("<+14>-14", "<-12>+12"):
+        host_time_zone(zone)
+        contribution = ResourceContribution(
+            request_id=request.id, user_id=test_user.id, quantity=1
+        )
+        db_session.add(contribution)
+        db_session.commit()
+
+        stamped = db_session.scalar(
+            select(func.date(ResourceContribution.contribution_time)).where(
+                ResourceContribution.id == contribution.id
+            )
+        )
+        assert rollup_service.database_today(db_session).isoformat() == stamped
+
+    def buckets():
+        return dict(
+            db_session.execute(
+                select(DailyRollup.day, DailyRollup.count).where(
+                    DailyRollup.metric == "contributions"
+                )
+            ).all()
+        )
+
+    live = buckets()
+    rollup_service.backfill_rollups(db_session, ["contributions"])
+    assert buckets() == live
+
+
+def test_backfill_script_defaults_to_everything(db_session, test_user, capsys):
+    """Test the script with no metrics rebuilds rollups, sketches and boards."""
+    with patch.object(backfill_rollups, "DatabaseConnection") as connection:
+        connection.return_value.get_session.return_value = db_session
+        backfill_rollups.main([])
+        with pytest.raises(SystemExit) as exit_info:
+            backfill_rollups.main(["logins"])
+
+    out = capsys.readouterr().out
+    assert "registrations:" in out
+    assert "daily sketches rebuilt" in out
+    assert "leaderboards:" in out
+    assert exit_info.value.code == 2
+
+
+def test_unknown_metric(db_session):
+    """Test unknown metrics and intervals are rejected."""
+    with pytest.raises(ValueError):
+        rollup_service.get_series(db_session, "logins", datetime.now(), datetime.now())
+    with pytest.raises(ValueError):
+        rollup_service.get_series(
+            db_session, "events", datetime.now(), datetime.now(), "year"
+        )
+
+
+def test_add_creates_then_grows_a_bucket(db_session):
+    """Test the first add of a day creates its bucket and later ones add to it."""
+    day = date(2024, 2, 29)
+    rollup_service.add(db_session, "events", day, 2)
+    rollup_service.add(db_session, "events", day, 3)
+    rollup_service.add(db_session, "events", day, -1)
+    db_session.commit()
+
+    assert db_session.get(DailyRollup, ("events", day)).count == 4
@@ -143,3 +143,73 @@ def test_search_sorting(db_session, test_search_data):
     titles = [e.title for e in results]
     sorted_titles = sorted(titles)
     assert titles == sorted_titles
+
+
+def test_geospatial_search_events(db_session, test_organization):
+    """Test geospatial search returns events in range sorted by distance."""
+    future_date = datetime.now() + timedelta(days=30)
+    for title, latitude, longitude in [
+        ("Geo Near", 36.7528, 3.0429),
+        ("Geo Nearer", 36.7501, 3.0401),
+        ("Geo Far", 35.2, 0.6377),
+    ]:
+        db_session.add(
+            Event(
+                title=title,
+                event_type="IFTAR",
+                organization_id=test_organization.id,
+                start_time=future_date,
+                end_time=future_date + timedelta(hours=2),
+                latitude=latitude,
+                longitude=longitude,
+            )
+        )
+    db_session.commit()
+
+    results = search_service.geospatial_search_events(
+        db_session, latitude=36.75, longitude=3.04, radius=10
+    )
+
+    assert [r["title"] for r in results] == ["Geo Nearer", "Geo Near"]
+    assert results[0]["distance_km"] <= results[1]["distance_km"]
+
+
+def test_geospatial_search_paginates_in_database(db_session, test_organization):
+    """Test skip/limit pages follow distance order."""
+    future_date = datetime.now() + timedelta(days=30)
+    for i in range(5):
+        db_session.add(
+            Event(
+                title=f"Paged {i}",
+                event_type="IFTAR",
+                organization_id=test_organization.id,
+                start_time=future_date,
+                latitude=36.75 + i * 0.01,
+                longitude=3.04,
+            )
+        )
+    db_session.commit()
+
+    first = search_service.geospatial_search_events(
+        db_session, latitude=36.75, longitude=3.04, radius=10, skip=0, limit=2
+    )
+    second = search_service.geospatial_search_events(
+        db_session, latitude=36.75, longitude=3.04, radius=10, skip=2, limit=2
+    )
+
+    assert [r["title"] for r in first] == ["Paged 0", "Paged 1"]
+    assert [r["title"] for r in second] == ["Paged 2", "Paged 3"]
+
+
+def test_haversine_sql_function_dialects():
+    """Test the haversine SQL function compiles for SQLite and PostgreSQL."""
+    from sqlalchemy import select
+    from sqlalchemy.dialects import postgresql, sqlite
+    from app.db.functions import haversine
+
+    statement = select(haversine(Event.latitude, Event.longitude, 36.75, 3.04))
+
+    assert "haversine(" in str(statement.compile(dialect=sqlite.dialect()))
+    compiled = str(statement.compile(dialect=postgresql.dialect()))
+    assert "haversine(" not in compiled
+    assert "asin" in compiled
@@ -0,0 +1,129 @@
+import pytest
+from unittest.mock import patch
+from datetime import datetime, timedelta
+from sqlalchemy import delete, update
+from app.services import stats_service
+from app.db.models import Event, EventBeneficiary, StatsCounter
+from scripts import reconcile_stats
+
+
+def _new_event(db_session, organization_id, title="Counted Event"):
+    event = Event(
+        title=title,
+        event_type="IFTAR",
+        organization_id=organization_id,
+        start_time=datetime.now() + timedelta(days=1),
+    )
+    db_session.add(event)
+    db_session.commit()
+    return event
+
+
+def test_counts_follow_inserts_and_deletes(db_session, test_organization):
+    """Test counters are moved in the same transaction as the writes."""
+    before = stats_service.get_count(db_session, "events")
+
+    event = _new_event(db_session, test_organization.id)
+    assert stats_service.get_count(db_session, "events") == before + 1
+
+    db_session.delete(event)
+    db_session.commit()
+    assert stats_service.get_count(db_session, "events") == before
+
+
+def test_rolled_back_writes_are_not_counted(db_session, test_organization):
+    """Test a rolled back insert leaves the counter untouched."""
+    before = stats_service.get_count(db_session, "events")
+
+    savepoint = db_session.begin_nested()
+    db_session.add(
+        Event(title="Discarded", event_type="IFTAR", organization_id=test_organization.id)
+    )
+    db_session.flush()
+    savepoint.rollback()
+
+    assert stats_service.get_count(db_session, "events") == before
+
+
+def test_distinct_beneficiaries(db_session, test_organization, test_user, test_user2):
+    """Test distinct beneficiaries only move on a user's first and last event."""
+    first = _new_event(db_session, test_organization.id, "First")
+    second = _new_event(db_session, test_organization.id, "Second")
+    before = stats_service.get_counts(
+        db_session, ["beneficiaries", "event_beneficiaries"]
+    )
+
+    db_session.add_all(
+        [
+            EventBeneficiary(event_id=first.id, user_id=test_user.id),
+            EventBeneficiary(event_id=second.id, user_id=test_user.id),
+            EventBeneficiary(event_id=first.id, user_id=test_user2.id),
+        ]
+    )
+    db_session.commit()
+
+    counts = stats_service.get_counts(
+        db_session, ["beneficiaries", "event_beneficiaries"]
+    )
+    assert counts["beneficiaries"] == before["beneficiaries"] + 2
+    assert counts["event_beneficiaries"] == before["event_beneficiaries"] + 3
+
+    registration = db_session.get(EventBeneficiary, (first.id, test_user.id))
+    db_session.delete(registration)
+    db_session.commit()
+    assert stats_service.get_count(db_session, "beneficiaries") == (
+        before["beneficiaries"] + 2
+    )
+
+
+def test_reconcile_counters_repairs_drift(db_session, test_organization):
+    """Test reconciliation recounts a counter that drifted."""
+    _new_event(db_session, test_organization.id)
+    stats_service.reconcile_counters(db_session)
+    actual = stats_service.get_count(db_session, "events")
+
+    db_session.execute(
+        update(StatsCounter).where(StatsCounter.name == "events").values(value=0)
+    )
+    db_session.commit()
+
+    drift = stats_service.reconcile_counters(db_session)
+
+    assert drift == {"events": actual}
+    assert stats_service.get_count(db_session, "events") == actual
+    assert stats_service.reconcile_counters(db_session) == {}
+
+
+def test_reconcile_script_defaults_to_every_counter(
+    db_session, test_organization, capsys
+):
+    """Test the script with no names reconciles all counters."""
+    _new_event(db_session, test_organization.id)
+    db_session.execute(
+        update(StatsCounter).where(StatsCounter.name == "events").values(value=0)
+    )
+    db_session.commit()
+
+    with patch.object(reconcile_stats, "DatabaseConnection") as connection:
+        connection.return_value.get_session.return_value = db_session
+        reconcile_stats.main([])
+        with pytest.raises(SystemExit) as exit_info:
+            reconcile_stats.main(["logins"])
+
+    assert "events: corrected by" in capsys.readouterr().out
+    assert exit_info.value.code == 2
+
+
+def test_missing_counter_is_read_live_and_seeded_on_write(
+    db_session, test_organization
+):
+    """Test reads never store a counter; the first write seeds it."""
+    db_session.execute(delete(StatsCounter).where(StatsCounter.name == "events"))
+    db_session.commit()
+    live = stats_service.get_count(db_session, "events")
+
+    assert db_session.get(StatsCounter, "events") is None
+
+    _new_event(db_session, test_organization.id)
+
+    assert db_session.get(StatsCounter, "events").value == live + 1